@@ -0,0 +1,105 @@
+"""
+Per-request CPU of the /api/analyze text processing: the previous
+multi-pass flow (split, per-sentence clean_text, reasons re-tokenizing the
+text and every sentence, dict bigram counts) vs the single TextAnalysis pass.
+
+Usage:
+    python -m benchmarks.analysis_pipeline --words 1000 5000 20000
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+
+# Measure the request path without cached predictions
+os.environ.setdefault("PREDICT_CACHE_SIZE", "0")
+
+from benchmarks.common import sample_texts
+from src.preprocessing.text_analysis import TextAnalysis
+from src.utils.helpers import clean_text
+from web_app import FUNCTION_WORDS, _compute_reasons, app
+
+
+def _legacy_split(text):
+    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
+
+
+def _legacy_reasons(text):
+    reasons = []
+    sentences = _legacy_split(text)
+    words = re.findall(r"\b\w+\b", text.lower())
+    if sentences:
+        lengths = [len(re.findall(r"\b\w+\b", s)) for s in sentences]
+        if len(lengths) > 1 and statistics.pvariance(lengths) < 8:
+            reasons.append("Low sentence length variation")
+    if words:
+        bigrams = list(zip(words, words[1:]))
+        if bigrams:
+            counts = {}
+            for bg in bigrams:
+                counts[bg] = counts.get(bg, 0) + 1
+            if max(counts.values()) / max(len(bigrams), 1) > 0.08:
+                reasons.append("Repetitive phrasing patterns detected")
+        ratio = sum(1 for w in words if w in FUNCTION_WORDS) / max(len(words), 1)
+        if ratio > 0.55:
+            reasons.append("High function-word density")
+    return reasons or ["Balanced structure and phrasing"]
+
+
+def legacy_pipeline(text):
+    clean_text(text)
+    sentences = _legacy_split(text)
+    for sentence in sentences:
+        clean_text(sentence)
+    return _legacy_reasons(text)
+
+
+def single_pass_pipeline(text):
+    analysis = TextAnalysis(text)
+    analysis.cleaned_sentences()
+    return _compute_reasons(analysis)
+
+
+def cpu_ms(fn, text, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(text)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def build_document(texts, n_words):
+    words = []
+    for t in texts:
+        words.extend(t.split())
+        if len(words) >= n_words:
+            break
+    return " ".join(words[:n_words])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts, _ = sample_texts(2000)
+    client = app.test_client()
+
+    print("=" * 76)
+    print("ANALYSIS PIPELINE CPU PER REQUEST (ms)")
+    print("=" * 76)
+    print(f"{'words':>8}{'legacy text work':>19}{'single pass':>14}{'speedup':>10}"
+          f"{'full request':>15}")
+    for n_words in args.words:
+        doc = build_document(texts, n_words)
+        assert legacy_pipeline(doc) == single_pass_pipeline(doc)
+        legacy = cpu_ms(legacy_pipeline, doc, args.repeat)
+        single = cpu_ms(single_pass_pipeline, doc, args.repeat)
+        full = cpu_ms(lambda t: client.post("/api/analyze", json={"text": t}), doc, 3)
+        print(f"{n_words:>8}{legacy:>19.2f}{single:>14.2f}{legacy / single:>9.2f}x"
+              f"{full:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
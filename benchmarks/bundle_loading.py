@@ -0,0 +1,111 @@
+"""
+Cold-start time and per-worker RSS: pickled artifacts vs the memory-mapped
+bundle. Each measurement runs in a fresh interpreter, several at once to
+mimic web workers booting together.
+
+Usage:
+    python -m benchmarks.bundle_loading --workers 4
+"""
+import argparse
+import json
+import pickle
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+SAMPLE_TEXT = (
+    "The results of the study suggest that students who read every day "
+    "perform better in writing assessments than those who do not."
+)
+
+
+def _rss_kb():
+    """
+    VmRSS plus its private (RssAnon) and file-backed, shareable (RssFile) parts.
+    """
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _child(source):
+    start = time.perf_counter()
+    import predict
+    from src.models.artifact_bundle import load_bundle
+    imported = time.perf_counter()
+
+    if source == "bundle":
+        model, vectorizer = load_bundle(predict.BUNDLE_DIR)
+    else:
+        with open(predict.MODEL_PATH, "rb") as f:
+            model = pickle.load(f)
+        with open(predict.VECTORIZER_PATH, "rb") as f:
+            vectorizer = pickle.load(f)
+    loaded = time.perf_counter()
+
+    model.predict_proba(vectorizer.transform([SAMPLE_TEXT]))
+    first = time.perf_counter()
+
+    result = {
+        "import_ms": (imported - start) * 1000,
+        "load_ms": (loaded - imported) * 1000,
+        "first_request_ms": (first - loaded) * 1000,
+    }
+    result.update(_rss_kb())
+    print(json.dumps(result))
+
+
+def _run_workers(source, workers):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bundle_loading", "--child", source],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"{source} worker failed")
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--child", choices=("pickle", "bundle"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    print("=" * 84)
+    print(f"ARTIFACT LOADING: pickle vs mmap bundle ({args.workers} workers each, medians)")
+    print("=" * 84)
+    print(f"{'source':<8}{'import ms':>11}{'load ms':>10}{'1st req ms':>12}"
+          f"{'RSS MB':>10}{'private MB':>12}{'file-backed MB':>16}")
+    for source in ("pickle", "bundle"):
+        results = _run_workers(source, args.workers)
+
+        def med(key):
+            return float(np.median([r[key] for r in results]))
+
+        print(f"{source:<8}{med('import_ms'):>11.1f}{med('load_ms'):>10.1f}"
+              f"{med('first_request_ms'):>12.1f}{med('VmRSS') / 1024:>10.1f}"
+              f"{med('RssAnon') / 1024:>12.1f}{med('RssFile') / 1024:>16.1f}")
+    print("\nfile-backed pages of the bundle are shared between workers by the OS;")
+    print("private pages are paid once per worker.")
+
+
+if __name__ == "__main__":
+    main()
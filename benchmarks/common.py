@@ -0,0 +1,40 @@
+import time
+import numpy as np
+
+from src.utils.helpers import load_data
+
+
+def sample_texts(n, seed=42):
+    """
+    Random sample of n (text, label) pairs from the training dataset.
+    """
+    texts, labels = load_data()
+    rng = np.random.default_rng(seed)
+    idx = rng.choice(len(texts), size=min(n, len(texts)), replace=False)
+    return [texts[i] for i in idx], [labels[i] for i in idx]
+
+
+def time_calls(fn, args_list):
+    """
+    Call fn once per args tuple and return per-call latencies in milliseconds.
+    """
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def summarize(name, latencies_ms):
+    """
+    Print p50/p95/p99 and mean for a latency sample.
+    """
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    print(f"  {name:<28} p50 {p50:8.3f} ms | p95 {p95:8.3f} ms | "
+          f"p99 {p99:8.3f} ms | mean {latencies_ms.mean():8.3f} ms")
+
+
+def file_size_mb(path):
+    import os
+    return os.path.getsize(path) / (1024 * 1024)
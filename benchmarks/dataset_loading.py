@@ -0,0 +1,117 @@
+"""
+load_data cost: the previous full pd.read_csv + lists vs building the
+columnar cache (first run) vs memory-mapping it (later runs). Each variant
+runs in a fresh process and reports its peak RSS (VmHWM). The baseline row
+is the pandas import alone, which the CSV-parsing variants pay inside their
+time and peak.
+
+Usage:
+    python -m benchmarks.dataset_loading
+    python -m benchmarks.dataset_loading --csv data/master_training_data.csv --scale 20
+"""
+import argparse
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.utils import dataset
+from src.utils.helpers import DATASET_PATH
+
+VARIANTS = {
+    "baseline": "import pandas only",
+    "legacy": "legacy read_csv + lists",
+    "build": "chunked, building cache",
+    "cached": "cached (memory-mapped)",
+    "cached_iter": "cached + iterate all texts",
+}
+
+
+def _status_kb():
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key == "VmHWM":
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def legacy_load(path):
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    for col in df.columns:
+        if col.endswith("=text"):
+            df.rename(columns={col: "text"}, inplace=True)
+            break
+    df = df.dropna(subset=["text", "label"])
+    return df["text"].astype(str).tolist(), df["label"].astype(int).tolist()
+
+
+def _child(variant, path, cache_dir):
+    dataset.CACHE_DIR = cache_dir
+    start = time.perf_counter()
+    if variant == "baseline":
+        # What the pandas import alone costs the variants that need it
+        importlib.import_module("pandas")
+        texts = []
+    elif variant == "legacy":
+        texts, labels = legacy_load(path)
+    else:
+        texts, labels, _ = dataset.load_columnar(path)
+        if variant == "cached_iter":
+            for _ in texts:
+                pass
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": seconds,
+        "rows": len(texts),
+        "peak_mb": _status_kb()["VmHWM"] / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", default=DATASET_PATH)
+    parser.add_argument("--scale", type=int, default=10,
+                        help="repeat the CSV rows this many times")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    import pandas as pd
+
+    workdir = tempfile.mkdtemp(prefix="dataset_bench_")
+    try:
+        path = os.path.join(workdir, "data.csv")
+        source = pd.read_csv(args.csv)
+        pd.concat([source] * args.scale, ignore_index=True).to_csv(path, index=False)
+        cache_dir = os.path.join(workdir, "cache")
+
+        print("=" * 66)
+        print(f"Dataset loading: {os.path.getsize(path) / 2 ** 20:.1f} MB CSV")
+        print("=" * 66)
+        print(f"{'variant':<30}{'seconds':>10}{'peak RSS MB':>14}{'rows':>9}")
+        for variant, name in VARIANTS.items():
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.dataset_loading",
+                 "--child", variant, path, cache_dir],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{name:<30}{r['seconds']:>10.3f}{r['peak_mb']:>14.1f}{r['rows']:>9}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Vectorized ensemble voting vs the previous per-row loops, and serial vs
+concurrent (vs fused, with TensorFlow) member execution in EnsembleModel.
+
+Voting runs on random member outputs. Member execution uses numpy
+stand-in models (a dense layer + softmax) unless TensorFlow is installed,
+in which case small Keras models are built and the fused graph is timed too.
+
+Usage:
+    python -m benchmarks.ensemble_voting --samples 200000 --models 5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.models.ensemble import EnsembleModel, hard_vote, soft_vote
+
+
+def legacy_majority_vote(preds):
+    # Previous evaluate.ensemble_predict
+    pred_classes = [np.argmax(p, axis=1) for p in preds]
+    stacked = np.stack(pred_classes, axis=1)
+    final = []
+    for row in stacked:
+        values, counts = np.unique(row, return_counts=True)
+        final.append(values[np.argmax(counts)])
+    return np.array(final)
+
+
+def legacy_average(preds):
+    # Previous EnsembleModel.predict
+    return np.mean(np.array(preds), axis=0)
+
+
+def best_seconds(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class DenseStandIn:
+    """
+    Numpy model with a Keras-like predict(): softmax(X @ W).
+    """
+
+    def __init__(self, seed, n_features, n_classes):
+        self.W = np.random.default_rng(seed).standard_normal((n_features, n_classes))
+
+    def predict(self, X, verbose=0):
+        z = X @ self.W
+        z -= z.max(axis=1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+def keras_loader(n_features, n_classes):
+    import tensorflow as tf
+
+    def load(seed):
+        tf.keras.utils.set_random_seed(int(seed))
+        return tf.keras.Sequential([
+            tf.keras.Input(shape=(n_features,)),
+            tf.keras.layers.Dense(256, activation="relu"),
+            tf.keras.layers.Dense(n_classes, activation="softmax"),
+        ])
+    return load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--models", type=int, default=3)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--features", type=int, default=512,
+                        help="input width for the member execution benchmark")
+    parser.add_argument("--batch", type=int, default=20000,
+                        help="rows per call in the member execution benchmark")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    preds = [rng.dirichlet(np.ones(args.classes), size=args.samples) for _ in range(args.models)]
+    class_ids = np.stack([p.argmax(axis=1) for p in preds])
+
+    print("=" * 60)
+    print(f"Voting: {args.models} models x {args.samples} samples x {args.classes} classes")
+    print("=" * 60)
+    print(f"\n{'method':<34}{'seconds':>10}{'speedup':>10}")
+    loop_s = best_seconds(lambda: legacy_majority_vote(preds), repeats=1)
+    hard_s = best_seconds(lambda: hard_vote(class_ids, args.classes))
+    print(f"{'hard: np.unique per row (before)':<34}{loop_s:>10.4f}")
+    print(f"{'hard: bincount':<34}{hard_s:>10.4f}{loop_s / hard_s:>9.1f}x")
+    mean_s = best_seconds(lambda: legacy_average(preds))
+    soft_s = best_seconds(lambda: soft_vote(preds))
+    print(f"{'soft: np.array + mean (before)':<34}{mean_s:>10.4f}")
+    print(f"{'soft: tensordot':<34}{soft_s:>10.4f}{mean_s / soft_s:>9.1f}x")
+    weights = np.arange(1, args.models + 1)
+    print(f"{'hard, weighted':<34}{best_seconds(lambda: hard_vote(class_ids, args.classes, weights)):>10.4f}")
+    print(f"{'soft, weighted':<34}{best_seconds(lambda: soft_vote(preds, weights)):>10.4f}")
+
+    same_hard = np.array_equal(legacy_majority_vote(preds), hard_vote(class_ids, args.classes)[0])
+    same_soft = np.allclose(legacy_average(preds), soft_vote(preds))
+    print(f"\nIdentical hard votes: {same_hard} | soft averages match: {same_soft}")
+
+    try:
+        loader = keras_loader(args.features, args.classes)
+        backend = "Keras"
+    except ImportError:
+        loader = lambda seed: DenseStandIn(int(seed), args.features, args.classes)  # noqa: E731
+        backend = "numpy stand-in"
+
+    X = rng.standard_normal((args.batch, args.features)).astype(np.float32)
+    seeds = [str(i) for i in range(args.models)]
+    variants = [("serial", dict(concurrent=False)), ("concurrent", dict(concurrent=True))]
+    if backend == "Keras":
+        variants.append(("fused graph", dict(concurrent=False, fused=True)))
+
+    print(f"\nMember execution ({backend}, {args.batch} rows per call)")
+    print(f"{'mode':<34}{'seconds':>10}{'speedup':>10}")
+    baseline = None
+    for name, options in variants:
+        ensemble = EnsembleModel(seeds, loader=loader, **options)
+        ensemble.predict(X[:8])
+        seconds = best_seconds(lambda: ensemble.predict(X))
+        ensemble.close()
+        baseline = baseline or seconds
+        print(f"{name:<34}{seconds:>10.4f}{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
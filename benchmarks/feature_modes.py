@@ -0,0 +1,108 @@
+"""
+Compare the vocabulary-backed FeatureUnion with the hashed TF-IDF mode:
+test accuracy, artifact size, load time and transform throughput.
+
+Usage:
+    python -m benchmarks.feature_modes --samples 20000
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from benchmarks.common import file_size_mb, sample_texts
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+from src.utils.helpers import clean_text
+from train import DEFAULT_HASH_BUCKETS, build_vectorizer
+
+
+def _save_and_reload(vectorizer, mode, workdir):
+    if mode == "hashed":
+        path = os.path.join(workdir, "vectorizer_hashed.npz")
+        vectorizer.save(path)
+        start = time.perf_counter()
+        HashedTfidfVectorizer.load(path)
+    else:
+        path = os.path.join(workdir, "vectorizer_full.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(vectorizer, f)
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            pickle.load(f)
+    return path, (time.perf_counter() - start) * 1000
+
+
+def run_mode(mode, train_texts, test_texts, y_train, y_test, hash_buckets, workdir):
+    vectorizer = build_vectorizer(mode, hash_buckets)
+
+    start = time.perf_counter()
+    X_train = vectorizer.fit_transform(train_texts)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    X_test = vectorizer.transform(test_texts)
+    transform_s = time.perf_counter() - start
+
+    model = CalibratedClassifierCV(
+        LogisticRegression(max_iter=2000, random_state=42, class_weight="balanced"),
+        method="sigmoid",
+        cv=3,
+    )
+    model.fit(X_train, y_train)
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+
+    path, load_ms = _save_and_reload(vectorizer, mode, workdir)
+    model_path = os.path.join(workdir, f"model_{mode}.pkl")
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+
+    return {
+        "mode": mode,
+        "features": X_train.shape[1],
+        "accuracy": accuracy,
+        "artifact_mb": file_size_mb(path),
+        "model_mb": file_size_mb(model_path),
+        "load_ms": load_ms,
+        "fit_s": fit_s,
+        "docs_per_sec": len(test_texts) / max(transform_s, 1e-9),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--hash-buckets", type=int, default=DEFAULT_HASH_BUCKETS)
+    args = parser.parse_args()
+
+    texts, labels = sample_texts(args.samples)
+    texts = [clean_text(t) for t in texts]
+    train_texts, test_texts, y_train, y_test = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels
+    )
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [
+            run_mode(mode, train_texts, test_texts, y_train, y_test,
+                     args.hash_buckets, workdir)
+            for mode in ("vocab", "hashed")
+        ]
+
+    print("=" * 88)
+    print(f"FEATURE MODE REPORT ({len(train_texts)} train / {len(test_texts)} test)")
+    print("=" * 88)
+    print(f"{'mode':<8}{'features':>10}{'accuracy':>10}{'vectorizer MB':>15}"
+          f"{'model MB':>10}{'load ms':>10}{'fit s':>8}{'transform docs/s':>18}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['features']:>10}{r['accuracy']:>10.4f}"
+              f"{r['artifact_mb']:>15.2f}{r['model_mb']:>10.2f}{r['load_ms']:>10.2f}"
+              f"{r['fit_s']:>8.2f}{r['docs_per_sec']:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Parity and latency check of the compiled linear scorer against the pickled
+CalibratedClassifierCV.
+
+Usage:
+    python -m benchmarks.linear_scorer --samples 500
+"""
+import argparse
+import pickle
+import time
+
+from benchmarks.common import sample_texts, summarize, time_calls
+from predict import MODEL_PATH, SCORER_PATH, VECTORIZER_PATH
+from src.models.linear_scorer import LinearScorer, max_abs_difference
+from src.utils.helpers import clean_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(MODEL_PATH, "rb") as f:
+        model = pickle.load(f)
+    pickle_load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    scorer = LinearScorer.load(SCORER_PATH)
+    scorer_load_ms = (time.perf_counter() - start) * 1000
+
+    with open(VECTORIZER_PATH, "rb") as f:
+        vectorizer = pickle.load(f)
+
+    texts, _ = sample_texts(args.samples)
+    X = vectorizer.transform([clean_text(t) for t in texts])
+    rows = [(X[i],) for i in range(X.shape[0])]
+
+    print("=" * 60)
+    print("LINEAR SCORER vs PICKLED MODEL")
+    print("=" * 60)
+
+    diff = max_abs_difference(scorer, model, X)
+    print(f"\nParity on {X.shape[0]} samples: max |diff| = {diff:.3e}")
+    agree = (scorer.predict(X) == model.predict(X)).mean()
+    print(f"Label agreement: {agree * 100:.2f}%")
+
+    print("\nLoad time:")
+    print(f"  pickle model                 {pickle_load_ms:8.2f} ms")
+    print(f"  linear scorer                {scorer_load_ms:8.2f} ms")
+
+    print("\nPer-request latency (one row, predict_proba):")
+    summarize("pickled model", time_calls(model.predict_proba, rows))
+    summarize("linear scorer", time_calls(scorer.predict_proba, rows))
+
+    print(f"\nBatch latency ({X.shape[0]} rows, predict_proba):")
+    summarize("pickled model", time_calls(model.predict_proba, [(X,)] * 20))
+    summarize("linear scorer", time_calls(scorer.predict_proba, [(X,)] * 20))
+
+
+if __name__ == "__main__":
+    main()
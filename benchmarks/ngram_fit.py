@@ -0,0 +1,89 @@
+"""
+Peak memory and wall time of NgramExtractor.fit: the previous
+collect-everything implementation vs incremental counting (1 and N
+processes) vs the approximate SpaceSaving top-K mode.
+
+Peak memory is traced with tracemalloc in this process; with n_jobs > 1
+the counting happens in the workers, so the figure covers the merge only.
+
+Usage:
+    python -m benchmarks.ngram_fit --samples 20000 --jobs 4
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.common import sample_texts
+from src.preprocessing.ngram_extractor import NgramExtractor
+
+
+def legacy_fit(extractor, texts):
+    word_grams = []
+    char_grams = []
+    for t in texts:
+        word_grams.extend(extractor._extract_word_ngrams(t, n=2))
+        word_grams.extend(extractor._extract_word_ngrams(t, n=3))
+        char_grams.extend(extractor._extract_char_ngrams(t, n=3))
+        char_grams.extend(extractor._extract_char_ngrams(t, n=4))
+    extractor.word_vocab = [w for w, _ in Counter(word_grams).most_common(extractor.max_features)]
+    extractor.char_vocab = [c for c, _ in Counter(char_grams).most_common(extractor.max_features)]
+
+
+def measure(fit):
+    tracemalloc.start()
+    start = time.perf_counter()
+    extractor = fit()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return extractor, elapsed, peak / (1024 * 1024)
+
+
+def recall(approx, exact):
+    return len(set(approx) & set(exact)) / max(len(exact), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--max-features", type=int, default=3000)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    texts, _ = sample_texts(args.samples)
+
+    def run(**kwargs):
+        def fit():
+            extractor = NgramExtractor(max_features=args.max_features)
+            if kwargs.pop("legacy", False):
+                legacy_fit(extractor, texts)
+            else:
+                extractor.fit(texts, **kwargs)
+            return extractor
+        return fit
+
+    variants = [
+        ("legacy (lists + Counter)", run(legacy=True)),
+        ("incremental, 1 process", run()),
+        (f"incremental, {args.jobs} processes", run(n_jobs=args.jobs)),
+        ("approx SpaceSaving, 1 process", run(approx=True)),
+        (f"approx SpaceSaving, {args.jobs} processes", run(approx=True, n_jobs=args.jobs)),
+    ]
+
+    print("=" * 84)
+    print(f"NgramExtractor.fit on {len(texts)} texts (max_features={args.max_features})")
+    print("=" * 84)
+    print(f"{'variant':<36}{'wall s':>9}{'peak MB':>10}{'word recall':>14}{'char recall':>14}")
+    reference = None
+    for name, fit in variants:
+        extractor, elapsed, peak = measure(fit)
+        if reference is None:
+            reference = extractor
+        print(f"{name:<36}{elapsed:>9.2f}{peak:>10.1f}"
+              f"{recall(extractor.word_vocab, reference.word_vocab):>14.3f}"
+              f"{recall(extractor.char_vocab, reference.char_vocab):>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Scaling of parallel featurization: the fitted train.py vectorizer and
+FeatureEngineer transformed with 1/4/16 worker processes. Checks that every
+worker count yields the identical matrix.
+
+Usage:
+    python -m benchmarks.parallel_featurize --samples 20000 --workers 1 4 16
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import sample_texts
+from src.preprocessing.feature_engineering import FeatureEngineer
+from src.preprocessing.parallel_featurize import parallel_transform
+from src.utils.helpers import clean_text
+from train import build_vectorizer
+
+
+def identical(a, b):
+    return (a.shape == b.shape
+            and np.array_equal(a.indptr, b.indptr)
+            and np.array_equal(a.indices, b.indices)
+            and np.array_equal(a.data, b.data))
+
+
+def scale(name, transformer, texts, workers, chunk_size):
+    print(f"\n{name}")
+    print(f"  {'workers':>8}{'seconds':>10}{'texts/s':>12}{'speedup':>10}{'identical':>11}")
+    reference = baseline = None
+    for n in workers:
+        start = time.perf_counter()
+        X = parallel_transform(transformer, texts, n_jobs=n, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = X, elapsed
+        print(f"  {n:>8}{elapsed:>10.2f}{len(texts) / elapsed:>12.0f}"
+              f"{baseline / elapsed:>9.1f}x{str(identical(reference, X)):>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--features", choices=("vocab", "hashed"), default="vocab")
+    args = parser.parse_args()
+
+    texts, _ = sample_texts(args.samples)
+    cleaned = [clean_text(t) for t in texts]
+
+    print("=" * 60)
+    print(f"Parallel featurization on {len(texts)} texts "
+          f"({os.cpu_count()} cores, chunk size {args.chunk_size})")
+    print("=" * 60)
+
+    vectorizer = build_vectorizer(args.features)
+    start = time.perf_counter()
+    vectorizer.fit(cleaned)
+    print(f"vectorizer fit (single core): {time.perf_counter() - start:.2f} s")
+    scale(f"train.py {args.features} TF-IDF transform", vectorizer, cleaned,
+          args.workers, args.chunk_size)
+
+    engineer = FeatureEngineer()
+    engineer.fit(texts)
+    scale("FeatureEngineer.transform_batch", engineer, texts, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
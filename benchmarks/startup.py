@@ -0,0 +1,94 @@
+"""
+Cold-import budget for the serving path.
+
+Imports each module in a fresh interpreter with `python -X importtime`,
+reports the total and the heaviest direct imports, and exits non-zero when
+the total exceeds --budget-ms or a heavy dependency (sklearn, scipy, pandas,
+TensorFlow, pdfplumber, python-docx) is imported eagerly. Those belong behind
+first use or predict.warmup().
+
+Usage:
+    python -m benchmarks.startup --budget-ms 500
+    python -m benchmarks.startup --modules predict --budget-ms 250
+"""
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("sklearn", "scipy", "pandas", "tensorflow", "keras", "pdfplumber", "docx")
+
+
+def import_profile(module):
+    """
+    [(depth, self_us, cumulative_us, name)] from -X importtime in a fresh process.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def check(module, budget_ms, runs, top):
+    # Best of several runs: the first one also pays for cold disk caches
+    profiles = [import_profile(module) for _ in range(runs)]
+    totals = [next(r[2] for r in rows if r[3] == module and r[0] == 0) / 1000 for rows in profiles]
+    best = min(range(runs), key=totals.__getitem__)
+    rows, total_ms = profiles[best], totals[best]
+
+    print(f"\nimport {module}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms, best of {runs})")
+    # importtime lists children before their parent: the module's direct
+    # imports are the depth-1 rows since the previous top-level row
+    end = next(i for i, r in enumerate(rows) if r[3] == module and r[0] == 0)
+    start = max((i for i in range(end) if rows[i][0] == 0), default=-1) + 1
+    direct = sorted((r for r in rows[start:end] if r[0] == 1), key=lambda r: r[2], reverse=True)
+    for _, _, cumulative_us, name in direct[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    heavy = sorted({r[3] for r in rows if r[3].split(".")[0] in HEAVY_MODULES})
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"{module}: {total_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+    if heavy:
+        roots = sorted({name.split(".")[0] for name in heavy})
+        failures.append(f"{module}: imports {', '.join(roots)} at startup")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", nargs="+", default=["web_app", "predict"])
+    parser.add_argument("--budget-ms", type=float, default=500.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Serving-path cold import time")
+    print("=" * 60)
+
+    failures = []
+    for module in args.modules:
+        failures.extend(check(module, args.budget_ms, args.runs, args.top))
+
+    if failures:
+        print("\n[FAIL]")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n[OK] All modules within budget")
+
+
+if __name__ == "__main__":
+    main()
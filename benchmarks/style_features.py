@@ -0,0 +1,59 @@
+"""
+Throughput of the eight style features: FeatureEngineer.basic_features per
+text vs the batch engine in src.preprocessing.style_features, on short and
+long inputs. Also checks that both produce identical values.
+
+Usage:
+    python -m benchmarks.style_features --samples 2000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import sample_texts
+from src.preprocessing.feature_engineering import FeatureEngineer
+from src.preprocessing.style_features import basic_features_batch
+
+
+def throughput(fn, texts, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best, sum(map(len, texts)) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--long-factor", type=int, default=20,
+                        help="texts joined per long input")
+    args = parser.parse_args()
+
+    texts, _ = sample_texts(args.samples)
+    short = [" ".join(t.split()[:30]) for t in texts]
+    long = [" ".join(texts[i:i + args.long_factor])
+            for i in range(0, len(texts), args.long_factor)]
+
+    engineer = FeatureEngineer()
+
+    def per_text(batch):
+        return np.array([engineer.basic_features(t) for t in batch], dtype=float)
+
+    print("=" * 78)
+    print("Style feature throughput")
+    print("=" * 78)
+    print(f"{'input':<10}{'texts':>7}{'method':>12}{'texts/s':>14}{'Mchars/s':>11}{'speedup':>10}")
+    for name, batch in (("short", short), ("dataset", texts), ("long", long)):
+        assert np.array_equal(per_text(batch), basic_features_batch(batch))
+        base_tps, base_cps = throughput(per_text, batch)
+        fast_tps, fast_cps = throughput(basic_features_batch, batch)
+        print(f"{name:<10}{len(batch):>7}{'per-text':>12}{base_tps:>14.0f}{base_cps:>11.2f}")
+        print(f"{'':<10}{'':>7}{'batch':>12}{fast_tps:>14.0f}{fast_cps:>11.2f}{fast_tps / base_tps:>9.1f}x")
+    print("\nValues identical: yes")
+
+
+if __name__ == "__main__":
+    main()
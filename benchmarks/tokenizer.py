@@ -0,0 +1,106 @@
+"""
+FastTokenizer vs the Keras TextTokenizer path: encode throughput, identical
+output, and the time a fresh process needs to import each one.
+
+Fits a Keras tokenizer when TensorFlow is installed; otherwise loads the
+word index from --tokenizer and only the FastTokenizer numbers are shown.
+
+Usage:
+    python -m benchmarks.tokenizer --samples 5000 --tokenizer outputs/tokenizer.json
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import sample_texts
+from src.utils.fast_tokenizer import FastTokenizer
+
+
+def import_seconds(module, repeats=3):
+    """
+    Best wall time of `python -c "import module"` in a fresh interpreter.
+    """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", f"import {module}"],
+            capture_output=True,
+            cwd=os.getcwd(),
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def throughput(encode, texts, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encode(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--tokenizer", default="outputs/tokenizer.json")
+    args = parser.parse_args()
+
+    texts, _ = sample_texts(args.samples)
+
+    try:
+        from src.utils.tokenizer import TextTokenizer
+    except ImportError:
+        TextTokenizer = None
+
+    print("=" * 60)
+    print(f"Tokenizer benchmark on {len(texts)} texts")
+    print("=" * 60)
+
+    keras = None
+    if TextTokenizer is not None:
+        keras = TextTokenizer()
+        keras.fit(texts)
+        fast = keras.fast_tokenizer()
+    elif os.path.exists(args.tokenizer):
+        fast = FastTokenizer.load(args.tokenizer)
+    else:
+        print(f"TensorFlow is not installed and {args.tokenizer} does not exist.")
+        return
+
+    print(f"\n{'encoder':<22}{'texts/s':>12}{'speedup':>10}")
+    fast_tps = throughput(fast.texts_to_sequences, texts)
+    if keras is not None:
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+        from src.utils.helpers import clean_text
+
+        def keras_encode(batch):
+            seq = keras.tokenizer.texts_to_sequences([clean_text(t) for t in batch])
+            return pad_sequences(seq, maxlen=keras.max_len, padding="post", truncating="post")
+
+        same = np.array_equal(keras_encode(texts), fast.texts_to_sequences(texts))
+        keras_tps = throughput(keras_encode, texts)
+        print(f"{'Keras + pad_sequences':<22}{keras_tps:>12.0f}")
+        print(f"{'FastTokenizer':<22}{fast_tps:>12.0f}{fast_tps / keras_tps:>9.1f}x")
+        print(f"\nIdentical ids: {same}")
+    else:
+        print(f"{'FastTokenizer':<22}{fast_tps:>12.0f}")
+        print("\n(TensorFlow not installed: Keras path skipped)")
+
+    print(f"\n{'import in fresh process':<34}{'seconds':>10}")
+    for module in ("src.utils.fast_tokenizer", "src.utils.tokenizer"):
+        seconds = import_seconds(module)
+        shown = f"{seconds:>10.3f}" if seconds is not None else f"{'failed':>10}"
+        print(f"{module:<34}{shown}")
+
+
+if __name__ == "__main__":
+    main()
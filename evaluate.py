@@ -1,89 +1,360 @@
+"""
+Evaluate the production model and the Keras models on the test split.
+
+Test rows are the ones train.py holds out (stratified 20%, seed 42). They
+are read and cleaned once, in fixed-size batches, and handed to one worker
+thread per model through bounded queues, so models run concurrently and at
+most `prefetch` batches per model are in memory. Metrics accumulate in a
+confusion matrix per model; per-batch latencies give throughput and
+latency percentiles.
+
+Usage:
+    python evaluate.py
+    python evaluate.py --batch-size 512 --keras models/lstm_model.h5 models/cnn_model.h5
+    python evaluate.py --no-keras --output models/eval_report.json
+"""
+import argparse
+import json
 import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from tensorflow.keras.models import load_model
 
-from helpers import load_dataset, load_tokenizer
-from tokenizers import tokenize
+from src.models.ensemble import hard_vote, soft_vote
+from src.utils.helpers import clean_text, load_data
 
-MAX_LEN = 100
 MODEL_DIR = "models"
+KERAS_MODEL_PATHS = [
+    os.path.join(MODEL_DIR, "lstm_model.h5"),
+    os.path.join(MODEL_DIR, "gru_model.h5"),
+    os.path.join(MODEL_DIR, "cnn_model.h5"),
+]
+TOKENIZER_PATH = os.path.join("outputs", "tokenizer.json")
+REPORT_PATH = os.path.join(MODEL_DIR, "eval_report.json")
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_PREFETCH = 4
+MAX_LEN = 300
 
 
-def encode_texts(texts, word_index):
-    encoded = []
-    for t in texts:
-        tokens = tokenize(t)
-        encoded.append([word_index.get(w, 0) for w in tokens])
-    return pad_sequences(encoded, maxlen=MAX_LEN, padding="post")
+def test_indices(labels, test_size=0.2, seed=42):
+    """
+    Row indices of the test split train.py evaluates on.
+    """
+    from sklearn.model_selection import train_test_split
+
+    _, test_idx = train_test_split(
+        np.arange(len(labels)), test_size=test_size, random_state=seed, stratify=labels
+    )
+    return test_idx
 
 
-def ensemble_predict(preds):
+class StreamingMetrics:
+    """
+    Classification metrics and timings accumulated batch by batch: a
+    confusion matrix plus one latency per batch, whatever the dataset size.
+    """
+
+    def __init__(self, n_classes=2):
+        self.n_classes = n_classes
+        self.confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self.batch_seconds = []
+        self.docs = 0
+
+    def update(self, y_true, y_pred, seconds=None):
+        y_true = np.asarray(y_true, dtype=np.int64)
+        y_pred = np.asarray(y_pred, dtype=np.int64)
+        k = self.n_classes
+        if len(y_pred) and (y_pred.min() < 0 or y_pred.max() >= k):
+            raise ValueError(f"Predicted labels outside 0..{k - 1}: {np.unique(y_pred).tolist()}")
+        self.confusion += np.bincount(y_true * k + y_pred, minlength=k * k).reshape(k, k)
+        self.docs += len(y_true)
+        if seconds is not None:
+            self.batch_seconds.append(seconds)
+
+    def result(self):
+        """
+        Accuracy, weighted and macro precision/recall/F1 (as sklearn with
+        zero_division=0), throughput and batch latency percentiles.
+        """
+        cm = self.confusion
+        tp = np.diag(cm).astype(np.float64)
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        weights = support / max(support.sum(), 1)
+
+        result = {
+            "docs": int(self.docs),
+            "accuracy": float(tp.sum() / max(self.docs, 1)),
+            "precision": float(precision @ weights),
+            "recall": float(recall @ weights),
+            "f1": float(f1 @ weights),
+            "f1_macro": float(f1.mean()),
+            "confusion_matrix": cm.tolist(),
+        }
+        if self.batch_seconds:
+            seconds = np.array(self.batch_seconds)
+            p50, p95, p99 = np.percentile(seconds * 1000, [50, 95, 99])
+            result.update(
+                seconds=float(seconds.sum()),
+                docs_per_sec=float(self.docs / max(seconds.sum(), 1e-12)),
+                batch_p50_ms=float(p50),
+                batch_p95_ms=float(p95),
+                batch_p99_ms=float(p99),
+                doc_mean_ms=float(seconds.sum() * 1000 / max(self.docs, 1)),
+            )
+        return result
+
+
+class ProductionEvaluator:
+    """
+    The model/vectorizer pair predict.py serves (bundle, linear scorer or
+    pickle, whichever train.py wrote last), loaded through its own loader.
+    """
+
+    def __init__(self):
+        from predict import _load_artifacts
+
+        self.model, self.vectorizer = _load_artifacts()
+
+    def predict(self, cleaned):
+        return self.model.predict(self.vectorizer.transform(cleaned))
+
+
+class KerasEvaluator:
+    """
+    A saved Keras model fed by FastTokenizer; sequences are written into one
+    reused int32 buffer per batch.
+    """
+
+    def __init__(self, path, tokenizer_path=TOKENIZER_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        from tensorflow.keras.models import load_model
+
+        from src.utils.fast_tokenizer import FastTokenizer
+
+        self.model = load_model(path)
+        max_len = self.model.input_shape[1] or MAX_LEN
+        self.tokenizer = FastTokenizer.load(tokenizer_path, max_len=max_len)
+        self._buffer = np.zeros((batch_size, max_len), dtype=np.int32)
+
+    def predict(self, cleaned):
+        if len(cleaned) > len(self._buffer):
+            self._buffer = np.zeros((len(cleaned), self._buffer.shape[1]), dtype=np.int32)
+        X = self.tokenizer.texts_to_sequences(cleaned, out=self._buffer[:len(cleaned)], clean=False)
+        return np.argmax(self.model.predict_on_batch(X), axis=1)
+
+
+def majority_vote(pred_classes, weights=None):
+    """
+    pred_classes = list of (num_samples,) label arrays, one per model
+    Most frequent (weighted) label per row, ties going to the smaller label.
+    """
+    return hard_vote(pred_classes, weights=weights)[0]
+
+
+def ensemble_predict(preds, voting="hard", weights=None):
     """
     preds = list of (num_samples x num_classes) arrays
-    Uses majority vote across models.
+    hard = majority vote of the models' classes, soft = argmax of the mean
+    probabilities; weights scales each model's share.
+    """
+    if voting == "soft":
+        return soft_vote(preds, weights).argmax(axis=1)
+    n_classes = np.shape(preds[0])[1]
+    return hard_vote([np.argmax(p, axis=1) for p in preds], n_classes, weights)[0]
+
+
+def _produce(texts, labels, indices, batch_size, queues, stats):
+    """
+    Read and clean the test rows batch by batch and hand every batch to
+    each model queue; queues are bounded, so a slow model throttles reading.
     """
-    pred_classes = [np.argmax(p, axis=1) for p in preds]
-    stacked = np.stack(pred_classes, axis=1)
+    try:
+        for start in range(0, len(indices), batch_size):
+            rows = indices[start:start + batch_size]
+            began = time.perf_counter()
+            cleaned = [clean_text(texts[i]) for i in rows]
+            stats["clean_seconds"] += time.perf_counter() - began
+            y = labels[rows]
+            for q in queues:
+                q.put((start, cleaned, y))
+    finally:
+        # Workers stop even if reading fails
+        for q in queues:
+            q.put(None)
 
-    # Majority vote along each row
-    final = []
-    for row in stacked:
-        values, counts = np.unique(row, return_counts=True)
-        final.append(values[np.argmax(counts)])
-    return np.array(final)
 
+def _consume(name, factory, q, n_docs, n_classes, keep_predictions):
+    """
+    Worker thread of one model: load it, then score queued batches until
+    the end marker. A failing model keeps draining its queue so the
+    producer never blocks on it.
+    """
+    outcome = {"name": name, "error": None}
+    metrics = StreamingMetrics(n_classes)
+    predictions = np.zeros(n_docs, dtype=np.int64) if keep_predictions else None
+    model = None
+    try:
+        began = time.perf_counter()
+        model = factory()
+        outcome["load_seconds"] = time.perf_counter() - began
+    except Exception as exc:
+        outcome["error"] = f"{type(exc).__name__}: {exc}"
+
+    while (item := q.get()) is not None:
+        if outcome["error"] is not None:
+            continue
+        start, cleaned, y = item
+        try:
+            began = time.perf_counter()
+            y_pred = np.asarray(model.predict(cleaned))
+            metrics.update(y, y_pred, time.perf_counter() - began)
+        except Exception as exc:
+            outcome["error"] = f"{type(exc).__name__}: {exc}"
+            continue
+        if predictions is not None:
+            predictions[start:start + len(y)] = y_pred
+
+    if outcome["error"] is None:
+        outcome["metrics"] = metrics.result()
+        outcome["predictions"] = predictions
+    return outcome
+
+
+def evaluate_models(models, texts, labels, indices, batch_size=DEFAULT_BATCH_SIZE,
+                    prefetch=DEFAULT_PREFETCH, keep_predictions=()):
+    """
+    Score every model in models ({name: factory returning an object with
+    predict(cleaned texts) -> labels}) over texts[indices] concurrently.
+    Returns ({name: outcome}, producer stats). Predicted labels are kept
+    only for the names in keep_predictions.
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    n_classes = max(2, int(labels.max()) + 1) if len(labels) else 2
+    queues = {name: queue.Queue(maxsize=prefetch) for name in models}
+    stats = {"clean_seconds": 0.0, "docs": len(indices)}
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(models))) as pool:
+        futures = {
+            name: pool.submit(_consume, name, factory, queues[name], len(indices),
+                              n_classes, name in keep_predictions)
+            for name, factory in models.items()
+        }
+        _produce(texts, labels, indices, batch_size, list(queues.values()), stats)
+        outcomes = {name: future.result() for name, future in futures.items()}
+    stats["wall_seconds"] = time.perf_counter() - began
+    return outcomes, stats
 
-def print_metrics(y_true, y_pred, name):
+
+def print_metrics(metrics, name):
     print(f"\n🔹 {name} Metrics")
     print("--------------------------------")
-    print("Accuracy :", accuracy_score(y_true, y_pred))
-    print("Precision:", precision_score(y_true, y_pred, average="weighted"))
-    print("Recall   :", recall_score(y_true, y_pred, average="weighted"))
-    print("F1 Score :", f1_score(y_true, y_pred, average="weighted"))
+    print("Accuracy :", metrics["accuracy"])
+    print("Precision:", metrics["precision"])
+    print("Recall   :", metrics["recall"])
+    print("F1 Score :", metrics["f1"])
+    if "docs_per_sec" in metrics:
+        print(f"Throughput: {metrics['docs_per_sec']:.1f} docs/sec "
+              f"| batch p50 {metrics['batch_p50_ms']:.1f} ms "
+              f"| p95 {metrics['batch_p95_ms']:.1f} ms | p99 {metrics['batch_p99_ms']:.1f} ms")
 
 
-def evaluate():
+def evaluate(keras_paths=KERAS_MODEL_PATHS, production=True, tokenizer_path=TOKENIZER_PATH,
+             batch_size=DEFAULT_BATCH_SIZE, prefetch=DEFAULT_PREFETCH, limit=None,
+             output=REPORT_PATH):
     print("Loading dataset...")
-    texts, labels = load_dataset()
+    texts, labels = load_data()
+    labels = np.asarray(labels, dtype=np.int64)
+    indices = test_indices(labels)
+    if limit:
+        indices = indices[:limit]
+    print(f"[OK] Test split: {len(indices)} samples")
 
-    # Load tokenizer
-    print("Loading tokenizer...")
-    word_index = load_tokenizer()
+    models = {}
+    if production:
+        models["Logistic Regression"] = ProductionEvaluator
+    keras_names = []
+    for path in keras_paths:
+        if not os.path.exists(path):
+            print(f"[WARN] Skipping missing Keras model: {path}")
+            continue
+        name = os.path.splitext(os.path.basename(path))[0].replace("_model", "").upper()
+        models[name] = lambda path=path: KerasEvaluator(path, tokenizer_path, batch_size)
+        keras_names.append(name)
+    if not models:
+        raise FileNotFoundError("No models to evaluate. Train the model first.")
 
-    # Encode text
-    print("Encoding text...")
-    X = encode_texts(texts, word_index)
-    y_true = np.array(labels)
+    print(f"Running {len(models)} model(s) concurrently in batches of {batch_size}...")
+    outcomes, stats = evaluate_models(
+        models, texts, labels, indices, batch_size, prefetch,
+        keep_predictions=keras_names if len(keras_names) > 1 else (),
+    )
 
-    print("Loading models...")
-    lstm = load_model(f"{MODEL_DIR}/lstm_model.h5")
-    gru = load_model(f"{MODEL_DIR}/gru_model.h5")
-    cnn = load_model(f"{MODEL_DIR}/cnn_model.h5")
+    report = {"test_docs": len(indices), "batch_size": batch_size, "models": {}}
+    for name, outcome in outcomes.items():
+        if outcome["error"] is not None:
+            print(f"\n[WARN] {name} failed: {outcome['error']}")
+            report["models"][name] = {"error": outcome["error"]}
+            continue
+        metrics = outcome["metrics"]
+        metrics["load_seconds"] = outcome["load_seconds"]
+        print_metrics(metrics, name)
+        report["models"][name] = metrics
 
- 
-    print("Running predictions...")
+    voters = [outcomes[n]["predictions"] for n in keras_names if outcomes[n]["error"] is None]
+    if len(voters) > 1:
+        print("\n🔮 Running Ensemble (Majority Vote)...")
+        ensemble = StreamingMetrics(max(2, int(labels.max()) + 1))
+        ensemble.update(labels[indices], majority_vote(voters))
+        report["models"]["Ensemble"] = ensemble.result()
+        print_metrics(report["models"]["Ensemble"], "Ensemble")
 
-    lstm_pred = lstm.predict(X, verbose=0)
-    gru_pred  = gru.predict(X, verbose=0)
-    cnn_pred  = cnn.predict(X, verbose=0)
+    report["clean_seconds"] = stats["clean_seconds"]
+    report["wall_seconds"] = stats["wall_seconds"]
+    print(f"\n  Cleaning: {stats['docs'] / max(stats['clean_seconds'], 1e-12):.1f} docs/sec "
+          f"(shared by all models) | wall time {stats['wall_seconds']:.1f}s")
 
-    lstm_labels = np.argmax(lstm_pred, axis=1)
-    gru_labels  = np.argmax(gru_pred, axis=1)
-    cnn_labels  = np.argmax(cnn_pred, axis=1)
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Report saved to {output}")
 
-    print_metrics(y_true, lstm_labels, "LSTM")
-    print_metrics(y_true, gru_labels, "GRU")
-    print_metrics(y_true, cnn_labels, "CNN")
+    print("\n🎉 Evaluation completed!")
+    return report
 
-    print("\n🔮 Running Ensemble (Majority Vote)...")
-    final_pred = ensemble_predict([lstm_pred, gru_pred, cnn_pred])
 
-    print_metrics(y_true, final_pred, "Ensemble")
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate trained models on the test split.")
+    parser.add_argument("--keras", nargs="*", default=KERAS_MODEL_PATHS,
+                        help="Keras model files (default: LSTM, GRU and CNN in models/)")
+    parser.add_argument("--no-keras", action="store_true", help="skip the Keras models")
+    parser.add_argument("--no-production", action="store_true",
+                        help="skip the production model predict.py serves")
+    parser.add_argument("--tokenizer", default=TOKENIZER_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH,
+                        help="batches queued per model")
+    parser.add_argument("--limit", type=int, default=None, help="evaluate the first N test rows")
+    parser.add_argument("--output", default=REPORT_PATH, help="JSON report path ('' to skip)")
+    args = parser.parse_args()
 
-    print("\n🎉 Evaluation completed!")
+    evaluate(
+        keras_paths=[] if args.no_keras else args.keras,
+        production=not args.no_production,
+        tokenizer_path=args.tokenizer,
+        batch_size=args.batch_size,
+        prefetch=args.prefetch,
+        limit=args.limit,
+        output=args.output,
+    )
 
 
 if __name__ == "__main__":
-    evaluate()
+    main()
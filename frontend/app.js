@@ -28,6 +28,7 @@ const tabButtons = Array.from(document.querySelectorAll(".tab-btn"));
 const tabPanels = Array.from(document.querySelectorAll(".tab-panel"));
 
 let isExtracting = false;
+let isScanning = false;
 let isDriveAuthenticated = false;
 let gapi = null;
 let tokenClient = null;
@@ -157,11 +158,23 @@ const buildHighlights = (text, sentences) => {
     .join("");
 };
 
-const runAnalysis = async (text) => {
+// Sentence results from the previous scan, keyed by the server's sentence
+// hash. Sent back as known_sentences so only edited sentences are rescored.
+let sentenceResults = new Map();
+let analysisRevision = 0;
+
+// Returns null when a newer scan was started before this one answered:
+// that scan owns sentenceResults and renders its own result.
+const runAnalysis = async (text, retried = false) => {
+  analysisRevision += 1;
   const response = await fetch("/api/analyze", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ text }),
+    body: JSON.stringify({
+      text,
+      revision: analysisRevision,
+      known_sentences: Array.from(sentenceResults.keys()),
+    }),
   });
 
   if (!response.ok) {
@@ -170,7 +183,34 @@ const runAnalysis = async (text) => {
     throw new Error(errorMessage);
   }
 
-  return response.json();
+  const analysis = await response.json();
+  if (analysis.revision !== analysisRevision) {
+    return null;
+  }
+
+  // A reused hash we no longer hold: ask again without it so it is rescored
+  const sentences = analysis.sentences || [];
+  const lost = sentences.some(
+    (sentence) => sentence.reused && !sentenceResults.has(sentence.hash)
+  );
+  if (lost && !retried) {
+    return runAnalysis(text, true);
+  }
+
+  // Fill reused sentences from the local results, then keep only the
+  // sentences of this revision for the next request
+  const nextResults = new Map();
+  analysis.sentences = sentences.map((sentence) => {
+    const previous = sentence.reused ? sentenceResults.get(sentence.hash) : null;
+    const resolved = previous ? { ...previous, text: sentence.text } : sentence;
+    if (sentence.hash) {
+      nextResults.set(sentence.hash, resolved);
+    }
+    return resolved;
+  });
+  sentenceResults = nextResults;
+
+  return analysis;
 };
 
 input.addEventListener("input", updateCounts);
@@ -663,10 +703,22 @@ form.addEventListener("submit", async (event) => {
     return;
   }
 
+  if (isScanning) {
+    return;
+  }
+
   setResult("Scanning", "--%", "--%", "--%", "Running analysis...", "--", "--");
+  isScanning = true;
+  if (startScanBtn) {
+    startScanBtn.disabled = true;
+    startScanBtn.textContent = "Scanning...";
+  }
 
   try {
     const analysis = await runAnalysis(text);
+    if (!analysis) {
+      return;
+    }
     const overall = analysis.overall || {};
     const label = overall.prediction || "Unknown";
     const confidence = `${Number(overall.confidence || 0).toFixed(1)}%`;
@@ -701,6 +753,12 @@ form.addEventListener("submit", async (event) => {
       "--",
       "--"
     );
+  } finally {
+    isScanning = false;
+    if (startScanBtn && !isExtracting) {
+      startScanBtn.disabled = false;
+      startScanBtn.textContent = "Scan";
+    }
   }
 });
 
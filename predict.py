@@ -1,38 +1,269 @@
 import os
+import sys
+import glob
+import time
+import argparse
+import hashlib
 import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from src.utils.helpers import clean_text
+from src.utils.prediction_cache import PredictionCache
+from src.utils.bulk_io import (
+    RecordWriter,
+    iter_chunks,
+    iter_records,
+    load_checkpoint,
+    save_checkpoint,
+)
+from src.models.artifact_bundle import MANIFEST_NAME, load_bundle
+from src.models.artifact_record import read_record, record_matches, record_path
+from src.models.linear_scorer import LinearScorer
+from src.models.registry import default_registry
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
 
 # Model artifact locations
 MODEL_PATH = os.path.join("models", "logistic_model_full.pkl")
 VECTORIZER_PATH = os.path.join("models", "vectorizer_full.pkl")
+HASHED_VECTORIZER_PATH = os.path.join("models", "vectorizer_hashed.npz")
+SCORER_PATH = os.path.join("models", "linear_scorer.npz")
+BUNDLE_DIR = os.path.join("models", "bundle")
 
-_model = None
-_vectorizer = None
+MODEL_DIR = os.path.dirname(MODEL_PATH)
 
+# Prediction cache settings (PREDICT_CACHE_SIZE=0 disables the memory tier,
+# PREDICT_CACHE_DB enables the SQLite tier shared by worker processes)
+CACHE_SIZE = int(os.environ.get("PREDICT_CACHE_SIZE", "10000"))
+CACHE_TTL_SECONDS = float(os.environ.get("PREDICT_CACHE_TTL", "3600"))
+CACHE_DB_PATH = os.environ.get("PREDICT_CACHE_DB") or None
 
-def _load_artifacts():
+WARMUP_TEXT = (
+    "This is a short warm-up text. It runs the vectorizer and the model once "
+    "so the first real request does not pay for loading them."
+)
+
+# Registry key of the (model, vectorizer) pair served by this module
+REGISTRY_NAME = "production"
+
+# How long a load waits for a training run that is still writing models/
+ARTIFACT_READ_ATTEMPTS = 10
+ARTIFACT_RETRY_SECONDS = 0.2
+
+_fingerprint = None
+_cache = PredictionCache(CACHE_SIZE, CACHE_TTL_SECONDS, CACHE_DB_PATH)
+
+
+def _artifact_paths():
+    """
+    What versions the loaded model: the artifacts record that train.py (or
+    an export) replaces after writing a complete set, or, for artifacts
+    written before records existed, every model artifact; their names,
+    sizes and mtimes change whenever models/ is rewritten.
+    """
+    if os.path.exists(record_path(MODEL_DIR)):
+        return [record_path(MODEL_DIR)]
+    paths = []
+    for pattern in ("*.pkl", "*.npz", os.path.join("bundle", MANIFEST_NAME)):
+        paths.extend(sorted(glob.glob(os.path.join(MODEL_DIR, pattern))))
+    return paths
+
+
+def _artifact_bytes(_artifacts):
+    """
+    Registry memory estimate: the size of the recorded (or all) artifacts.
+    """
+    record = read_record(MODEL_DIR)
+    if record is not None:
+        return record["bytes"]
+    return sum(os.path.getsize(p) for p in _artifact_paths() if os.path.exists(p))
+
+
+def _scorer_is_current():
+    """
+    The exported scorer is only used if it was written after the model pickle
+    (or there is no pickle, e.g. after streaming training).
+    """
+    return os.path.exists(SCORER_PATH) and (
+        not os.path.exists(MODEL_PATH)
+        or os.path.getmtime(SCORER_PATH) >= os.path.getmtime(MODEL_PATH)
+    )
+
+
+def _bundle_is_current():
+    """
+    The memory-mapped bundle is used unless the model pickle is newer.
+    """
+    manifest = os.path.join(BUNDLE_DIR, MANIFEST_NAME)
+    return os.path.exists(manifest) and (
+        not os.path.exists(MODEL_PATH)
+        or os.path.getmtime(manifest) >= os.path.getmtime(MODEL_PATH)
+    )
+
+
+def _vectorizer_path():
     """
-    Lazy-load model artifacts to avoid import-time failures.
+    Pick the vectorizer the current model was trained with: the vocabulary
+    pickle or the hashed .npz, whichever train.py wrote last.
     """
-    global _model, _vectorizer
-    if _model is not None and _vectorizer is not None:
-        return _model, _vectorizer
+    candidates = [
+        p for p in (VECTORIZER_PATH, HASHED_VECTORIZER_PATH) if os.path.exists(p)
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
 
-    if not os.path.exists(MODEL_PATH):
+
+def _read_artifacts():
+    """
+    Load (model, vectorizer) from models/ as one consistent version: the
+    files must match the artifacts record before and after reading them,
+    otherwise a training run is still replacing them and the read is
+    retried for up to ARTIFACT_READ_ATTEMPTS * ARTIFACT_RETRY_SECONDS.
+    """
+    for attempt in range(ARTIFACT_READ_ATTEMPTS):
+        if attempt:
+            time.sleep(ARTIFACT_RETRY_SECONDS)
+        record = read_record(MODEL_DIR)
+        if record is None:
+            return _read_latest_artifacts()
+        if not record_matches(MODEL_DIR, record):
+            continue
+        try:
+            artifacts = _read_latest_artifacts()
+        except Exception:
+            if record_matches(MODEL_DIR, record):
+                raise
+            continue
+        if record_matches(MODEL_DIR, record):
+            return artifacts
+
+    raise RuntimeError(
+        f"Artifacts in {MODEL_DIR}/ do not match {record_path(MODEL_DIR)}: a training "
+        "run is still writing them, or they were replaced by hand (run train.py again)."
+    )
+
+
+def _read_latest_artifacts():
+    """
+    Load (model, vectorizer) from models/: the memory-mapped bundle, then
+    the compiled linear scorer, then the pickled model.
+    """
+    if _bundle_is_current():
+        return load_bundle(BUNDLE_DIR)
+
+    if not os.path.exists(MODEL_PATH) and not os.path.exists(SCORER_PATH):
         raise FileNotFoundError(
             f"Model file not found: {MODEL_PATH}. Train the model first."
         )
-    if not os.path.exists(VECTORIZER_PATH):
+    vectorizer_path = _vectorizer_path()
+    if vectorizer_path is None:
         raise FileNotFoundError(
             f"Vectorizer file not found: {VECTORIZER_PATH}. Train the model first."
         )
 
-    with open(MODEL_PATH, "rb") as f:
-        _model = pickle.load(f)
-    with open(VECTORIZER_PATH, "rb") as f:
-        _vectorizer = pickle.load(f)
+    if _scorer_is_current():
+        model = LinearScorer.load(SCORER_PATH)
+    else:
+        with open(MODEL_PATH, "rb") as f:
+            model = pickle.load(f)
+    if vectorizer_path == HASHED_VECTORIZER_PATH:
+        vectorizer = HashedTfidfVectorizer.load(vectorizer_path)
+    else:
+        with open(vectorizer_path, "rb") as f:
+            vectorizer = pickle.load(f)
+    return model, vectorizer
+
+
+def _load_versioned():
+    """
+    (model, vectorizer, fingerprint) from one registry snapshot, so the
+    fingerprint always names the version of the pair returned with it.
+    """
+    global _fingerprint
+    registry = default_registry()
+    if REGISTRY_NAME not in registry:
+        registry.register(REGISTRY_NAME, _read_artifacts, _artifact_paths, size=_artifact_bytes)
+    (model, vectorizer), fingerprint = registry.get_versioned(REGISTRY_NAME)
+    if fingerprint != _fingerprint:
+        # Artifacts changed on disk (or first load): cached predictions are stale
+        _cache.clear_memory()
+        _fingerprint = fingerprint
+    return model, vectorizer, fingerprint
+
+
+def _load_artifacts():
+    """
+    Lazy-load model artifacts to avoid import-time failures. Loading and
+    hot-swapping after retraining go through the shared model registry.
+    """
+    model, vectorizer, _ = _load_versioned()
+    return model, vectorizer
+
+
+def _cache_key(cleaned, fingerprint):
+    return hashlib.sha256(f"{fingerprint}\0{cleaned}".encode()).hexdigest()
+
+
+def _predict_probabilities(cleaned, stats=None):
+    """
+    Class probabilities for cleaned texts, served from the prediction cache
+    where possible. Only the misses are vectorized and scored, in one batch.
+    """
+    # Keys carry the version of this model, even if another thread swaps in
+    # a newer one while these texts are scored
+    model, vectorizer, fingerprint = _load_versioned()
+
+    keys = [_cache_key(c, fingerprint) for c in cleaned]
+    cached = _cache.get_many(list(dict.fromkeys(keys)))
 
-    return _model, _vectorizer
+    missing = {}
+    for key, text in zip(keys, cleaned):
+        if key not in cached:
+            missing.setdefault(key, text)
+
+    if missing:
+        features = vectorizer.transform(list(missing.values()))
+        scored = dict(zip(missing, model.predict_proba(features)))
+        _cache.put_many(scored)
+        cached.update(scored)
+
+    if stats is not None:
+        stats["fingerprint"] = fingerprint
+        stats["scored"] = stats.get("scored", 0) + len(missing)
+        stats["cache_hits"] = stats.get("cache_hits", 0) + sum(
+            1 for k in keys if k not in missing
+        )
+
+    return np.array([cached[k] for k in keys], dtype=float), model.classes_
+
+
+def model_version():
+    """
+    Fingerprint of the model currently served (loading it if needed).
+    """
+    return _load_versioned()[2]
+
+
+def cache_stats():
+    """
+    Hit/miss counters of the prediction cache.
+    """
+    stats = _cache.snapshot()
+    stats["fingerprint"] = _fingerprint
+    return stats
+
+
+def warmup():
+    """
+    Load the artifacts and score one sample outside the cache, so imports,
+    unpickling or memory-mapping and analyzer setup happen before serving.
+    Returns the seconds spent.
+    """
+    start = time.perf_counter()
+    model, vectorizer = _load_artifacts()
+    model.predict_proba(vectorizer.transform([clean_text(WARMUP_TEXT)]))
+    return time.perf_counter() - start
 
 
 def _append_warning(base, message):
@@ -49,61 +280,88 @@ LOW_CONFIDENCE_THRESHOLD = 60   # Below this = uncertain, needs review
 MIN_WORDS_FOR_ACCURACY = 50     # Minimum words for reliable prediction
 
 
-def predict_text(text):
+def predict_texts(texts, stats=None, cleaned=None):
     """
-    Predict if text is AI-generated or Human-written
-    Returns: prediction label, confidence score, and warning message
+    Predict a batch of texts with a single vectorizer and model call.
+    Returns a list of (label, confidence, probabilities, warning, word_count)
+    tuples in input order, the same shape predict_text returns.
+    If stats is a dict, it receives "scored" (texts run through the model)
+    and "cache_hits" (texts answered from the prediction cache).
+    cleaned = clean_text() of each text when the caller already has it.
     """
-    model, vectorizer = _load_artifacts()
+    texts = list(texts)
+    if not texts:
+        return []
+
+    # Clean the texts
+    if cleaned is None:
+        cleaned = [clean_text(t) for t in texts]
+    word_counts = np.array([len(c.split()) for c in cleaned], dtype=int)
+
+    # Vectorize and predict the uncached inputs as one sparse matrix
+    probabilities, classes = _predict_probabilities(cleaned, stats)
+
+    # The predicted class is the most probable one
+    best = probabilities.argmax(axis=1)
+    predictions = np.asarray(classes)[best]
 
-    # Clean the text
-    cleaned = clean_text(text)
-    word_count = len(cleaned.split())
-    
-    # Vectorize
-    features = vectorizer.transform([cleaned])
-    
-    # Predict
-    prediction = model.predict(features)[0]
-    probabilities = model.predict_proba(features)[0]
-    
     # Get confidence (probability of the predicted class)
-    confidence = probabilities[prediction] * 100
-    
-    # Determine label and warning
-    warning = None
-    
-    # Check for short text
-    if word_count < MIN_WORDS_FOR_ACCURACY:
-        warning = (
-            f"WARNING: Text is short ({word_count} words). "
-            "Results may be unreliable. For best accuracy, use 50+ words."
-        )
-    
-    # Check confidence level
-    if confidence < LOW_CONFIDENCE_THRESHOLD:
-        label = "UNCERTAIN"
-        warning = _append_warning(
-            warning, "Model confidence is too low. This text needs human review."
-        )
-    elif confidence < HIGH_CONFIDENCE_THRESHOLD:
-        label = "AI" if prediction == 1 else "Human"
-        warning = _append_warning(
-            warning, "Moderate confidence - consider reviewing manually."
+    confidences = probabilities[np.arange(len(texts)), best] * 100
+
+    # Determine labels and warning flags for every row at once
+    is_short = word_counts < MIN_WORDS_FOR_ACCURACY
+    is_low = confidences < LOW_CONFIDENCE_THRESHOLD
+    is_moderate = ~is_low & (confidences < HIGH_CONFIDENCE_THRESHOLD)
+    labels = np.where(
+        is_low, "UNCERTAIN", np.where(predictions == 1, "AI", "Human")
+    )
+
+    results = []
+    for i in range(len(texts)):
+        warning = None
+
+        # Check for short text
+        if is_short[i]:
+            warning = (
+                f"WARNING: Text is short ({word_counts[i]} words). "
+                "Results may be unreliable. For best accuracy, use 50+ words."
+            )
+
+        # Check confidence level
+        if is_low[i]:
+            warning = _append_warning(
+                warning, "Model confidence is too low. This text needs human review."
+            )
+        elif is_moderate[i]:
+            warning = _append_warning(
+                warning, "Moderate confidence - consider reviewing manually."
+            )
+
+        results.append(
+            (
+                str(labels[i]),
+                confidences[i],
+                probabilities[i],
+                warning,
+                int(word_counts[i]),
+            )
         )
-    else:
-        label = "AI" if prediction == 1 else "Human"
-    
-    return label, confidence, probabilities, warning, word_count
 
+    return results
 
-def get_detailed_prediction(text):
+
+def predict_text(text):
     """
-    Get a detailed prediction with all relevant information.
+    Predict if text is AI-generated or Human-written
+    Returns: prediction label, confidence score, and warning message
     """
-    label, confidence, probs, warning, word_count = predict_text(text)
-    
-    result = {
+    return predict_texts([text])[0]
+
+
+def _as_detailed(prediction):
+    label, confidence, probs, warning, word_count = prediction
+
+    return {
         'prediction': label,
         'confidence': confidence,
         'human_probability': probs[0] * 100,
@@ -112,8 +370,131 @@ def get_detailed_prediction(text):
         'warning': warning,
         'needs_review': confidence < HIGH_CONFIDENCE_THRESHOLD
     }
-    
-    return result
+
+
+def get_detailed_predictions(texts, stats=None, cleaned=None):
+    """
+    Get detailed predictions for several texts scored as one batch.
+    """
+    return [_as_detailed(p) for p in predict_texts(texts, stats, cleaned)]
+
+
+def get_detailed_prediction(text):
+    """
+    Get a detailed prediction with all relevant information.
+    """
+    return get_detailed_predictions([text])[0]
+
+
+# Columns written by score_file (plus the optional id field)
+BULK_FIELDS = [
+    "index",
+    "prediction",
+    "confidence",
+    "human_probability",
+    "ai_probability",
+    "word_count",
+    "needs_review",
+    "warning",
+]
+
+
+def _bulk_worker_init():
+    """
+    Load artifacts once per pool worker instead of once per chunk.
+    """
+    _load_artifacts()
+
+
+def _score_chunk(texts):
+    results = []
+    for detail in get_detailed_predictions(texts):
+        results.append({
+            "prediction": detail["prediction"],
+            "confidence": round(float(detail["confidence"]), 4),
+            "human_probability": round(float(detail["human_probability"]), 4),
+            "ai_probability": round(float(detail["ai_probability"]), 4),
+            "word_count": detail["word_count"],
+            "needs_review": bool(detail["needs_review"]),
+            "warning": detail["warning"],
+        })
+    return results
+
+
+def score_file(input_path, output_path, text_field="text", id_field=None,
+               chunk_size=1000, workers=None, resume=True):
+    """
+    Score a .jsonl/.csv corpus into a .jsonl/.csv output file.
+
+    Input is streamed in chunks of chunk_size records, chunks are fanned out
+    to a process pool (artifacts loaded once per worker) and results are
+    written in input order. At most 2 * workers chunks are in flight, so
+    memory stays bounded. A checkpoint next to the output lets an
+    interrupted run resume where it stopped.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    checkpoint_path = f"{output_path}.ckpt"
+    fields = BULK_FIELDS if id_field is None else ["index", id_field] + BULK_FIELDS[1:]
+
+    state = load_checkpoint(checkpoint_path) if resume else None
+    if state and state.get("input") == os.path.abspath(input_path) and os.path.exists(output_path):
+        done, offset = state["records_done"], state["output_bytes"]
+        print(f"Resuming after {done} records")
+    else:
+        done, offset = 0, None
+
+    writer = RecordWriter(output_path, fields, truncate_at=offset)
+    pool = ProcessPoolExecutor(workers, initializer=_bulk_worker_init) if workers > 0 else None
+    pending = deque()
+    scored = 0
+    start = time.perf_counter()
+
+    def drain_one():
+        nonlocal done, scored
+        chunk, future = pending.popleft()
+        results = future.result() if pool else future
+        rows = []
+        for i, (record, result) in enumerate(zip(chunk, results)):
+            row = {"index": done + i}
+            if id_field is not None:
+                row[id_field] = record.get(id_field)
+            row.update(result)
+            rows.append(row)
+        writer.write_many(rows)
+        done += len(chunk)
+        scored += len(chunk)
+        save_checkpoint(checkpoint_path, {
+            "input": os.path.abspath(input_path),
+            "records_done": done,
+            "output_bytes": writer.flush(),
+        })
+        rate = scored / max(time.perf_counter() - start, 1e-9)
+        print(f"  {done} records scored ({rate:.0f} docs/sec)", end="\r", flush=True)
+
+    try:
+        for chunk in iter_chunks(iter_records(input_path, skip=done), chunk_size):
+            texts = [str(record.get(text_field) or "") for record in chunk]
+            if pool:
+                pending.append((chunk, pool.submit(_score_chunk, texts)))
+            else:
+                pending.append((chunk, _score_chunk(texts)))
+            while len(pending) > max(workers, 1) * 2:
+                drain_one()
+        while pending:
+            drain_one()
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    # No checkpoint is written for empty input or a run that was already complete
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    rate = scored / max(elapsed, 1e-9)
+    print(f"\n[OK] {done} records written to {output_path} "
+          f"({scored} scored in {elapsed:.1f}s, {rate:.0f} docs/sec)")
+    return {"records": done, "scored": scored, "seconds": elapsed, "docs_per_sec": rate}
 
 
 def read_multiline_input():
@@ -133,8 +514,40 @@ def read_multiline_input():
     return "\n".join(lines).strip()
 
 
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Detect AI-generated text interactively or score a corpus."
+    )
+    parser.add_argument("--input", help="bulk mode: .jsonl or .csv file to score")
+    parser.add_argument("--output", help="bulk mode: .jsonl or .csv results file")
+    parser.add_argument("--text-field", default="text", help="record field holding the text")
+    parser.add_argument("--id-field", help="record field copied to the output")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="scoring processes (0 = score in this process)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+    if bool(args.input) != bool(args.output):
+        parser.error("--input and --output must be given together")
+    return args
+
+
 # Example usage
 if __name__ == "__main__":
+    args = _parse_args()
+    if args.input:
+        score_file(
+            args.input,
+            args.output,
+            text_field=args.text_field,
+            id_field=args.id_field,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            resume=not args.no_resume,
+        )
+        sys.exit(0)
+
     print("\n" + "="*60)
     print("  AI TEXT DETECTOR")
     print("  Detects if text was written by Human or AI")
@@ -0,0 +1,292 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+from src.models.linear_scorer import LinearScorer
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+
+# 1: arrays next to the manifest; 2: arrays in the version directory the
+# manifest names (both are read)
+BUNDLE_FORMAT_VERSION = 2
+READABLE_FORMAT_VERSIONS = (1, 2)
+MANIFEST_NAME = "manifest.json"
+
+# TfidfVectorizer parameters needed to rebuild the analyzer and weighting
+_ANALYZER_PARAMS = ("analyzer", "ngram_range", "lowercase", "token_pattern", "strip_accents")
+_WEIGHTING_PARAMS = ("binary", "sublinear_tf", "use_idf", "norm")
+
+
+class VocabBlock:
+    """
+    One TfidfVectorizer rebuilt from memory-mapped arrays.
+
+    The vocabulary is a sorted array of UTF-8 terms plus the column of each
+    term, so lookups are a vectorized binary search instead of a dict and
+    the pages can be shared by every process that maps the same file.
+    """
+
+    def __init__(self, params, terms, columns, idf):
+        self.params = params
+        self.terms = terms
+        self.columns = columns
+        self.idf = idf
+        self.n_features = len(idf)
+        analyzer_params = {k: params[k] for k in _ANALYZER_PARAMS}
+        analyzer_params["ngram_range"] = tuple(analyzer_params["ngram_range"])
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self._analyzer = TfidfVectorizer(**analyzer_params).build_analyzer()
+
+    def transform(self, texts):
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+
+        rows, terms = [], []
+        for i, text in enumerate(texts):
+            grams = self._analyzer(text)
+            terms.extend(g.encode("utf-8") for g in grams)
+            rows.extend([i] * len(grams))
+
+        n_rows = len(texts)
+        if terms:
+            query = np.array(terms)
+            pos = np.searchsorted(self.terms, query)
+            pos[pos == len(self.terms)] = 0
+            hit = self.terms[pos] == query
+            cols = self.columns[pos[hit]]
+            rows = np.asarray(rows)[hit]
+        else:
+            cols = rows = np.zeros(0, dtype=np.int64)
+
+        counts = sp.csr_matrix(
+            (np.ones(len(cols)), (rows, cols)),
+            shape=(n_rows, self.n_features),
+            dtype=np.float64,
+        )
+        counts.sum_duplicates()
+
+        if self.params["binary"]:
+            counts.data[:] = 1
+        if self.params["sublinear_tf"]:
+            np.log(counts.data, counts.data)
+            counts.data += 1
+        if self.params["use_idf"]:
+            counts.data *= self.idf[counts.indices]
+        if self.params["norm"]:
+            counts = normalize(counts, norm=self.params["norm"], copy=False)
+        return counts
+
+
+class BundleVectorizer:
+    """
+    Drop-in for the pickled FeatureUnion: hstack of its blocks.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def transform(self, texts):
+        import scipy.sparse as sp
+
+        texts = list(texts)
+        return sp.hstack([b.transform(texts) for b in self.blocks], format="csr")
+
+
+def _is_supported_tfidf(vectorizer):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    params = vectorizer.get_params()
+    return (
+        isinstance(vectorizer, TfidfVectorizer)
+        and params["preprocessor"] is None
+        and params["tokenizer"] is None
+        and params["stop_words"] is None
+        and isinstance(params["analyzer"], str)
+        and params["input"] == "content"
+    )
+
+
+def _write_vocab_block(bundle_dir, name, vectorizer):
+    if not _is_supported_tfidf(vectorizer):
+        raise ValueError(f"Unsupported vectorizer for bundle block '{name}'.")
+
+    params = vectorizer.get_params()
+    # Sort by UTF-8 bytes so numpy's bytewise searchsorted agrees with the order
+    items = sorted(
+        ((t.encode("utf-8"), c) for t, c in vectorizer.vocabulary_.items()),
+        key=lambda item: item[0],
+    )
+    np.save(os.path.join(bundle_dir, f"{name}_terms.npy"), np.array([t for t, _ in items]))
+    np.save(
+        os.path.join(bundle_dir, f"{name}_columns.npy"),
+        np.array([c for _, c in items], dtype=np.int64),
+    )
+    np.save(os.path.join(bundle_dir, f"{name}_idf.npy"), vectorizer.idf_)
+
+    block = {"name": name, "kind": "vocab"}
+    block.update({k: params[k] for k in _ANALYZER_PARAMS + _WEIGHTING_PARAMS})
+    return block
+
+
+def _remove_old_versions(bundle_dir, keep):
+    """
+    Delete version directories (and format 1 arrays) the manifest no longer
+    names. Processes that mapped their files keep them until they close.
+    """
+    with open(os.path.join(bundle_dir, MANIFEST_NAME)) as f:
+        current = json.load(f).get("data_dir")
+    for entry in os.scandir(bundle_dir):
+        if entry.is_dir():
+            if entry.name not in (current, keep):
+                shutil.rmtree(entry.path, ignore_errors=True)
+        elif entry.name.endswith(".npy"):
+            os.remove(entry.path)
+
+
+def export_bundle(model, vectorizer, bundle_dir):
+    """
+    Write model + vectorizer as a versioned bundle of .npy arrays.
+
+    model = CalibratedClassifierCV / LogisticRegression / LinearScorer
+    vectorizer = FeatureUnion of TfidfVectorizers or HashedTfidfVectorizer
+
+    Each export writes its arrays to a new directory inside bundle_dir and
+    then switches manifest.json to it with one atomic replace, so readers
+    always find a complete bundle and processes that already mapped the
+    old files keep working.
+    """
+    scorer = model if isinstance(model, LinearScorer) else LinearScorer.from_model(model)
+
+    version = f"v{time.time_ns()}-{os.getpid()}"
+    data_dir = os.path.join(bundle_dir, version)
+    os.makedirs(data_dir)
+
+    # Stored transposed so X @ coef_t needs no copy after mmap
+    np.save(os.path.join(data_dir, "coef_t.npy"), np.ascontiguousarray(scorer.coef.T))
+    np.save(os.path.join(data_dir, "intercept.npy"), scorer.intercept)
+    np.save(os.path.join(data_dir, "platt_a.npy"), scorer.platt_a)
+    np.save(os.path.join(data_dir, "platt_b.npy"), scorer.platt_b)
+    np.save(os.path.join(data_dir, "classes.npy"), scorer.classes_)
+
+    if isinstance(vectorizer, HashedTfidfVectorizer):
+        np.save(os.path.join(data_dir, "idf_word.npy"), vectorizer.idf_word)
+        np.save(os.path.join(data_dir, "idf_char.npy"), vectorizer.idf_char)
+        features = {"mode": "hashed", "n_features": int(vectorizer.n_features)}
+    else:
+        blocks = [
+            _write_vocab_block(data_dir, name, block)
+            for name, block in vectorizer.transformer_list
+        ]
+        features = {"mode": "vocab", "blocks": blocks}
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "data_dir": version,
+        "created_at": time.time(),
+        "n_folds": int(scorer.coef.shape[0]),
+        "n_features": int(scorer.coef.shape[1]),
+        "features": features,
+    }
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    _remove_old_versions(bundle_dir, keep=version)
+
+    return manifest
+
+
+def bundle_bytes(bundle_dir):
+    """
+    Size on disk of the manifest and the version it names.
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    with open(manifest_path) as f:
+        data_dir = os.path.join(bundle_dir, json.load(f).get("data_dir", ""))
+    arrays = [e for e in os.scandir(data_dir) if e.name.endswith(".npy")]
+    return os.path.getsize(manifest_path) + sum(e.stat().st_size for e in arrays)
+
+
+def _read_manifest(bundle_dir):
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Artifact bundle not found at: {bundle_dir}")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") not in READABLE_FORMAT_VERSIONS:
+        raise ValueError(
+            f"Unsupported bundle format version: {manifest.get('format_version')}"
+        )
+    return manifest
+
+
+def load_bundle(bundle_dir, mmap_mode="r"):
+    """
+    Load (scorer, vectorizer) from a bundle, memory-mapping the large arrays.
+    """
+    try:
+        return _load_version(bundle_dir, _read_manifest(bundle_dir), mmap_mode)
+    except FileNotFoundError:
+        # The version just read was replaced and removed by a newer export
+        return _load_version(bundle_dir, _read_manifest(bundle_dir), mmap_mode)
+
+
+def _load_version(bundle_dir, manifest, mmap_mode):
+    data_dir = os.path.join(bundle_dir, manifest.get("data_dir", ""))
+
+    def array(name, mmap=True):
+        return np.load(
+            os.path.join(data_dir, f"{name}.npy"),
+            mmap_mode=mmap_mode if mmap else None,
+        )
+
+    scorer = LinearScorer(
+        array("coef_t").T,
+        array("intercept", mmap=False),
+        array("platt_a", mmap=False),
+        array("platt_b", mmap=False),
+        array("classes", mmap=False),
+    )
+
+    features = manifest["features"]
+    if features["mode"] == "hashed":
+        vectorizer = HashedTfidfVectorizer(n_features=features["n_features"])
+        vectorizer.idf_word = array("idf_word")
+        vectorizer.idf_char = array("idf_char")
+    else:
+        vectorizer = BundleVectorizer([
+            VocabBlock(
+                block,
+                array(f"{block['name']}_terms"),
+                array(f"{block['name']}_columns"),
+                array(f"{block['name']}_idf"),
+            )
+            for block in features["blocks"]
+        ])
+
+    return scorer, vectorizer
+
+
+if __name__ == "__main__":
+    # Export from already trained artifacts:
+    #   python -m src.models.artifact_bundle
+    import predict
+    from src.models.artifact_record import write_record
+
+    if predict._bundle_is_current():
+        print(f"[OK] Artifact bundle at {predict.BUNDLE_DIR} is already up to date")
+        raise SystemExit(0)
+
+    # Straight from the files: the bundle may be the missing recorded part
+    model, vectorizer = predict._read_latest_artifacts()
+    manifest = export_bundle(model, vectorizer, predict.BUNDLE_DIR)
+    write_record(
+        predict.MODEL_DIR, [os.path.join(predict.BUNDLE_DIR, MANIFEST_NAME)], update=True
+    )
+    print(f"[OK] Artifact bundle saved to {predict.BUNDLE_DIR} "
+          f"({manifest['features']['mode']} features, "
+          f"{manifest['n_features']} columns)")
@@ -0,0 +1,74 @@
+import json
+import os
+import time
+import uuid
+
+RECORD_NAME = "artifacts.json"
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def record_path(model_dir):
+    return os.path.join(model_dir, RECORD_NAME)
+
+
+def read_record(model_dir):
+    """
+    The current artifacts record of model_dir, or None if there is none
+    (artifacts written before records existed).
+    """
+    try:
+        with open(record_path(model_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_record(model_dir, paths, update=False):
+    """
+    Record paths (written by one training run or export) as one version of
+    the artifacts in model_dir, with a single atomic replace of the record.
+    Written last, after every file in paths is complete.
+
+    update = keep the files of the current record and only restamp paths
+    (for exports that rewrite one artifact); without a record, nothing is
+    written then.
+    """
+    files = {}
+    if update:
+        previous = read_record(model_dir)
+        if previous is None:
+            return None
+        files.update(previous["files"])
+    for path in paths:
+        files[os.path.relpath(path, model_dir)] = _stamp(path)
+
+    record = {
+        "version": uuid.uuid4().hex,
+        "created_at": time.time(),
+        "files": files,
+        "bytes": sum(size for size, _ in files.values()),
+    }
+    path = record_path(model_dir)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, path)
+    return record
+
+
+def record_matches(model_dir, record):
+    """
+    True while every recorded file is exactly as the record describes, i.e.
+    no newer run has started rewriting the artifacts.
+    """
+    for name, stamp in record["files"].items():
+        try:
+            if _stamp(os.path.join(model_dir, name)) != stamp:
+                return False
+        except OSError:
+            return False
+    return True
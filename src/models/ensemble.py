@@ -1,47 +1,183 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from tensorflow.keras.models import load_model
+
+from src.models.registry import default_registry
+
+VOTING_MODES = ("soft", "hard")
+
+
+def _weights(n_models, weights):
+    if weights is None:
+        return np.ones(n_models)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (n_models,) or (weights < 0).any() or weights.sum() == 0:
+        raise ValueError(f"Need {n_models} non-negative weights with a positive sum, got {weights}")
+    return weights
+
+
+def soft_vote(probabilities, weights=None):
+    """
+    probabilities = (n_models, n_samples, n_classes) array or list of
+    (n_samples, n_classes) arrays
+    Returns the (weighted) mean probability per sample and class.
+    """
+    stacked = np.asarray(probabilities, dtype=np.float64)
+    w = _weights(stacked.shape[0], weights)
+    return np.tensordot(w / w.sum(), stacked, axes=1)
+
+
+def hard_vote(class_ids, n_classes=None, weights=None):
+    """
+    class_ids = (n_models, n_samples) integer array or list of label arrays
+    Returns (labels, vote shares): the label with the largest (weighted)
+    vote count per sample, ties going to the smaller label, and the
+    (n_samples, n_classes) vote shares. One bincount over all samples.
+    """
+    ids = np.asarray(class_ids, dtype=np.int64)
+    n_models, n_samples = ids.shape
+    if n_classes is None:
+        n_classes = int(ids.max()) + 1 if ids.size else 1
+    w = _weights(n_models, weights)
+
+    cells = ids + (np.arange(n_samples) * n_classes)[np.newaxis, :]
+    tallies = np.bincount(
+        cells.ravel(),
+        weights=np.repeat(w, n_samples),
+        minlength=n_samples * n_classes,
+    ).reshape(n_samples, n_classes)
+    return tallies.argmax(axis=1), tallies / w.sum()
 
 
 class EnsembleModel:
     """
     Loads multiple trained models and combines their predictions.
-    Uses simple averaging (soft voting).
+
+    voting="soft" averages the members' probabilities, voting="hard" counts
+    their predicted classes; weights scales each member's share. Members
+    run concurrently in a thread pool, or as one fused Keras graph (all
+    members applied to a shared input tensor, one predict call) with
+    fused=True.
+
+    Members are served by a ModelRegistry (src/models/registry.py): each one
+    is loaded on first use, may be unloaded under the registry's memory
+    budget, and is reloaded when its file changes. Every predict() works on
+    one snapshot of the members, so a swap never affects a running call.
+    With fused=True the fused graph is the registry entry instead (built
+    from freshly loaded members, sized as all their files), so unloading it
+    releases the members it holds.
     """
 
-    def __init__(self, model_paths):
+    def __init__(self, model_paths, weights=None, voting="soft", concurrent=True,
+                 fused=False, loader=None, registry=None):
         """
         model_paths: list of paths to trained model files (*.h5)
+        weights: one non-negative weight per model (default: equal)
+        loader: function(path) -> model with predict(); default keras load_model
+        registry: ModelRegistry holding the members (default: the shared one)
         """
-        self.models = []
+        if voting not in VOTING_MODES:
+            raise ValueError(f"Unknown voting mode: {voting}")
+        if loader is None:
+            from tensorflow.keras.models import load_model as loader
+
+        self.registry = registry or default_registry()
+        self.names = []
         for path in model_paths:
-            print(f"Loading model: {path}")
-            self.models.append(load_model(path))
+            name = f"ensemble:{os.path.abspath(path)}"
+            self.registry.register(name, lambda path=path: self._load_member(loader, path), [path])
+            self.names.append(name)
 
-        print(f"Total models loaded: {len(self.models)}")
+        self.fused_name = None
+        if fused:
+            paths = list(model_paths)
+            self.fused_name = "ensemble-fused:" + "|".join(os.path.abspath(p) for p in paths)
+            self.registry.register(
+                self.fused_name,
+                lambda: self._build_fused([self._load_member(loader, p) for p in paths]),
+                paths,
+            )
 
-    def predict(self, input_data):
+        print(f"Total models registered: {len(self.names)}")
+
+        self.weights = _weights(len(self.names), weights)
+        self.voting = voting
+        self.concurrent = concurrent and len(self.names) > 1
+        self.fused = fused
+        self._pool = None
+
+    @staticmethod
+    def _load_member(loader, path):
+        print(f"Loading model: {path}")
+        return loader(path)
+
+    def _snapshot(self):
         """
-        Takes input_data (already preprocessed)
-        and returns the averaged prediction of all models.
+        (members, versions) as currently served by the registry.
         """
-        predictions = []
+        current = [self.registry.get_versioned(name) for name in self.names]
+        return [model for model, _ in current], tuple(version for _, version in current)
 
-        # collect predictions from all models
-        for model in self.models:
-            pred = model.predict(input_data, verbose=0)
-            predictions.append(pred)
+    @property
+    def models(self):
+        return self._snapshot()[0]
 
-        # convert to numpy array
-        predictions = np.array(predictions)
+    @staticmethod
+    def _build_fused(models):
+        """
+        One multi-output Keras model: every member applied to the same input.
+        """
+        import tensorflow as tf
+
+        shapes = {tuple(m.input_shape[1:]) for m in models}
+        if len(shapes) != 1:
+            raise ValueError(f"Fused ensemble needs one input shape, got {sorted(shapes)}")
+        inputs = tf.keras.Input(shape=shapes.pop(), dtype=models[0].inputs[0].dtype)
+        outputs = [model(inputs, training=False) for model in models]
+        return tf.keras.Model(inputs, outputs, name="fused_ensemble")
 
-        # average over axis 0 (model axis)
-        avg_prediction = np.mean(predictions, axis=0)
+    def member_predictions(self, input_data):
+        """
+        List with each member's (n_samples, n_classes) output.
+        """
+        if self.fused:
+            # Rebuilt by the registry whenever a member file changes
+            outputs = self.registry.get(self.fused_name).predict(input_data, verbose=0)
+            return [np.asarray(o) for o in (outputs if isinstance(outputs, list) else [outputs])]
 
-        return avg_prediction
+        models, _ = self._snapshot()
+
+        if self.concurrent:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=len(models), thread_name_prefix="ensemble"
+                )
+            futures = [self._pool.submit(m.predict, input_data, verbose=0) for m in models]
+            return [np.asarray(f.result()) for f in futures]
+
+        return [np.asarray(m.predict(input_data, verbose=0)) for m in models]
+
+    def predict(self, input_data):
+        """
+        Takes input_data (already preprocessed) and returns the combined
+        prediction: mean probabilities (soft) or vote shares (hard).
+        """
+        predictions = self.member_predictions(input_data)
+        if self.voting == "soft":
+            return soft_vote(predictions, self.weights)
+
+        n_classes = predictions[0].shape[1]
+        class_ids = np.stack([p.argmax(axis=1) for p in predictions])
+        return hard_vote(class_ids, n_classes, self.weights)[1]
 
     def predict_class(self, input_data):
         """
-        Returns the final class label after ensemble averaging.
+        Returns the final class label after ensemble voting.
         """
-        avg_pred = self.predict(input_data)
-        return np.argmax(avg_pred, axis=1)
+        return np.argmax(self.predict(input_data), axis=1)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
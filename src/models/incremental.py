@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+def block_sizes(vectorizer):
+    """
+    Column widths of the [word | char] blocks of a fitted vectorizer.
+    """
+    if hasattr(vectorizer, "transformer_list"):
+        return [len(t.vocabulary_) for _, t in vectorizer.transformer_list]
+    return [vectorizer.n_features, vectorizer.n_features]
+
+
+def get_idf(vectorizer):
+    if hasattr(vectorizer, "transformer_list"):
+        return np.concatenate([t.idf_ for _, t in vectorizer.transformer_list])
+    return np.concatenate([vectorizer.idf_word, vectorizer.idf_char])
+
+
+def set_idf(vectorizer, idf):
+    """
+    Replace the IDF of each block; vocabularies / hash buckets are unchanged.
+    """
+    bounds = np.cumsum([0] + block_sizes(vectorizer))
+    parts = [idf[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    if hasattr(vectorizer, "transformer_list"):
+        for (_, transformer), part in zip(vectorizer.transformer_list, parts):
+            transformer.idf_ = part
+    else:
+        vectorizer.idf_word, vectorizer.idf_char = parts
+
+
+def smooth_idf(df, n_docs):
+    # Same formula as TfidfVectorizer(smooth_idf=True)
+    return np.log((1 + n_docs) / (1 + df)) + 1
+
+
+def reweight(X, scale, sizes):
+    """
+    Multiply every column of a TF-IDF matrix by scale and re-apply the L2
+    norm of each block per row. Since idf enters a row only as a column
+    factor before normalization, this turns features built with one IDF
+    into features built with another without re-tokenizing the texts.
+    """
+    X = X.tocsr(copy=True)
+    X.data *= scale[X.indices]
+    bounds = np.cumsum(sizes)[:-1]
+    n_blocks = len(sizes)
+    rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+    cell = rows * n_blocks + np.searchsorted(bounds, X.indices, side="right")
+    norms = np.sqrt(np.bincount(cell, weights=X.data ** 2, minlength=X.shape[0] * n_blocks))
+    X.data /= norms[cell]
+    return X
+
+
+def file_prefix_sha256(path, size):
+    """
+    sha256 of the first size bytes of a file.
+    """
+    digest = hashlib.sha256()
+    remaining = size
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(8 * 1024 * 1024, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+class IncrementalState:
+    """
+    What a retrain on appended rows needs from the previous run: document
+    frequencies and document count behind the current IDF, how many dataset
+    rows (and CSV bytes) were trained on, and the feature cache entry that
+    holds their features.
+    """
+
+    def __init__(self, df, n_docs, rows, data_bytes, data_sha256, features_key, config):
+        self.df = np.asarray(df, dtype=np.int64)
+        self.n_docs = int(n_docs)
+        self.rows = int(rows)
+        self.data_bytes = int(data_bytes)
+        self.data_sha256 = data_sha256
+        self.features_key = features_key
+        self.config = dict(config)
+
+    @classmethod
+    def from_features(cls, X, data_path, data_sha256, features_key, config):
+        """
+        State after fitting a vectorizer on all rows of X: a tf-idf value is
+        non-zero exactly when the term occurs, so document frequencies are
+        the per-column counts of stored entries.
+        """
+        df = np.bincount(X.tocsr().indices, minlength=X.shape[1])
+        return cls(df, X.shape[0], X.shape[0], os.path.getsize(data_path),
+                   data_sha256, features_key, config)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}.npz"
+        np.savez(
+            tmp,
+            df=self.df,
+            n_docs=np.int64(self.n_docs),
+            rows=np.int64(self.rows),
+            data_bytes=np.int64(self.data_bytes),
+            data_sha256=np.str_(self.data_sha256),
+            features_key=np.str_(self.features_key or ""),
+            config=np.str_(json.dumps(self.config, sort_keys=True)),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Incremental state not found at: {path}. Run a full train.py first."
+            )
+        with np.load(path) as data:
+            return cls(
+                data["df"],
+                data["n_docs"],
+                data["rows"],
+                data["data_bytes"],
+                str(data["data_sha256"]),
+                str(data["features_key"]) or None,
+                json.loads(str(data["config"])),
+            )
+
+    def appended_bytes(self, data_path):
+        """
+        Number of dataset bytes appended since the state was written.
+        Raises ValueError if the previously trained bytes were modified.
+        """
+        size = os.path.getsize(data_path)
+        if size < self.data_bytes or file_prefix_sha256(data_path, self.data_bytes) != self.data_sha256:
+            raise ValueError(
+                f"{data_path} was modified, not only appended to, since the last "
+                "training run; run a full retrain."
+            )
+        return size - self.data_bytes
+
+    def update_idf(self, vectorizer, X_new_old_idf):
+        """
+        Add the new rows' document frequencies (from their features under the
+        current IDF) and set the refreshed IDF on vectorizer.
+        Returns (old idf, new idf).
+        """
+        old_idf = get_idf(vectorizer)
+        self.df += np.bincount(X_new_old_idf.tocsr().indices, minlength=len(self.df))
+        self.n_docs += X_new_old_idf.shape[0]
+        new_idf = smooth_idf(self.df, self.n_docs)
+        set_idf(vectorizer, new_idf)
+        return old_idf, new_idf
+
+
+def averaged_coefficients(scorer):
+    """
+    (coef, intercept) averaged over the calibration folds of a LinearScorer.
+    """
+    return scorer.coef.mean(axis=0), float(np.mean(scorer.intercept))
+
+
+def warm_start_classifier(scorer, X, y, C=1.0, max_iter=2000, class_weight="balanced"):
+    """
+    LogisticRegression fitted on (X, y) starting from the previous model's
+    averaged fold coefficients instead of zeros.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    coef, intercept = averaged_coefficients(scorer)
+    if coef.shape[0] != X.shape[1]:
+        raise ValueError(
+            f"Previous model has {coef.shape[0]} features, the vectorizer {X.shape[1]}; "
+            "run a full retrain."
+        )
+    model = LogisticRegression(
+        C=C, max_iter=max_iter, random_state=42, class_weight=class_weight, warm_start=True
+    )
+    model.coef_ = coef[np.newaxis, :].copy()
+    model.intercept_ = np.array([intercept])
+    model.classes_ = np.asarray(scorer.classes_)
+    return model.fit(X, y)
+
+
+def calibrate(model, X, y):
+    """
+    Sigmoid calibration of an already fitted classifier on a held-out slice.
+    Returns a CalibratedClassifierCV with a single calibrated classifier.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+
+    try:
+        from sklearn.frozen import FrozenEstimator
+    except ImportError:
+        # scikit-learn < 1.6
+        return CalibratedClassifierCV(model, method="sigmoid", cv="prefit").fit(X, y)
+    return CalibratedClassifierCV(FrozenEstimator(model), method="sigmoid").fit(X, y)
@@ -0,0 +1,153 @@
+import os
+import pickle
+import numpy as np
+
+
+class LinearScorer:
+    """
+    Compact replacement for the pickled CalibratedClassifierCV(LogisticRegression).
+
+    The calibrated folds are folded into one stacked coefficient matrix plus
+    their intercepts and Platt parameters, so scoring is a single sparse
+    mat-vec followed by a vectorized sigmoid-average.
+    """
+
+    def __init__(self, coef, intercept, platt_a, platt_b, classes):
+        """
+        coef = (n_folds, n_features) stacked LR coefficients
+        intercept, platt_a, platt_b = (n_folds,) per-fold parameters
+        classes = class labels in predict_proba column order
+        """
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.platt_a = np.asarray(platt_a, dtype=np.float64)
+        self.platt_b = np.asarray(platt_b, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+
+        # (n_features, n_folds) so X @ coef_t is one sparse x dense product
+        self._coef_t = np.ascontiguousarray(self.coef.T)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Build a scorer from a fitted binary CalibratedClassifierCV with
+        sigmoid calibration, or from a plain fitted LogisticRegression.
+        """
+        if len(model.classes_) != 2:
+            raise ValueError("LinearScorer only supports binary classifiers.")
+
+        if not hasattr(model, "calibrated_classifiers_"):
+            # Uncalibrated LR: sigmoid(z) == expit(-(-1 * z + 0))
+            return cls(
+                model.coef_, model.intercept_, [-1.0], [0.0], model.classes_
+            )
+
+        coefs, intercepts, platt_a, platt_b = [], [], [], []
+        for calibrated in model.calibrated_classifiers_:
+            if calibrated.method != "sigmoid":
+                raise ValueError(
+                    f"Unsupported calibration method: {calibrated.method}"
+                )
+            estimator = calibrated.estimator
+            calibrator = calibrated.calibrators[0]
+            coefs.append(estimator.coef_[0])
+            intercepts.append(estimator.intercept_[0])
+            platt_a.append(calibrator.a_)
+            platt_b.append(calibrator.b_)
+
+        return cls(coefs, intercepts, platt_a, platt_b, model.classes_)
+
+    def decision_function(self, X):
+        """
+        Raw LR scores, one column per calibrated fold.
+        """
+        return X @ self._coef_t + self.intercept
+
+    def predict_proba(self, X):
+        """
+        Same probabilities as CalibratedClassifierCV.predict_proba.
+        """
+        scores = self.decision_function(X)
+        from scipy.special import expit
+
+        positive = expit(-(self.platt_a * scores + self.platt_b)).mean(axis=1)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def save(self, path):
+        """
+        Save scorer parameters to an .npz file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            coef=self.coef,
+            intercept=self.intercept,
+            platt_a=self.platt_a,
+            platt_b=self.platt_b,
+            classes=self.classes_,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load scorer parameters from an .npz file.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Linear scorer not found at: {path}")
+
+        with np.load(path) as data:
+            return cls(
+                data["coef"],
+                data["intercept"],
+                data["platt_a"],
+                data["platt_b"],
+                data["classes"],
+            )
+
+
+def max_abs_difference(scorer, model, X):
+    """
+    Largest absolute probability difference between scorer and model on X.
+    """
+    return float(np.abs(scorer.predict_proba(X) - model.predict_proba(X)).max())
+
+
+def export_linear_scorer(model, path, X=None, tolerance=1e-9):
+    """
+    Fold a fitted model into a LinearScorer and save it to path.
+    When X is given, the export is checked against the model for parity.
+    """
+    scorer = LinearScorer.from_model(model)
+
+    if X is not None and X.shape[0] > 0:
+        diff = max_abs_difference(scorer, model, X)
+        if diff > tolerance:
+            raise ValueError(
+                f"Linear scorer does not match the model (max diff {diff:.3g})."
+            )
+
+    scorer.save(path)
+    return scorer
+
+
+if __name__ == "__main__":
+    # Export from an already trained model:
+    #   python -m src.models.linear_scorer
+    from predict import MODEL_PATH, SCORER_PATH
+    from src.models.artifact_record import write_record
+
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError(
+            f"Model file not found: {MODEL_PATH}. Train the model first."
+        )
+
+    with open(MODEL_PATH, "rb") as f:
+        model = pickle.load(f)
+
+    scorer = export_linear_scorer(model, SCORER_PATH)
+    write_record(os.path.dirname(SCORER_PATH), [SCORER_PATH], update=True)
+    print(f"[OK] Linear scorer saved to {SCORER_PATH} "
+          f"({scorer.coef.shape[0]} folds x {scorer.coef.shape[1]} features)")
@@ -1,7 +1,3 @@
-import tensorflow as tf
-from tensorflow.keras import layers, models
-
-
 def build_lstm_model(vocab_size, embedding_dim, max_length, num_classes):
     """
     LSTM-based classifier for AI vs Human text detection.
@@ -12,6 +8,7 @@ def build_lstm_model(vocab_size, embedding_dim, max_length, num_classes):
     - max_length: maximum sequence length (padding)
     - num_classes: number of output classes
     """
+    from tensorflow.keras import layers, models, optimizers
 
     model = models.Sequential([
         layers.Embedding(
@@ -33,7 +30,7 @@ def build_lstm_model(vocab_size, embedding_dim, max_length, num_classes):
     ])
 
     model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+        optimizer=optimizers.Adam(learning_rate=1e-3),
         loss="categorical_crossentropy",
         metrics=["accuracy"]
     )
@@ -1,7 +1,3 @@
-import tensorflow as tf
-from tensorflow.keras import layers, models
-
-
 def build_neural_net(vocab_size, embedding_dim, max_length, num_classes):
     """
     A simple but effective feed-forward neural network with embeddings.
@@ -12,6 +8,7 @@ def build_neural_net(vocab_size, embedding_dim, max_length, num_classes):
     - max_length: maximum sequence length (padding)
     - num_classes: number of output classes
     """
+    from tensorflow.keras import layers, models, optimizers
 
     model = models.Sequential([
         layers.Embedding(
@@ -34,7 +31,7 @@ def build_neural_net(vocab_size, embedding_dim, max_length, num_classes):
     ])
 
     model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+        optimizer=optimizers.Adam(learning_rate=1e-3),
         loss="categorical_crossentropy",
         metrics=["accuracy"]
     )
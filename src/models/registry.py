@@ -0,0 +1,207 @@
+import hashlib
+import os
+import threading
+import time
+
+# MODEL_REGISTRY_BUDGET_MB caps resident models (unset or 0 = no cap);
+# MODEL_REGISTRY_CHECK_SECONDS throttles the on-disk change check: between
+# checks get() serves the loaded version without touching the filesystem
+# (0 = check on every get)
+REGISTRY_BUDGET_MB = float(os.environ.get("MODEL_REGISTRY_BUDGET_MB", "0"))
+REGISTRY_CHECK_SECONDS = float(os.environ.get("MODEL_REGISTRY_CHECK_SECONDS", "1"))
+
+
+def files_version(paths):
+    """
+    Hash of name, size and mtime of each path (missing files included).
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{path}:missing;".encode())
+    return digest.hexdigest()
+
+
+class _Entry:
+    def __init__(self, name, loader, paths, size):
+        self.name = name
+        self.loader = loader
+        self.paths = paths
+        self.size = size
+        # (model, version), replaced as a whole so readers never see a mix
+        self.current = None
+        self.failed_version = None
+        self.nbytes = 0
+        self.last_used = 0.0
+        self.checked = 0.0
+        self.load_lock = threading.Lock()
+
+    def current_paths(self):
+        return list(self.paths() if callable(self.paths) else self.paths)
+
+
+class ModelRegistry:
+    """
+    Lazily loaded models behind one loading and caching policy.
+
+    A model is registered with a loader and the files it is built from and
+    loaded on its first get(). When those files change on disk, the next
+    get() loads the new version and swaps it in with a single reference
+    assignment: callers already holding the old object keep using it, and
+    while one thread reloads, others are served the previous version. If a
+    reload fails (e.g. a file is still being written), the previous version
+    stays in service until the files change again.
+
+    Resident models are capped by memory_budget_mb (estimated by size(),
+    default the files' size on disk); least recently used models are
+    unloaded first and reloaded on their next get().
+    """
+
+    def __init__(self, memory_budget_mb=REGISTRY_BUDGET_MB, check_interval=REGISTRY_CHECK_SECONDS,
+                 log=print):
+        self.max_bytes = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        self.check_interval = check_interval
+        self.log = log
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, paths, size=None):
+        """
+        name = registry key
+        loader = function() -> model
+        paths = files the model is loaded from, or a function returning them
+        size = function(model) -> bytes for the memory budget (default: the
+               files' size on disk)
+        Registering an existing name keeps the existing entry.
+        """
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(name, loader, paths, size)
+        return name
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def _entry(self, name):
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Model not registered: {name}") from None
+
+    def get(self, name):
+        """
+        The current version of a model, loading it if needed.
+        """
+        return self.get_versioned(name)[0]
+
+    def get_versioned(self, name):
+        """
+        (model, version) where version changes whenever the model's files do.
+        """
+        entry = self._entry(name)
+        now = time.monotonic()
+        current = entry.current
+        if current is not None and now - entry.checked < self.check_interval:
+            entry.last_used = now
+            return current
+
+        on_disk = files_version(entry.current_paths())
+        entry.checked = now
+        if current is not None and on_disk in (current[1], entry.failed_version):
+            entry.last_used = now
+            return current
+
+        # Loading or reloading: while another thread reloads, serve the old version
+        if not entry.load_lock.acquire(blocking=current is None):
+            return current
+        try:
+            current = entry.current
+            if current is not None and current[1] == on_disk:
+                entry.last_used = now
+                return current
+            return self._load(entry, on_disk)
+        finally:
+            entry.load_lock.release()
+
+    def _load(self, entry, version):
+        paths = entry.current_paths()
+        try:
+            value = entry.loader()
+        except Exception as exc:
+            if entry.current is None:
+                raise
+            # Not retried until the files change again
+            entry.failed_version = version
+            self.log(f"[WARN] Reloading {entry.name} failed ({exc}); keeping the loaded version")
+            return entry.current
+
+        try:
+            nbytes = entry.size(value) if entry.size else sum(
+                os.path.getsize(p) for p in paths if os.path.exists(p)
+            )
+        except OSError:
+            nbytes = 0
+        current = (value, version)
+        with self._lock:
+            # The version is the one seen before loading: files rewritten
+            # meanwhile differ from it and are picked up by the next get()
+            entry.current = current
+            entry.failed_version = None
+            entry.nbytes = int(nbytes)
+            entry.last_used = time.monotonic()
+            self._evict(keep=entry.name)
+        return current
+
+    def _evict(self, keep=None):
+        if self.max_bytes is None:
+            return []
+        loaded = sorted(
+            (e for e in self._entries.values() if e.current is not None),
+            key=lambda e: e.last_used,
+        )
+        total = sum(e.nbytes for e in loaded)
+        evicted = []
+        for entry in loaded:
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            entry.current = None
+            total -= entry.nbytes
+            evicted.append(entry.name)
+        return evicted
+
+    def unload(self, name):
+        """
+        Drop a model from memory; it is loaded again on the next get().
+        """
+        entry = self._entry(name)
+        with self._lock:
+            entry.current = None
+
+    def resident(self):
+        """
+        {name: estimated bytes} of the loaded models, most recently used first.
+        """
+        with self._lock:
+            loaded = [e for e in self._entries.values() if e.current is not None]
+        loaded.sort(key=lambda e: e.last_used, reverse=True)
+        return {e.name: e.nbytes for e in loaded}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """
+    Process-wide registry shared by predict.py and EnsembleModel.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ModelRegistry()
+        return _default
@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+
+from src.models.linear_scorer import LinearScorer
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+from src.utils.dataset import iter_dataset
+from src.utils.helpers import clean_text
+
+TRAIN, CALIBRATION, TEST = 0, 1, 2
+
+
+def split_codes(chunk_index, n_rows, test_size=0.2, calibration_size=0.1, seed=42):
+    """
+    TRAIN / CALIBRATION / TEST code per row of one chunk. Seeded by the chunk
+    index, so every epoch sees the same split without storing it.
+    """
+    u = np.random.default_rng([seed, chunk_index]).random(n_rows)
+    codes = np.full(n_rows, TRAIN, dtype=np.int8)
+    codes[u < test_size + calibration_size] = CALIBRATION
+    codes[u < test_size] = TEST
+    return codes
+
+
+class StreamingTrainer:
+    """
+    Out-of-core training: chunks of the dataset are cleaned and hashed on the
+    fly (HashedTfidfVectorizer), an SGD logistic regression is fitted with
+    partial_fit over several epochs, and Platt scaling is fitted on a
+    held-out calibration stream. Only one chunk of features is in memory.
+    """
+
+    def __init__(self, dataset_path, hash_buckets=2 ** 17, chunk_size=20000,
+                 epochs=5, alpha=1e-5, test_size=0.2, calibration_size=0.1,
+                 seed=42, use_cache=True):
+        self.dataset_path = dataset_path
+        self.hash_buckets = hash_buckets
+        self.chunk_size = chunk_size
+        self.epochs = epochs
+        self.alpha = alpha
+        self.test_size = test_size
+        self.calibration_size = calibration_size
+        self.seed = seed
+        self.use_cache = use_cache
+        self.vectorizer = HashedTfidfVectorizer(n_features=hash_buckets)
+        self.classifier = None
+        self.scorer = None
+
+    def _chunks(self, part):
+        """
+        (cleaned texts, labels) of one split, chunk by chunk.
+        """
+        stream = iter_dataset(self.dataset_path, self.chunk_size, use_cache=self.use_cache)
+        for i, (texts, labels) in enumerate(stream):
+            codes = split_codes(i, len(texts), self.test_size, self.calibration_size, self.seed)
+            rows = np.flatnonzero(codes == part)
+            if len(rows):
+                yield [clean_text(texts[r]) for r in rows], np.asarray(labels)[rows]
+
+    def fit_idf(self):
+        """
+        Pass 0: document frequencies and class counts of the training stream.
+        """
+        counts = {}
+        for texts, labels in self._chunks(TRAIN):
+            self.vectorizer.partial_fit(texts)
+            for label, n in zip(*np.unique(labels, return_counts=True)):
+                counts[int(label)] = counts.get(int(label), 0) + int(n)
+        return counts
+
+    def fit(self, log=print):
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+        start = time.perf_counter()
+        class_counts = self.fit_idf()
+        classes = np.array(sorted(class_counts))
+        if len(classes) != 2:
+            raise ValueError(f"Streaming training needs two classes, found {classes.tolist()}")
+        n_train = sum(class_counts.values())
+        # class_weight="balanced" is not available with partial_fit
+        weights = {int(c): n_train / (2 * class_counts[c]) for c in classes}
+        log(f"[OK] IDF pass: {n_train} training rows ({time.perf_counter() - start:.1f}s)")
+
+        self.classifier = SGDClassifier(
+            loss="log_loss",
+            alpha=self.alpha,
+            class_weight=weights,
+            average=True,
+            random_state=self.seed,
+        )
+        for epoch in range(self.epochs):
+            epoch_start = time.perf_counter()
+            rng = np.random.default_rng([self.seed, epoch])
+            for texts, labels in self._chunks(TRAIN):
+                order = rng.permutation(len(texts))
+                X = self.vectorizer.transform([texts[i] for i in order])
+                self.classifier.partial_fit(X, labels[order], classes=classes)
+            log(f"[OK] Epoch {epoch + 1}/{self.epochs} ({time.perf_counter() - epoch_start:.1f}s)")
+
+        # Platt scaling on scores of the held-out calibration stream
+        scores, labels = self._decision_stream(CALIBRATION)
+        # (a one-feature, effectively unregularized logistic regression; the
+        # scorer uses P = expit(-(a * score + b)), so a and b change sign)
+        calibrator = LogisticRegression(C=1e12).fit(scores.reshape(-1, 1), labels == classes[1])
+        self.scorer = LinearScorer(
+            self.classifier.coef_,
+            self.classifier.intercept_,
+            [-calibrator.coef_[0, 0]],
+            [-calibrator.intercept_[0]],
+            classes,
+        )
+        log(f"[OK] Calibrated on {len(labels)} held-out rows")
+        return self
+
+    def _decision_stream(self, part):
+        scores, labels = [], []
+        for texts, chunk_labels in self._chunks(part):
+            scores.append(self.classifier.decision_function(self.vectorizer.transform(texts)))
+            labels.append(chunk_labels)
+        if not scores:
+            raise ValueError("Held-out stream is empty; use a larger dataset or split.")
+        return np.concatenate(scores), np.concatenate(labels)
+
+    def evaluate(self, scorer=None, vectorizer=None):
+        """
+        (y_true, y_pred) on the test stream for the trained scorer, or for
+        any model/vectorizer pair with predict().
+        """
+        scorer = scorer or self.scorer
+        vectorizer = vectorizer or self.vectorizer
+        y_true, y_pred = [], []
+        for texts, labels in self._chunks(TEST):
+            y_pred.append(scorer.predict(vectorizer.transform(texts)))
+            y_true.append(labels)
+        return np.concatenate(y_true), np.concatenate(y_pred)
+
+    def training_rows(self):
+        """
+        All cleaned training rows in memory, for the in-memory comparison.
+        """
+        texts, labels = [], []
+        for chunk_texts, chunk_labels in self._chunks(TRAIN):
+            texts.extend(chunk_texts)
+            labels.append(chunk_labels)
+        return texts, np.concatenate(labels)
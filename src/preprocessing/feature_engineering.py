@@ -1,6 +1,9 @@
 import numpy as np
+from scipy.sparse import csr_matrix, hstack
 from src.utils.helpers import clean_text, sentence_split
 from src.preprocessing.ngram_extractor import NgramExtractor
+from src.preprocessing.parallel_featurize import parallel_transform
+from src.preprocessing.style_features import basic_features_batch
 
 
 class FeatureEngineer:
@@ -70,5 +73,20 @@ class FeatureEngineer:
 
         return np.array(base + ngram, dtype=float)
 
-    def transform_batch(self, texts):
-        return np.array([self.transform(t) for t in texts])
+    def transform_batch(self, texts, n_jobs=1, chunk_size=2000):
+        """
+        Sparse CSR matrix of [linguistic features | n-gram counts] per text,
+        with the same columns as transform() but never densified.
+
+        n_jobs > 1 (or -1 for all cores) splits texts into chunks of
+        chunk_size across worker processes; the result is the same.
+        """
+        if not self.fitted:
+            raise ValueError("FeatureEngineer must be fitted first!")
+
+        texts = list(texts)
+        if n_jobs != 1:
+            return parallel_transform(self, texts, n_jobs=n_jobs, chunk_size=chunk_size)
+        base = basic_features_batch(texts)
+        ngram = self.ngram_extractor.transform_batch(texts)
+        return hstack([csr_matrix(base), ngram], format="csr")
@@ -0,0 +1,133 @@
+import os
+import numpy as np
+
+
+# Same analyzers as the vocabulary-backed FeatureUnion in train.py
+WORD_NGRAM_RANGE = (1, 3)
+CHAR_NGRAM_RANGE = (3, 5)
+
+
+class HashedTfidfVectorizer:
+    """
+    Stateless TF-IDF features: word 1-3 and char_wb 3-5 n-grams are hashed
+    into a fixed number of buckets, so the only fitted state is one IDF
+    vector per block instead of large vocabulary dicts.
+    """
+
+    def __init__(self, n_features=2 ** 17):
+        """
+        n_features = number of hash buckets per block (word and char)
+        """
+        self.n_features = n_features
+        self.idf_word = None
+        self.idf_char = None
+        self._build_hashers()
+
+    def _build_hashers(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        common = dict(
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float64,
+        )
+        self.word_hasher = HashingVectorizer(
+            analyzer="word", ngram_range=WORD_NGRAM_RANGE, **common
+        )
+        self.char_hasher = HashingVectorizer(
+            analyzer="char_wb", ngram_range=CHAR_NGRAM_RANGE, **common
+        )
+
+    @staticmethod
+    def _smooth_idf(counts, n_docs):
+        # Same formula as TfidfVectorizer(smooth_idf=True)
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        return np.log((1 + n_docs) / (1 + df)) + 1
+
+    def fit(self, texts):
+        """
+        Compute the IDF vector of each block on the training corpus.
+        """
+        self.fit_transform(texts)
+        return self
+
+    def partial_fit(self, texts):
+        """
+        Add a batch of training texts to the document frequencies and refresh
+        the IDF, so the vectorizer can be fitted on a stream of chunks.
+        """
+        texts = list(texts)
+        if getattr(self, "_n_docs", None) is None:
+            self._n_docs = 0
+            self._df_word = np.zeros(self.n_features, dtype=np.int64)
+            self._df_char = np.zeros(self.n_features, dtype=np.int64)
+
+        self._n_docs += len(texts)
+        self._df_word += np.bincount(
+            self.word_hasher.transform(texts).indices, minlength=self.n_features
+        )
+        self._df_char += np.bincount(
+            self.char_hasher.transform(texts).indices, minlength=self.n_features
+        )
+        self.idf_word = np.log((1 + self._n_docs) / (1 + self._df_word)) + 1
+        self.idf_char = np.log((1 + self._n_docs) / (1 + self._df_char)) + 1
+        return self
+
+    def fit_transform(self, texts):
+        texts = list(texts)
+        word_counts = self.word_hasher.transform(texts)
+        char_counts = self.char_hasher.transform(texts)
+        self.idf_word = self._smooth_idf(word_counts, len(texts))
+        self.idf_char = self._smooth_idf(char_counts, len(texts))
+        return self._weight(word_counts, char_counts)
+
+    def _weight(self, word_counts, char_counts):
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+
+        blocks = []
+        for counts, idf in ((word_counts, self.idf_word), (char_counts, self.idf_char)):
+            counts = counts.tocsr()
+            counts.data *= idf[counts.indices]
+            blocks.append(normalize(counts, norm="l2", copy=False))
+        return sp.hstack(blocks, format="csr")
+
+    def transform(self, texts):
+        """
+        Convert texts into the same layout FeatureUnion produces:
+        [word tf-idf block | char tf-idf block], each L2-normalized.
+        """
+        if self.idf_word is None or self.idf_char is None:
+            raise ValueError("HashedTfidfVectorizer must be fitted before calling transform().")
+
+        texts = list(texts)
+        return self._weight(
+            self.word_hasher.transform(texts), self.char_hasher.transform(texts)
+        )
+
+    def save(self, path):
+        """
+        Save bucket count and IDF vectors to an .npz file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            n_features=np.int64(self.n_features),
+            idf_word=self.idf_word,
+            idf_char=self.idf_char,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a fitted hashed vectorizer from an .npz file.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Hashed vectorizer not found at: {path}")
+
+        with np.load(path) as data:
+            vectorizer = cls(n_features=int(data["n_features"]))
+            vectorizer.idf_word = data["idf_word"]
+            vectorizer.idf_char = data["idf_char"]
+        return vectorizer
@@ -0,0 +1,54 @@
+import heapq
+
+
+class SpaceSaving:
+    """
+    Approximate top-K counter (Metwally et al. SpaceSaving) with bounded memory.
+
+    At most `capacity` items are tracked. When a new item arrives and the
+    summary is full, the item with the smallest count is replaced and the
+    newcomer inherits that count, so counts are over-estimates by at most
+    the smallest tracked count. Summaries of disjoint shards can be merged.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self._heap = []  # (count, item); entries go stale when counts grow
+
+    def _pop_min(self):
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self.counts.get(item)
+            if current == count:
+                return item, count
+            if current is not None:
+                # Stale entry: counts only grow, so re-push with the real value
+                heapq.heappush(self._heap, (current, item))
+
+    def update(self, counts):
+        """
+        Add a {item: count} mapping (e.g. the n-gram counts of one document).
+        """
+        tracked = self.counts
+        for item, count in counts.items():
+            if item in tracked:
+                tracked[item] += count
+            elif len(tracked) < self.capacity:
+                tracked[item] = count
+                heapq.heappush(self._heap, (count, item))
+            else:
+                evicted, floor = self._pop_min()
+                del tracked[evicted]
+                tracked[item] = floor + count
+                heapq.heappush(self._heap, (floor + count, item))
+
+    def merge(self, other):
+        """
+        Fold another summary into this one.
+        """
+        self.update(other.counts)
+        return self
+
+    def most_common(self, n):
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
@@ -1,6 +1,52 @@
+import os
 import re
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
 from src.utils.helpers import clean_text
+from src.preprocessing.heavy_hitters import SpaceSaving
+
+
+def _word_ngrams(words, n):
+    return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
+
+
+def _char_ngrams(cleaned, n):
+    return [cleaned[i:i+n] for i in range(len(cleaned)-n+1)]
+
+
+def _count_chunk(texts, approx_capacity=None):
+    """
+    Word 2/3-gram and char 3/4-gram counts of a chunk of texts, counted one
+    document at a time. Returns two Counters, or two SpaceSaving summaries
+    when approx_capacity is set.
+    """
+    if approx_capacity:
+        word_counts = SpaceSaving(approx_capacity)
+        char_counts = SpaceSaving(approx_capacity)
+    else:
+        word_counts = Counter()
+        char_counts = Counter()
+
+    for t in texts:
+        cleaned = clean_text(t)
+        words = cleaned.split()
+        doc_words = Counter(_word_ngrams(words, 2))
+        doc_words.update(_word_ngrams(words, 3))
+        doc_chars = Counter(_char_ngrams(cleaned, 3))
+        doc_chars.update(_char_ngrams(cleaned, 4))
+        word_counts.update(doc_words)
+        char_counts.update(doc_chars)
+
+    return word_counts, char_counts
+
+
+def _merge_counts(total, counts):
+    total.update(counts.counts if isinstance(counts, SpaceSaving) else counts)
 
 
 class NgramExtractor:
@@ -17,70 +63,148 @@ class NgramExtractor:
         self.max_features = max_features
         self.word_vocab = None
         self.char_vocab = None
+        self.word_index = None
+        self.char_index = None
 
     def _extract_word_ngrams(self, text, n=2):
         words = clean_text(text).split()
-        return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
+        return _word_ngrams(words, n)
 
     def _extract_char_ngrams(self, text, n=3):
         cleaned = clean_text(text)
-        return [cleaned[i:i+n] for i in range(len(cleaned)-n+1)]
+        return _char_ngrams(cleaned, n)
 
-    def fit(self, texts):
+    def fit(self, texts, n_jobs=1, chunk_size=1000, approx=False, capacity=None):
         """
         Build vocabulary of most frequent n-grams across the dataset.
-        """
 
-        # Gather all n-grams
-        word_grams = []
-        char_grams = []
+        texts may be any iterable (including a generator); documents are
+        counted one at a time, so memory grows with the number of distinct
+        n-grams rather than with the corpus.
 
-        for t in texts:
-            word_grams.extend(self._extract_word_ngrams(t, n=2))
-            word_grams.extend(self._extract_word_ngrams(t, n=3))
-            char_grams.extend(self._extract_char_ngrams(t, n=3))
-            char_grams.extend(self._extract_char_ngrams(t, n=4))
+        n_jobs = worker processes; chunks of chunk_size texts are counted in
+                 parallel and merged in input order, so the vocabulary is the
+                 same for any n_jobs
+        approx = keep at most `capacity` n-grams per type with SpaceSaving
+                 (default 10 * max_features) for corpora whose distinct
+                 n-grams do not fit in memory
+        """
+        approx_capacity = (capacity or 10 * self.max_features) if approx else None
+        if approx_capacity:
+            word_total = SpaceSaving(approx_capacity)
+            char_total = SpaceSaving(approx_capacity)
+        else:
+            word_total = Counter()
+            char_total = Counter()
+
+        texts = iter(texts)
+        chunks = iter(lambda: list(islice(texts, chunk_size)), [])
+
+        if n_jobs == 1:
+            for chunk in chunks:
+                word_counts, char_counts = _count_chunk(chunk, approx_capacity)
+                _merge_counts(word_total, word_counts)
+                _merge_counts(char_total, char_counts)
+        else:
+            workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+            # Bounded number of chunks in flight; merge strictly in order
+            with ProcessPoolExecutor(workers) as pool:
+                max_pending = 2 * workers
+                pending = deque()
+
+                def merge_next():
+                    word_counts, char_counts = pending.popleft().result()
+                    _merge_counts(word_total, word_counts)
+                    _merge_counts(char_total, char_counts)
+
+                for chunk in chunks:
+                    pending.append(pool.submit(_count_chunk, chunk, approx_capacity))
+                    if len(pending) >= max_pending:
+                        merge_next()
+                while pending:
+                    merge_next()
 
         # Select top-K most common n-grams
-        self.word_vocab = [w for w, _ in Counter(word_grams).most_common(self.max_features)]
-        self.char_vocab = [c for c, _ in Counter(char_grams).most_common(self.max_features)]
+        self.word_vocab = [w for w, _ in word_total.most_common(self.max_features)]
+        self.char_vocab = [c for c, _ in char_total.most_common(self.max_features)]
+        self._build_index()
 
-    def transform(self, text):
+    def _build_index(self):
         """
-        Convert text into numeric feature vector:
-        - word n-gram frequencies
-        - char n-gram frequencies
+        term -> column maps; char columns follow the word columns.
         """
+        self.word_index = {w: i for i, w in enumerate(self.word_vocab)}
+        offset = len(self.word_vocab)
+        self.char_index = {c: offset + i for i, c in enumerate(self.char_vocab)}
+
+    @property
+    def n_features(self):
+        return len(self.word_vocab) + len(self.char_vocab)
 
+    def _check_fitted(self):
         if self.word_vocab is None or self.char_vocab is None:
             raise ValueError("NgramExtractor must be fitted before calling transform().")
+        if getattr(self, "word_index", None) is None:
+            # Extractors pickled before the index maps existed
+            self._build_index()
 
-        features = []
-
-        # Extract n-grams
-        word_grams = (
-            self._extract_word_ngrams(text, 2)
-            + self._extract_word_ngrams(text, 3)
-        )
-        char_grams = (
-            self._extract_char_ngrams(text, 3)
-            + self._extract_char_ngrams(text, 4)
-        )
-
-        word_counts = Counter(word_grams)
-        char_counts = Counter(char_grams)
-
-        # Build feature vector
-        for w in self.word_vocab:
-            features.append(word_counts[w])
+    def _nonzero(self, text):
+        """
+        (columns, counts) of the vocabulary n-grams present in text.
+        """
+        cleaned = clean_text(text)
+        words = cleaned.split()
+
+        word_counts = Counter(_word_ngrams(words, 2))
+        word_counts.update(_word_ngrams(words, 3))
+        char_counts = Counter(_char_ngrams(cleaned, 3))
+        char_counts.update(_char_ngrams(cleaned, 4))
+
+        columns, counts = [], []
+        for grams, index in ((word_counts, self.word_index), (char_counts, self.char_index)):
+            for gram, count in grams.items():
+                col = index.get(gram)
+                if col is not None:
+                    columns.append(col)
+                    counts.append(count)
+        return columns, counts
 
-        for c in self.char_vocab:
-            features.append(char_counts[c])
+    def transform(self, text):
+        """
+        Convert text into numeric feature vector:
+        - word n-gram frequencies
+        - char n-gram frequencies
+        """
+        self._check_fitted()
 
+        features = [0] * self.n_features
+        for col, count in zip(*self._nonzero(text)):
+            features[col] = count
         return features
 
-    def transform_batch(self, texts):
+    def transform_batch(self, texts, dtype=np.float64):
         """
-        Transform a list of texts into feature matrix.
+        Transform a list of texts into a sparse (n_texts, n_features) CSR
+        matrix holding only the non-zero n-gram counts.
         """
-        return [self.transform(t) for t in texts]
+        self._check_fitted()
+
+        indptr = [0]
+        indices = []
+        data = []
+        for t in texts:
+            columns, counts = self._nonzero(t)
+            indices.extend(columns)
+            data.extend(counts)
+            indptr.append(len(indices))
+
+        matrix = csr_matrix(
+            (
+                np.asarray(data, dtype=dtype),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64),
+            ),
+            shape=(len(indptr) - 1, self.n_features),
+        )
+        matrix.sort_indices()
+        return matrix
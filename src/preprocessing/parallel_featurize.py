@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+_transformer = None
+
+
+def _worker_init(transformer):
+    """
+    Receive the fitted transformer once per worker instead of once per chunk.
+    """
+    global _transformer
+    _transformer = transformer
+
+
+def _transform_chunk(texts):
+    if hasattr(_transformer, "transform_batch"):
+        rows = _transformer.transform_batch(texts)
+    else:
+        rows = _transformer.transform(texts)
+    return rows.tocsr() if issparse(rows) else np.asarray(rows)
+
+
+def _assemble_csr(pieces):
+    """
+    Stack CSR chunks in order with a single copy into preallocated arrays.
+    """
+    n_rows = sum(p.shape[0] for p in pieces)
+    nnz = sum(p.nnz for p in pieces)
+    n_cols = pieces[0].shape[1]
+    dtype = np.result_type(*[p.dtype for p in pieces])
+    index_dtype = np.int32 if max(nnz, n_cols) < np.iinfo(np.int32).max else np.int64
+
+    data = np.empty(nnz, dtype=dtype)
+    indices = np.empty(nnz, dtype=index_dtype)
+    indptr = np.empty(n_rows + 1, dtype=index_dtype)
+    indptr[0] = 0
+
+    row = pos = 0
+    for p in pieces:
+        rows, count = p.shape[0], p.nnz
+        data[pos:pos + count] = p.data
+        indices[pos:pos + count] = p.indices
+        indptr[row + 1:row + rows + 1] = p.indptr[1:] + pos
+        row += rows
+        pos += count
+    return csr_matrix((data, indices, indptr), shape=(n_rows, n_cols))
+
+
+def _assemble_dense(pieces):
+    out = np.empty((sum(len(p) for p in pieces),) + pieces[0].shape[1:],
+                   dtype=np.result_type(*pieces))
+    row = 0
+    for p in pieces:
+        out[row:row + len(p)] = p
+        row += len(p)
+    return out
+
+
+def parallel_transform(transformer, texts, n_jobs=-1, chunk_size=2000):
+    """
+    transform a list of texts with a fitted transformer across worker processes.
+
+    transformer = anything with transform_batch(texts) (FeatureEngineer,
+                  NgramExtractor) or transform(texts) (TfidfVectorizer,
+                  FeatureUnion, HashedTfidfVectorizer), returning a sparse
+                  or dense row block
+    n_jobs = worker processes (-1 = all cores, 1 = no pool)
+    chunk_size = texts per task
+
+    Rows are transformed independently and reassembled in input order, so
+    the result is identical for any n_jobs and chunk_size.
+    """
+    texts = list(texts)
+    workers = (os.cpu_count() or 1) if n_jobs < 0 else max(1, n_jobs)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)] or [[]]
+
+    if workers == 1 or len(chunks) == 1:
+        _worker_init(transformer)
+        try:
+            pieces = [_transform_chunk(chunk) for chunk in chunks]
+        finally:
+            _worker_init(None)
+    else:
+        with ProcessPoolExecutor(
+            min(workers, len(chunks)), initializer=_worker_init, initargs=(transformer,)
+        ) as pool:
+            pieces = list(pool.map(_transform_chunk, chunks))
+
+    if len(pieces) == 1:
+        return pieces[0]
+    if issparse(pieces[0]):
+        return _assemble_csr(pieces)
+    return _assemble_dense(pieces)
@@ -0,0 +1,123 @@
+import re
+
+import numpy as np
+
+# Same patterns as clean_text / sentence_split in src.utils.helpers
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+STYLE_FEATURES = [
+    "word_count",
+    "sentence_count",
+    "avg_word_len",
+    "avg_sentence_len",
+    "vocab_richness",
+    "punctuation_density",
+    "digit_ratio",
+    "repeated_char_ratio",
+]
+
+PUNCTUATION = np.array([ord(c) for c in ".,!?"], dtype=np.uint32)
+
+# Characters per NumPy pass; bounds the code-point buffer at 4 bytes/char
+MAX_CHARS_PER_PASS = 1 << 24
+
+
+def _word_stats(text):
+    # clean_text(text).split(): collapsing whitespace does not change split()
+    words = URL_PATTERN.sub('', text.lower()).split()
+    return len(words), sum(map(len, words)), len(set(words))
+
+
+def _sentence_count(text):
+    # len(sentence_split(text)): every piece between boundaries is non-empty
+    # once the text is stripped, so count the boundaries instead
+    stripped = text.strip()
+    if not stripped:
+        return 0
+    return len(SENTENCE_BOUNDARY.findall(stripped)) + 1
+
+
+def _char_counts(texts):
+    """
+    Per-text counts of ".,!?" characters, str.isdigit() characters and
+    positions where a character equals the next one, from one code-point array.
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    # surrogatepass: lone surrogates (e.g. from JSON "\ud800" escapes) are code
+    # points like any other, as in the per-text features
+    codes = np.frombuffer(
+        "".join(texts).encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+    )
+
+    punct = np.isin(codes, PUNCTUATION)
+    digits = (codes >= 48) & (codes <= 57)
+    non_ascii = np.unique(codes[codes >= 128])
+    if len(non_ascii):
+        # Unicode digits (superscripts, other scripts) that str.isdigit accepts
+        extra = [c for c in non_ascii.tolist() if chr(c).isdigit()]
+        if extra:
+            digits |= np.isin(codes, np.array(extra, dtype=np.uint32))
+    repeats = np.zeros(len(codes), dtype=bool)
+    repeats[:-1] = codes[1:] == codes[:-1]
+
+    def per_text(mask, stop):
+        csum = np.concatenate([[0], np.cumsum(mask, dtype=np.int64)])
+        return csum[stop] - csum[starts]
+
+    # A repeat at the last character of a text would pair it with the next text
+    repeat_stop = np.maximum(ends - 1, starts)
+    return per_text(punct, ends), per_text(digits, ends), per_text(repeats, repeat_stop), lengths
+
+
+def _batches(texts):
+    batch, size = [], 0
+    for t in texts:
+        if batch and size + len(t) > MAX_CHARS_PER_PASS:
+            yield batch
+            batch, size = [], 0
+        batch.append(t)
+        size += len(t)
+    if batch:
+        yield batch
+
+
+def basic_features_batch(texts):
+    """
+    FeatureEngineer.basic_features for many texts at once.
+
+    Returns a float (n_texts, 8) array whose rows equal basic_features(text)
+    exactly, in STYLE_FEATURES order.
+    """
+    texts = [t if isinstance(t, str) else str(t) for t in texts]
+    out = np.zeros((len(texts), len(STYLE_FEATURES)), dtype=float)
+
+    row = 0
+    for batch in _batches(texts):
+        n = len(batch)
+        word_stats = np.array([_word_stats(t) for t in batch], dtype=np.int64).reshape(n, 3)
+        word_count, word_chars, unique_words = word_stats.T
+        sentence_count = np.fromiter(map(_sentence_count, batch), dtype=np.int64, count=n)
+        punct, digits, repeats, lengths = _char_counts(batch)
+
+        has_words = word_count > 0
+        has_sentences = sentence_count > 0
+        safe_words = np.maximum(word_count, 1)
+        denom = np.maximum(lengths, 1)
+
+        block = out[row:row + n]
+        block[:, 0] = word_count
+        block[:, 1] = sentence_count
+        block[:, 2] = np.where(has_words, word_chars / safe_words, 0)
+        block[:, 3] = np.where(has_sentences, word_count / np.maximum(sentence_count, 1), 0)
+        block[:, 4] = np.where(has_words, unique_words / safe_words, 0)
+        block[:, 5] = punct / denom
+        block[:, 6] = digits / denom
+        block[:, 7] = repeats / denom
+        row += n
+
+    return out
+
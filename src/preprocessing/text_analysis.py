@@ -0,0 +1,84 @@
+import re
+
+import numpy as np
+
+from src.utils.helpers import clean_text
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+
+class TextAnalysis:
+    """
+    Everything /api/analyze needs from a document, computed in one pass:
+
+    - sentences and their (start, end) spans in the original text
+    - lowercased word tokens of the whole text and per-sentence word counts
+    - the count of the most frequent word bigram
+    - cleaned forms (clean_text) of the whole text and, on demand, of sentences
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.sentences, self.spans = self._split(text)
+        self.words, self.sentence_word_counts = self._tokenize(text, self.spans)
+        self.top_bigram_count = self._top_bigram_count(self.words)
+        self.cleaned = clean_text(text)
+        self._sentence_cleaned = {}
+
+    @staticmethod
+    def _split(text):
+        # Same sentences as re.split(SENTENCE_BOUNDARY) + strip, with offsets
+        sentences, spans = [], []
+        start = 0
+        bounds = [m.span() for m in SENTENCE_BOUNDARY.finditer(text)]
+        for sep_start, sep_end in bounds + [(len(text), len(text))]:
+            piece = text[start:sep_start]
+            stripped = piece.strip()
+            if stripped:
+                offset = start + (len(piece) - len(piece.lstrip()))
+                sentences.append(stripped)
+                spans.append((offset, offset + len(stripped)))
+            start = sep_end
+        return sentences, spans
+
+    @staticmethod
+    def _tokenize(text, spans):
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets (rare Unicode cases): count per sentence
+            words = WORD_PATTERN.findall(lowered)
+            counts = [len(WORD_PATTERN.findall(text[s:e])) for s, e in spans]
+            return words, counts
+
+        # Sentences are separated by whitespace only, so scanning each span
+        # once yields every word of the text exactly once
+        words, counts = [], []
+        for start, end in spans:
+            tokens = WORD_PATTERN.findall(lowered, start, end)
+            words.extend(tokens)
+            counts.append(len(tokens))
+        return words, counts
+
+    @staticmethod
+    def _top_bigram_count(words):
+        if len(words) < 2:
+            return 0
+        vocab = {}
+        ids = np.array([vocab.setdefault(w, len(vocab)) for w in words], dtype=np.int64)
+        pairs = ids[:-1] * len(vocab) + ids[1:]
+        return int(np.unique(pairs, return_counts=True)[1].max())
+
+    def cleaned_sentences(self, indices=None):
+        """
+        clean_text() of the sentences at indices (all sentences by default),
+        computed once per sentence and only for sentences that are asked for.
+        """
+        if indices is None:
+            indices = range(len(self.sentences))
+        cleaned = []
+        for i in indices:
+            if i not in self._sentence_cleaned:
+                self._sentence_cleaned[i] = clean_text(self.sentences[i])
+            cleaned.append(self._sentence_cleaned[i])
+        return cleaned
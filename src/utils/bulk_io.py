@@ -0,0 +1,102 @@
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+
+def _is_csv(path):
+    return path.lower().endswith(".csv")
+
+
+def iter_records(path, skip=0):
+    """
+    Stream records (dicts) from a .jsonl or .csv file, one at a time.
+    skip = number of leading records to pass over (used when resuming).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Input file not found: {path}")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if _is_csv(path):
+            csv.field_size_limit(sys.maxsize)
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        yield from islice(records, skip, None)
+
+
+def iter_chunks(records, chunk_size):
+    """
+    Group an iterator into lists of at most chunk_size items.
+    """
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RecordWriter:
+    """
+    Appends result dicts to a .jsonl or .csv file and reports the byte
+    offset after each flush so a checkpoint can truncate back to it.
+    """
+
+    def __init__(self, path, fields, truncate_at=None):
+        """
+        fields = column order for CSV output
+        truncate_at = byte offset to resume from (None starts a new file)
+        """
+        self.path = path
+        self.fields = fields
+        self.is_csv = _is_csv(path)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if truncate_at is None:
+            self._f = open(path, "w", newline="", encoding="utf-8")
+        else:
+            self._f = open(path, "r+", newline="", encoding="utf-8")
+            self._f.truncate(truncate_at)
+            self._f.seek(truncate_at)
+
+        if self.is_csv:
+            self._csv = csv.DictWriter(self._f, fieldnames=fields, extrasaction="ignore")
+            if truncate_at is None:
+                self._csv.writeheader()
+
+    def write_many(self, rows):
+        for row in rows:
+            if self.is_csv:
+                self._csv.writerow(row)
+            else:
+                self._f.write(json.dumps(row) + "\n")
+
+    def flush(self):
+        """
+        Flush to disk and return the current byte offset.
+        """
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def close(self):
+        self._f.close()
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, state):
+    """
+    Write the checkpoint atomically so a crash never leaves it half-written.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+
+import numpy as np
+
+CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", os.path.join("data", ".cache"))
+CACHE_FORMAT_VERSION = 1
+CHUNK_ROWS = 100000
+
+_HASH_INDEX = "hashes.json"
+
+
+def normalize_columns(columns):
+    """
+    Strip column names and map malformed text headers (e.g. '5 877=text')
+    to 'text'. Returns the new names in the same order.
+    """
+    names = [str(c).strip() for c in columns]
+    if "text" not in names:
+        for i, name in enumerate(names):
+            if name.endswith("=text"):
+                names[i] = "text"
+                break
+    return names
+
+
+def _read_header(path):
+    import pandas as pd
+
+    original = list(pd.read_csv(path, nrows=0).columns)
+    names = normalize_columns(original)
+    if "text" not in names or "label" not in names:
+        raise ValueError(f"Dataset must contain 'text' and 'label' columns. Found: {names}")
+    return original, names
+
+
+def iter_csv_chunks(path, chunk_size=CHUNK_ROWS, stats=None):
+    """
+    Yield (texts, labels) per chunk of the CSV with explicit dtypes: texts as
+    a list of str, labels as an int64 array. Rows missing text or label are
+    dropped, like load_data always did. If given, stats receives the
+    normalized column names and the number of CSV rows read.
+    """
+    import pandas as pd
+
+    original, names = _read_header(path)
+    if stats is not None:
+        stats.update(columns=names, csv_rows=0)
+    text_col = original[names.index("text")]
+    label_col = original[names.index("label")]
+
+    reader = pd.read_csv(
+        path,
+        usecols=[text_col, label_col],
+        dtype={text_col: "object", label_col: "float64"},
+        chunksize=chunk_size,
+    )
+    for chunk in reader:
+        if stats is not None:
+            stats["csv_rows"] += len(chunk)
+        chunk = chunk.dropna(subset=[text_col, label_col])
+        yield chunk[text_col].astype(str).tolist(), chunk[label_col].to_numpy().astype(np.int64)
+
+
+def file_sha256(path):
+    """
+    sha256 of the file, remembered per (size, mtime) in the cache directory
+    so an unchanged multi-GB CSV is hashed once.
+    """
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    index_path = os.path.join(CACHE_DIR, _HASH_INDEX)
+    key = os.path.abspath(path)
+
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(key)
+    if entry and entry["stamp"] == stamp:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            digest.update(block)
+    sha = digest.hexdigest()
+
+    index[key] = {"stamp": stamp, "sha256": sha}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{index_path}.tmp{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, index_path)
+    except OSError:
+        pass
+    return sha
+
+
+class TextColumn:
+    """
+    Read-only sequence of texts stored as one UTF-8 blob plus int64 offsets,
+    both memory-mapped. Items are decoded on access, so the column costs
+    page cache instead of one Python str per row.
+    """
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def open(cls, directory):
+        offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode="r")
+        blob_path = os.path.join(directory, "text.bin")
+        if os.path.getsize(blob_path) == 0:
+            return cls(b"", offsets)
+        with open(blob_path, "rb") as f:
+            blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(blob, offsets)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TextColumn index out of range")
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._blob[start:end].decode("utf-8")
+
+    def __iter__(self):
+        blob = self._blob
+        offsets = self._offsets
+        for start in range(0, len(self), CHUNK_ROWS):
+            bounds = offsets[start:start + CHUNK_ROWS + 1].tolist()
+            for i in range(len(bounds) - 1):
+                yield blob[bounds[i]:bounds[i + 1]].decode("utf-8")
+
+    def tolist(self):
+        return list(self)
+
+
+def write_text_column(directory, texts):
+    """
+    Write texts as text.bin + offsets.npy in directory (readable with
+    TextColumn.open). Returns the number of texts.
+    """
+    lengths = []
+    with open(os.path.join(directory, "text.bin"), "wb") as blob:
+        for start in range(0, len(texts), CHUNK_ROWS):
+            encoded = [t.encode("utf-8") for t in texts[start:start + CHUNK_ROWS]]
+            blob.write(b"".join(encoded))
+            lengths.append(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    if len(texts):
+        np.cumsum(np.concatenate(lengths), out=offsets[1:])
+    np.save(os.path.join(directory, "offsets.npy"), offsets)
+    return len(texts)
+
+
+def _build_cache(path, directory, chunk_size):
+    """
+    Stream the CSV into text.bin / offsets.npy / labels.npy in a temp dir,
+    then rename it into place.
+    """
+    tmp_dir = f"{directory}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    lengths, labels = [], []
+    rows = 0
+    stats = {}
+    try:
+        with open(os.path.join(tmp_dir, "text.bin"), "wb") as blob:
+            for texts, chunk_labels in iter_csv_chunks(path, chunk_size, stats):
+                encoded = [t.encode("utf-8") for t in texts]
+                blob.write(b"".join(encoded))
+                lengths.append(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+                labels.append(chunk_labels)
+                rows += len(texts)
+
+        offsets = np.zeros(rows + 1, dtype=np.int64)
+        if rows:
+            np.cumsum(np.concatenate(lengths), out=offsets[1:])
+        np.save(os.path.join(tmp_dir, "offsets.npy"), offsets)
+        np.save(
+            os.path.join(tmp_dir, "labels.npy"),
+            np.concatenate(labels) if labels else np.zeros(0, dtype=np.int64),
+        )
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({
+                "format_version": CACHE_FORMAT_VERSION,
+                "source": os.path.abspath(path),
+                "columns": stats["columns"],
+                "csv_rows": stats["csv_rows"],
+                "rows": rows,
+                "created": time.time(),
+            }, f, indent=2)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def cache_path(path):
+    return os.path.join(CACHE_DIR, file_sha256(path)[:32])
+
+
+def _remove_stale_caches(path, keep):
+    """
+    Delete the caches built from earlier contents of the same CSV, so every
+    edit of the dataset does not leave a full copy behind. Readers that
+    still have old files memory-mapped keep them until they close.
+    """
+    source = os.path.abspath(path)
+    for name in os.listdir(CACHE_DIR):
+        directory = os.path.join(CACHE_DIR, name)
+        if directory == keep or ".tmp" in name or not os.path.isdir(directory):
+            continue
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                stale = json.load(f).get("source") == source
+        except (OSError, ValueError):
+            continue
+        if stale:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def load_columnar(path, chunk_size=CHUNK_ROWS, rebuild=False):
+    """
+    (TextColumn, labels int64 array, meta) for the CSV at path.
+
+    The first call for a given file content parses the CSV in chunks and
+    writes the columnar cache; later calls only memory-map it.
+    """
+    directory = cache_path(path)
+    meta_path = os.path.join(directory, "meta.json")
+    meta = None
+    if not rebuild and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != CACHE_FORMAT_VERSION:
+            meta = None
+
+    if meta is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _build_cache(path, directory, chunk_size)
+        _remove_stale_caches(path, directory)
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    texts = TextColumn.open(directory)
+    labels = np.load(os.path.join(directory, "labels.npy"), mmap_mode="r")
+    return texts, labels, meta
+
+
+def iter_dataset(path, chunk_size=CHUNK_ROWS, use_cache=True):
+    """
+    Stream (texts, labels) chunks: from the columnar cache when use_cache
+    (building it on first use), otherwise straight from the CSV.
+    """
+    if not use_cache:
+        yield from iter_csv_chunks(path, chunk_size)
+        return
+
+    texts, labels, _ = load_columnar(path, chunk_size)
+    for start in range(0, len(texts), chunk_size):
+        yield texts[start:start + chunk_size], np.asarray(labels[start:start + chunk_size])
@@ -0,0 +1,311 @@
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Limits (override with environment variables)
+MAX_UPLOAD_BYTES = int(os.environ.get("EXTRACT_MAX_BYTES", str(50 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.environ.get("EXTRACT_MAX_PAGES", "500"))
+MAX_TEXT_CHARS = int(os.environ.get("EXTRACT_MAX_CHARS", str(5 * 1024 * 1024)))
+EXTRACT_TIMEOUT_SECONDS = float(os.environ.get("EXTRACT_TIMEOUT", "60"))
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PAGES_PER_TASK = 8
+TASKS_PER_WORKER = 50
+
+_pool = None
+_pool_lock = threading.Lock()
+_timings = defaultdict(lambda: deque(maxlen=1000))
+_timings_lock = threading.Lock()
+
+
+class ExtractionError(Exception):
+    """
+    Extraction failure with the HTTP status the web app should return.
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# ---- worker side (runs inside the pool processes) ----
+
+def _pdf_page_count(path):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _pdf_pages_text(path, start, stop):
+    """
+    Text of pages [start, stop), closing each page as soon as it is read so
+    only one page's objects are alive at a time.
+    """
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            parts.append(page.extract_text() or "")
+            page.close()
+    return "\n".join(parts)
+
+
+def _docx_text(path):
+    from docx import Document
+
+    doc = Document(path)
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+def _worker_main(conn):
+    """
+    Run (function, args) tasks received on conn until it is closed, sending
+    back ("ok", result) or ("error", exception).
+    """
+    while True:
+        try:
+            fn, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = ("ok", fn(*args))
+        except Exception as exc:
+            reply = ("error", RuntimeError(f"{type(exc).__name__}: {exc}"))
+        conn.send(reply)
+
+
+# ---- parent side ----
+
+class _Worker:
+    """
+    One spawned extraction process and the parent's end of its pipe.
+    """
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _WorkerPool:
+    """
+    EXTRACT_WORKERS extraction processes, each running one task at a time.
+
+    A task that misses its deadline has its own worker killed and replaced;
+    every other task keeps running in its worker. Workers are started on
+    first use and replaced after TASKS_PER_WORKER tasks to bound leaks in
+    the parsers. Tasks are dispatched from a thread per worker, so submit()
+    returns a concurrent.futures.Future.
+    """
+
+    def __init__(self, workers):
+        # spawn: never fork the threaded web server
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+
+    def submit(self, fn, args, deadline):
+        return self._threads.submit(self._run, fn, args, deadline)
+
+    def _run(self, fn, args, deadline):
+        # A dispatch thread only runs while a worker is idle
+        worker = self._idle.get_nowait()
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Extraction deadline passed before the task started")
+            if worker is None:
+                worker = _Worker(self._context)
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(remaining):
+                worker.kill()
+                worker = None
+                raise TimeoutError("Extraction task timed out")
+            status, value = worker.conn.recv()
+        except TimeoutError:
+            raise
+        except (EOFError, OSError) as exc:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise RuntimeError(f"Extraction worker exited unexpectedly ({exc})")
+        finally:
+            if worker is not None:
+                worker.tasks += 1
+                if worker.tasks >= TASKS_PER_WORKER:
+                    worker.kill()
+                    worker = None
+            self._idle.put(worker)
+
+        if status == "error":
+            raise value
+        return value
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _WorkerPool(EXTRACT_WORKERS)
+        return _pool
+
+
+def _wait(future, deadline):
+    remaining = max(deadline - time.monotonic(), 0)
+    try:
+        return future.result(timeout=remaining)
+    except TimeoutError:
+        # Still queued behind other requests' tasks: never start it
+        future.cancel()
+        raise
+
+
+def _save_upload(stream, suffix):
+    """
+    Copy the upload to a temp file the workers can open, enforcing the byte limit.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = stream.read(1024 * 1024)
+                if not block:
+                    break
+                written += len(block)
+                if written > MAX_UPLOAD_BYTES:
+                    raise ExtractionError(
+                        f"File is too large (limit {MAX_UPLOAD_BYTES // (1024 * 1024)} MB).",
+                        status=413,
+                    )
+                out.write(block)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _extract_pdf(path, deadline):
+    pool = _get_pool()
+    page_count = _wait(pool.submit(_pdf_page_count, (path,), deadline), deadline)
+    pages = min(page_count, MAX_PDF_PAGES)
+
+    tasks = [
+        pool.submit(_pdf_pages_text, (path, start, min(start + PAGES_PER_TASK, pages)), deadline)
+        for start in range(0, pages, PAGES_PER_TASK)
+    ]
+    # Assemble in page order as each range finishes, up to MAX_TEXT_CHARS
+    parts = []
+    chars = 0
+    truncated = page_count > pages
+    try:
+        for task in tasks:
+            part = _wait(task, deadline)
+            if chars + len(part) > MAX_TEXT_CHARS:
+                parts.append(part[:MAX_TEXT_CHARS - chars])
+                truncated = True
+                break
+            parts.append(part)
+            chars += len(part) + 1
+    finally:
+        for task in tasks:
+            task.cancel()
+    return "\n".join(parts), {"pages": page_count, "truncated": truncated}
+
+
+def _extract_docx(path, deadline):
+    text = _wait(_get_pool().submit(_docx_text, (path,), deadline), deadline)
+    if len(text) > MAX_TEXT_CHARS:
+        return text[:MAX_TEXT_CHARS], {"truncated": True}
+    return text, {}
+
+
+def _record(fmt, seconds):
+    with _timings_lock:
+        _timings[fmt].append(seconds * 1000)
+
+
+def extract_document(stream, filename):
+    """
+    Extract text from an uploaded .pdf or .docx stream in the worker pool.
+    Returns (text, info) where info may carry page counts for PDFs.
+    Raises ExtractionError on limits, timeouts and unreadable files.
+    """
+    fmt = os.path.splitext(filename.lower())[1].lstrip(".")
+    extractors = {"pdf": _extract_pdf, "docx": _extract_docx}
+    if fmt not in extractors:
+        raise ExtractionError(f"Unsupported document type: .{fmt}")
+
+    start = time.monotonic()
+    deadline = start + EXTRACT_TIMEOUT_SECONDS
+    path = _save_upload(stream, f".{fmt}")
+    try:
+        text, info = extractors[fmt](path, deadline)
+    except TimeoutError:
+        raise ExtractionError(
+            f"Extraction timed out after {EXTRACT_TIMEOUT_SECONDS:g} seconds.",
+            status=504,
+        )
+    except ExtractionError:
+        raise
+    except Exception as exc:
+        raise ExtractionError(f"Unable to read {fmt.upper()} file: {exc}")
+    finally:
+        os.remove(path)
+
+    _record(fmt, time.monotonic() - start)
+    return text.strip(), info
+
+
+def read_text_upload(stream, filename):
+    """
+    Read a plain-text upload in the request thread, enforcing the same byte limit.
+    """
+    start = time.monotonic()
+    data = stream.read(MAX_UPLOAD_BYTES + 1) or b""
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise ExtractionError(
+            f"File is too large (limit {MAX_UPLOAD_BYTES // (1024 * 1024)} MB).",
+            status=413,
+        )
+    text = data.decode("utf-8", errors="ignore").strip()
+    _record(os.path.splitext(filename.lower())[1].lstrip("."), time.monotonic() - start)
+    return text
+
+
+def extraction_stats():
+    """
+    Per-format extraction time (ms) over the recent window.
+    """
+    stats = {}
+    with _timings_lock:
+        samples = {fmt: np.array(values) for fmt, values in _timings.items()}
+    for fmt, values in samples.items():
+        if not len(values):
+            continue
+        p50, p95 = np.percentile(values, [50, 95])
+        stats[fmt] = {
+            "count": int(len(values)),
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "max_ms": float(values.max()),
+        }
+    return stats
@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+
+from src.utils.helpers import clean_text
+
+# keras.preprocessing.text.Tokenizer defaults
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+
+class FastTokenizer:
+    """
+    TensorFlow-free replacement for Keras Tokenizer.texts_to_sequences +
+    pad_sequences(padding="post", truncating="post") as used by TextTokenizer.
+
+    Words are mapped to their final id (num_words cut-off and OOV already
+    applied) once at construction, so encoding is one dict lookup per word
+    written straight into a preallocated int32 array.
+    """
+
+    def __init__(self, word_index, num_words=20000, oov_token="<OOV>",
+                 filters=KERAS_FILTERS, lower=True, split=" ", max_len=300):
+        self.word_index = word_index
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self.max_len = max_len
+
+        self._translate = str.maketrans({c: split for c in filters})
+        self._oov_id = word_index.get(oov_token) if oov_token is not None else None
+        if num_words:
+            self._ids = {
+                w: (i if i < num_words else self._oov_id) for w, i in word_index.items()
+            }
+        else:
+            self._ids = dict(word_index)
+
+    @classmethod
+    def from_config(cls, config, max_len=300):
+        """
+        Build from a Keras Tokenizer.get_config() / to_json()["config"] dict.
+        """
+        word_index = config["word_index"]
+        if isinstance(word_index, str):
+            word_index = json.loads(word_index)
+        return cls(
+            word_index,
+            num_words=config.get("num_words"),
+            oov_token=config.get("oov_token"),
+            filters=config.get("filters", KERAS_FILTERS),
+            lower=config.get("lower", True),
+            split=config.get("split", " "),
+            max_len=max_len,
+        )
+
+    @classmethod
+    def load(cls, path="outputs/tokenizer.json", max_len=300, num_words=20000,
+             oov_token="<OOV>"):
+        """
+        Load either a TextTokenizer.save() file (Keras to_json) or a plain
+        {word: index} file written by helpers.save_tokenizer. num_words and
+        oov_token only apply to plain word-index files.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Tokenizer file not found at: {path}")
+
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, str):
+            # TextTokenizer.save() dumps the to_json() string
+            data = json.loads(data)
+
+        if isinstance(data, dict) and "config" in data:
+            return cls.from_config(data["config"], max_len=max_len)
+        return cls(data, num_words=num_words, oov_token=oov_token, max_len=max_len)
+
+    def _words(self, text):
+        if self.lower:
+            text = text.lower()
+        return [w for w in text.translate(self._translate).split(self.split) if w]
+
+    def _encode(self, words):
+        get = self._ids.get
+        oov = self._oov_id
+        if oov is not None:
+            # Every word yields exactly one id, so only max_len words matter
+            return [get(w, oov) for w in words[:self.max_len]]
+        ids = [get(w) for w in words]
+        return [i for i in ids if i is not None][:self.max_len]
+
+    def texts_to_sequences(self, texts, out=None, clean=True):
+        """
+        Encode texts into an (n_texts, max_len) int32 array, zero-padded and
+        truncated at the end. clean=True applies clean_text first, like
+        TextTokenizer; pass out to reuse a preallocated array.
+        """
+        texts = list(texts)
+        if out is None:
+            out = np.zeros((len(texts), self.max_len), dtype=np.int32)
+        else:
+            out[:len(texts)] = 0
+
+        for row, text in enumerate(texts):
+            if clean:
+                text = clean_text(text)
+            ids = self._encode(self._words(text))
+            if ids:
+                out[row, :len(ids)] = ids
+        return out
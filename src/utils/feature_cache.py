@@ -0,0 +1,174 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+
+from src.utils.dataset import TextColumn, write_text_column
+from src.utils.helpers import clean_text
+
+FEATURE_CACHE_DIR = os.environ.get(
+    "FEATURE_CACHE_DIR", os.path.join("data", ".cache", "features")
+)
+FEATURE_CACHE_MAX_MB = float(os.environ.get("FEATURE_CACHE_MAX_MB", "4096"))
+FEATURE_CACHE_VERSION = 1
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _plain(value):
+    if isinstance(value, _PRIMITIVES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_plain(v) for v in value)
+    return False
+
+
+def vectorizer_params(vectorizer):
+    """
+    Class name plus every plain (str/number/bool/None/tuple) parameter of an
+    unfitted vectorizer, including nested transformers of a FeatureUnion.
+    """
+    if hasattr(vectorizer, "get_params"):
+        params = vectorizer.get_params(deep=True)
+    else:
+        params = vars(vectorizer)
+    plain = {k: list(v) if isinstance(v, tuple) else v
+             for k, v in params.items() if _plain(v)}
+    return {"class": type(vectorizer).__name__, "params": plain}
+
+
+def feature_cache_key(data_sha256, vectorizer):
+    """
+    Cache key for the features of a dataset (content hash) under a vectorizer
+    configuration. Also covers clean_text and the sklearn version, since
+    either changes the cleaned corpus or the pickled vectorizer.
+    """
+    import sklearn
+
+    payload = {
+        "version": FEATURE_CACHE_VERSION,
+        "data": data_sha256,
+        "vectorizer": vectorizer_params(vectorizer),
+        "clean_text": hashlib.sha256(inspect.getsource(clean_text).encode()).hexdigest(),
+        "sklearn": sklearn.__version__,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:32]
+
+
+class FeatureCache:
+    """
+    On-disk cache of training features: the cleaned corpus, the fitted
+    vectorizer and the sparse feature matrix, one directory per key.
+
+    Entries are evicted least recently used first once the cache grows
+    beyond max_mb.
+    """
+
+    def __init__(self, cache_dir=FEATURE_CACHE_DIR, max_mb=FEATURE_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """
+        (cleaned TextColumn, fitted vectorizer, X) for key, or None.
+        """
+        import scipy.sparse as sp
+
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(os.path.join(entry, "vectorizer.pkl"), "rb") as f:
+                vectorizer = pickle.load(f)
+            X = sp.load_npz(os.path.join(entry, "X.npz"))
+            cleaned = TextColumn.open(entry)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            # Partial or corrupt entry: drop it and rebuild
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        # Recency for eviction
+        os.utime(meta_path)
+        return cleaned, vectorizer, X
+
+    def store(self, key, cleaned, vectorizer, X, info=None):
+        """
+        Write an entry (temp dir + rename), then evict down to the size cap.
+        Returns the entry size in bytes.
+        """
+        import scipy.sparse as sp
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self._entry(key)
+        tmp = f"{entry}.tmp{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            write_text_column(tmp, cleaned)
+            with open(os.path.join(tmp, "vectorizer.pkl"), "wb") as f:
+                pickle.dump(vectorizer, f)
+            # Uncompressed: loading speed matters more than disk here
+            sp.save_npz(os.path.join(tmp, "X.npz"), X.tocsr(), compressed=False)
+
+            size = sum(e.stat().st_size for e in os.scandir(tmp))
+            meta = {
+                "key": key,
+                "shape": list(X.shape),
+                "nnz": int(X.nnz),
+                "bytes": size,
+                "created": time.time(),
+            }
+            meta.update(info or {})
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2, default=str)
+
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict(keep=key)
+        return size
+
+    def entries(self):
+        """
+        [(last_used, bytes, key)] of complete entries, oldest first.
+        """
+        found = []
+        if not os.path.isdir(self.cache_dir):
+            return found
+        for item in os.scandir(self.cache_dir):
+            meta_path = os.path.join(item.path, "meta.json")
+            if not item.is_dir() or ".tmp" in item.name or not os.path.exists(meta_path):
+                continue
+            size = sum(e.stat().st_size for e in os.scandir(item.path))
+            found.append((os.path.getmtime(meta_path), size, item.name))
+        return sorted(found)
+
+    def evict(self, keep=None):
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+        The entry named keep is never removed. Returns the evicted keys.
+        """
+        entries = self.entries()
+        total = int(np.sum([size for _, size, _ in entries]))
+        evicted = []
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+            evicted.append(key)
+        return evicted
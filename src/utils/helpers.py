@@ -1,6 +1,5 @@
 import os
 import re
-import pandas as pd
 
 # Correct dataset path
 DATASET_PATH = "data/master_training_data.csv"
@@ -31,41 +30,37 @@ def clean_text(text):
     return text
 
 
-def load_data():
+def load_data(use_cache=True):
     """
     Loads the cleaned + balanced dataset created earlier.
     Returns (texts, labels)
+
+    The CSV is read in chunks. With use_cache, texts is a memory-mapped
+    TextColumn from the columnar cache (src/utils/dataset.py), built on the
+    first run for this file content; otherwise it is a list of str.
     """
+    from src.utils.dataset import iter_csv_chunks, load_columnar
+
     if not os.path.exists(DATASET_PATH):
         raise FileNotFoundError(f"Dataset file not found: {DATASET_PATH}")
 
-    df = pd.read_csv(DATASET_PATH)
-    
-    # Clean column names (remove extra spaces and fix malformed headers)
-    df.columns = df.columns.str.strip()
-    
-    # Fix the malformed 'text' column name
-    if '5 877=text' in df.columns:
-        df.rename(columns={'5 877=text': 'text'}, inplace=True)
-    
-    # Also handle any column that ends with '=text'
-    for col in df.columns:
-        if col.endswith('=text'):
-            df.rename(columns={col: 'text'}, inplace=True)
-            break
-    
-    print(f"Available columns: {df.columns.tolist()}")
-    print(f"Dataset shape: {df.shape}")
-
-    if "text" not in df.columns or "label" not in df.columns:
-        raise ValueError(f"Dataset must contain 'text' and 'label' columns. Found: {df.columns.tolist()}")
-
-    # Remove any rows with missing text or label
-    df = df.dropna(subset=["text", "label"])
-    
-    texts = df["text"].astype(str).tolist()
-    labels = df["label"].astype(int).tolist()
-    
+    texts = None
+    if use_cache:
+        try:
+            texts, labels, meta = load_columnar(DATASET_PATH)
+            labels = labels.tolist()
+        except OSError as exc:
+            print(f"[WARN] Dataset cache unavailable ({exc}); reading the CSV directly")
+
+    if texts is None:
+        meta = {}
+        texts, labels = [], []
+        for chunk_texts, chunk_labels in iter_csv_chunks(DATASET_PATH, stats=meta):
+            texts.extend(chunk_texts)
+            labels.extend(chunk_labels.tolist())
+
+    print(f"Available columns: {meta['columns']}")
+    print(f"Dataset shape: {(meta['csv_rows'], len(meta['columns']))}")
     print(f"Loaded {len(texts)} samples with {len(set(labels))} unique labels")
 
     return texts, labels
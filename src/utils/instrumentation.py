@@ -0,0 +1,170 @@
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss():
+    """
+    Resident set size of this process in bytes (/proc on Linux, otherwise
+    the lifetime peak from getrusage as the best available value).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_seconds():
+    # This process plus finished child processes (e.g. --jobs worker pools)
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class _Stage:
+    def __init__(self, name, parent, info):
+        self.name = name
+        self.parent = parent
+        self.info = info
+        self.start_wall = time.perf_counter()
+        self.start_cpu = _cpu_seconds()
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+
+    def finish(self, run_start):
+        end_rss = current_rss()
+        self.peak_rss = max(self.peak_rss, end_rss)
+        record = {
+            "name": self.name,
+            "parent": self.parent,
+            "started_at_s": round(self.start_wall - run_start, 6),
+            "wall_s": round(time.perf_counter() - self.start_wall, 6),
+            "cpu_s": round(_cpu_seconds() - self.start_cpu, 6),
+            "rss_start_mb": round(self.start_rss / 2 ** 20, 2),
+            "rss_end_mb": round(end_rss / 2 ** 20, 2),
+            "rss_peak_mb": round(self.peak_rss / 2 ** 20, 2),
+        }
+        record.update(self.info)
+        return record
+
+
+class RunRecorder:
+    """
+    Records wall time, CPU time and peak RSS per named stage of a run.
+
+    Stages nest (`parent` holds the enclosing stage). A background thread
+    samples RSS every sample_interval seconds while any stage is open, so
+    peaks between stage boundaries are caught as well.
+    """
+
+    def __init__(self, name="run", sample_interval=0.02):
+        self.name = name
+        self.sample_interval = sample_interval
+        self.stages = []
+        self.info = {}
+        self._open = []
+        self._lock = threading.Lock()
+        self._run_start = time.perf_counter()
+        self._run_cpu = _cpu_seconds()
+        self._started = time.time()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            rss = current_rss()
+            with self._lock:
+                for stage in self._open:
+                    if rss > stage.peak_rss:
+                        stage.peak_rss = rss
+
+    def _ensure_sampler(self):
+        if self._sampler is None or not self._sampler.is_alive():
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample, name="rss-sampler", daemon=True
+            )
+            self._sampler.start()
+
+    @contextmanager
+    def stage(self, name, **info):
+        """
+        Time the enclosed block as one stage; extra keyword values are stored
+        with it (e.g. rows=...). The record is kept even if the block raises.
+        """
+        with self._lock:
+            parent = self._open[-1].name if self._open else None
+            stage = _Stage(name, parent, info)
+            self._open.append(stage)
+        self._ensure_sampler()
+        try:
+            yield stage.info
+        finally:
+            with self._lock:
+                self._open.remove(stage)
+                self.stages.append(stage.finish(self._run_start))
+                idle = not self._open
+            if idle:
+                self._stop.set()
+
+    def annotate(self, **info):
+        """
+        Run-level values for the report (dataset size, accuracies, ...).
+        """
+        self.info.update(info)
+
+    def report(self):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_bytes = peak if sys.platform == "darwin" else peak * 1024
+        return {
+            "run": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._started)),
+            "wall_s": round(time.perf_counter() - self._run_start, 6),
+            "cpu_s": round(_cpu_seconds() - self._run_cpu, 6),
+            "process_peak_rss_mb": round(peak_bytes / 2 ** 20, 2),
+            "host": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "argv": sys.argv,
+            "info": self.info,
+            "stages": sorted(self.stages, key=lambda s: s["started_at_s"]),
+        }
+
+    def save(self, path):
+        """
+        Write the JSON report atomically. Returns the path.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        os.replace(tmp, path)
+        return path
+
+
+def timed_stratified_kfold(recorder, n_splits=3, prefix="calibration_fold"):
+    """
+    StratifiedKFold (the splitter CalibratedClassifierCV uses for cv=n_splits)
+    whose split() generator records each fold as a stage: a fold's stage
+    stays open until the consumer asks for the next split.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    class TimedStratifiedKFold(StratifiedKFold):
+        def split(self, X, y=None, groups=None):
+            for i, (train, test) in enumerate(super().split(X, y, groups), 1):
+                with recorder.stage(f"{prefix}_{i}", train_rows=len(train), test_rows=len(test)):
+                    yield train, test
+
+    return TimedStratifiedKFold(n_splits=n_splits)
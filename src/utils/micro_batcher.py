@@ -0,0 +1,128 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item calls into batched calls.
+
+    Callers block in submit() while a background thread gathers items for up
+    to max_wait_ms or until max_batch_size items are queued, runs
+    batch_fn(items) once and hands each caller its own result.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=32, max_wait_ms=5.0, window=10000):
+        """
+        batch_fn = function(list of items) -> list of results, same order
+        max_batch_size = largest batch passed to batch_fn
+        max_wait_ms = longest time the first queued item waits for company
+        window = number of recent requests/batches kept for the metrics
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._queue_waits = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._requests = 0
+        self._batches = 0
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so start one per process on first use
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def submit(self, item):
+        """
+        Queue one item and block until its result is ready.
+        Exceptions raised by batch_fn are re-raised in every caller.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future.result()
+
+    def _collect(self):
+        first = self._queue.get()
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            with self._lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._batch_sizes.append(len(batch))
+                self._queue_waits.extend((started - queued) * 1000 for _, _, queued in batch)
+
+            try:
+                results = list(self.batch_fn([item for item, _, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"batch_fn returned {len(results)} results for {len(batch)} items"
+                    )
+            except Exception as exc:
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def metrics(self):
+        """
+        Queue-wait percentiles and batch-size stats over the recent window.
+        """
+        with self._lock:
+            waits = np.array(self._queue_waits, dtype=float)
+            sizes = np.array(self._batch_sizes, dtype=float)
+            requests, batches = self._requests, self._batches
+
+        metrics = {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "requests": requests,
+            "batches": batches,
+            "queue_depth": self._queue.qsize(),
+        }
+        if len(waits):
+            p50, p95, p99 = np.percentile(waits, [50, 95, 99])
+            metrics.update(
+                queue_wait_ms_p50=float(p50),
+                queue_wait_ms_p95=float(p95),
+                queue_wait_ms_p99=float(p99),
+            )
+        if len(sizes):
+            metrics.update(
+                batch_size_mean=float(sizes.mean()),
+                batch_size_p95=float(np.percentile(sizes, 95)),
+                batch_size_max=int(sizes.max()),
+            )
+        return metrics
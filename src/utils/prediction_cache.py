@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Keys per disk-tier lookup query, below SQLite's host parameter limit
+# (999 before SQLite 3.32)
+LOOKUP_CHUNK = 500
+
+
+class PredictionCache:
+    """
+    Two-tier cache for prediction probabilities.
+
+    - memory tier: per-process LRU with a size cap and TTL
+    - disk tier (optional): SQLite file shared by every worker process
+
+    Keys are opaque strings (predict.py hashes the cleaned text together with
+    the model artifact fingerprint), values are lists of class probabilities.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600, db_path=None):
+        """
+        max_entries = memory tier capacity (0 disables the memory tier)
+        ttl_seconds = entry lifetime in both tiers (0 or None = no expiry)
+        db_path = SQLite file for the shared disk tier (None disables it)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    def _expiry(self, now):
+        return now + self.ttl_seconds if self.ttl_seconds else None
+
+    def _db(self):
+        # sqlite connections must not cross a fork, so open one per process
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.db_path, timeout=5, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, probabilities TEXT NOT NULL, expires_at REAL)"
+            )
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _remember(self, key, value, expires_at):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_many(self, keys):
+        """
+        Look up keys in memory, then on disk.
+        Returns {key: probabilities} for every hit.
+        """
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+            self.stats["memory_hits"] += len(found)
+
+            remaining = [k for k in dict.fromkeys(keys) if k not in found]
+            if remaining and self.db_path:
+                conn = self._db()
+                for i in range(0, len(remaining), LOOKUP_CHUNK):
+                    chunk = remaining[i:i + LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        "SELECT key, probabilities, expires_at FROM predictions "
+                        f"WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, probabilities, expires_at in rows:
+                        if expires_at is not None and expires_at <= now:
+                            continue
+                        value = json.loads(probabilities)
+                        found[key] = value
+                        self._remember(key, value, expires_at)
+                        self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += sum(1 for k in remaining if k not in found)
+        return found
+
+    def put_many(self, items):
+        """
+        Store {key: probabilities} in both tiers.
+        """
+        if not items:
+            return
+        now = time.time()
+        expires_at = self._expiry(now)
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, list(value), expires_at)
+            if self.db_path:
+                conn = self._db()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                        [(k, json.dumps(list(v)), expires_at) for k, v in items.items()],
+                    )
+                    conn.execute(
+                        "DELETE FROM predictions WHERE expires_at IS NOT NULL "
+                        "AND expires_at <= ?",
+                        (now,),
+                    )
+
+    def clear_memory(self):
+        """
+        Drop the memory tier (the disk tier is keyed by fingerprint and ages out).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        """
+        Counters plus current memory tier size.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
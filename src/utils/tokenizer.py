@@ -1,9 +1,8 @@
 import json
 import os
 import numpy as np
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 from src.utils.helpers import clean_text
+from src.utils.fast_tokenizer import FastTokenizer
 
 
 class TextTokenizer:
@@ -14,8 +13,11 @@ class TextTokenizer:
         """
         self.max_vocab = max_vocab
         self.max_len = max_len
+        from tensorflow.keras.preprocessing.text import Tokenizer
+
         self.tokenizer = Tokenizer(num_words=max_vocab, oov_token="<OOV>")
         self.word_index = {}
+        self._fast = None
 
     def fit(self, texts):
         """
@@ -24,15 +26,22 @@ class TextTokenizer:
         cleaned = [clean_text(t) for t in texts]
         self.tokenizer.fit_on_texts(cleaned)
         self.word_index = self.tokenizer.word_index
+        self._fast = None
+
+    def fast_tokenizer(self):
+        """
+        FastTokenizer with this tokenizer's vocabulary and settings.
+        """
+        if self._fast is None:
+            self._fast = FastTokenizer.from_config(self.tokenizer.get_config(), max_len=self.max_len)
+        return self._fast
 
     def texts_to_sequences(self, texts):
         """
         Convert raw text -> padded integer sequences
         """
-        cleaned = [clean_text(t) for t in texts]
-        seq = self.tokenizer.texts_to_sequences(cleaned)
-        padded = pad_sequences(seq, maxlen=self.max_len, padding="post", truncating="post")
-        return padded
+        # Same ids as Keras texts_to_sequences + pad_sequences(post, post)
+        return self.fast_tokenizer().texts_to_sequences(texts)
 
     def save(self, path="tokenizer.json"):
         """
@@ -57,4 +66,5 @@ class TextTokenizer:
 
         self.tokenizer = tokenizer_from_json(data)
         self.word_index = self.tokenizer.word_index
+        self._fast = None
         print(f"Tokenizer loaded from {path}")
\ No newline at end of file
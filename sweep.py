@@ -0,0 +1,281 @@
+"""
+Hyperparameter sweep over vectorizer and classifier settings.
+
+Each distinct vectorizer config is featurized once (through the feature
+cache train.py uses), its train/test matrices are written as .npy arrays
+and memory-mapped by a process pool that fits every classifier config on
+them. Results are ranked by test accuracy, single-text latency and bundle
+size, and the Pareto-optimal configs are marked.
+
+Usage:
+    python sweep.py
+    python sweep.py --grid sweep_grid.json --jobs 8 --output models/sweep_results.json
+
+Grid file (every value is a list; the sweep runs the cartesian product):
+    {
+      "vectorizer": {"feature_mode": ["vocab"], "word_max_features": [15000, 30000],
+                     "char_max_features": [20000], "hash_buckets": [131072]},
+      "classifier": {"C": [0.5, 1.0, 2.0], "max_iter": [2000]}
+    }
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.utils.helpers import clean_text, load_data
+
+DEFAULT_GRID = {
+    "vectorizer": {
+        "feature_mode": ["vocab"],
+        "word_max_features": [15000, 30000],
+        "char_max_features": [20000, 40000],
+        "hash_buckets": [2 ** 17],
+    },
+    "classifier": {
+        "C": [0.5, 1.0, 2.0],
+        "max_iter": [2000],
+    },
+}
+
+
+def expand(space):
+    """
+    Cartesian product of a {name: [values]} dict as a list of dicts.
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def distinct_vectorizer_configs(configs):
+    """
+    Drop settings that do not apply to the feature mode (vocab sizes for
+    hashed, buckets for vocab) and de-duplicate.
+    """
+    seen, distinct = set(), []
+    for config in configs:
+        config = dict(config)
+        if config.get("feature_mode", "vocab") == "hashed":
+            config.pop("word_max_features", None)
+            config.pop("char_max_features", None)
+        else:
+            config.pop("hash_buckets", None)
+        key = json.dumps(config, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            distinct.append(config)
+    return distinct
+
+
+def _save_csr(directory, name, X):
+    X = X.tocsr()
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(directory, f"{name}_{part}.npy"), getattr(X, part))
+    np.save(os.path.join(directory, f"{name}_shape.npy"), np.array(X.shape))
+
+
+def _load_csr(directory, name):
+    """
+    CSR matrix over memory-mapped arrays: every worker shares the page cache.
+    """
+    from scipy.sparse import csr_matrix
+
+    arrays = [np.load(os.path.join(directory, f"{name}_{part}.npy"), mmap_mode="r")
+              for part in ("data", "indices", "indptr")]
+    shape = tuple(np.load(os.path.join(directory, f"{name}_shape.npy")))
+    return csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def featurize(vectorizer_config, texts, labels, workdir, use_cache=True):
+    """
+    Fit the vectorizer like train.py, split like train.py, and write the
+    train/test matrices and labels under workdir. Returns (vectorizer, dir).
+    """
+    from sklearn.model_selection import train_test_split
+
+    from train import build_features, build_vectorizer
+
+    vectorizer = build_vectorizer(**vectorizer_config)
+    _, vectorizer, X = build_features(texts, vectorizer, use_cache=use_cache,
+                                      info=vectorizer_config)
+    indices = np.arange(X.shape[0])
+    train_idx, test_idx = train_test_split(
+        indices, test_size=0.2, random_state=42, stratify=labels
+    )
+
+    os.makedirs(workdir, exist_ok=True)
+    labels = np.asarray(labels)
+    _save_csr(workdir, "X_train", X[train_idx])
+    _save_csr(workdir, "X_test", X[test_idx])
+    np.save(os.path.join(workdir, "y_train.npy"), labels[train_idx])
+    np.save(os.path.join(workdir, "y_test.npy"), labels[test_idx])
+    np.save(os.path.join(workdir, "test_idx.npy"), test_idx)
+    return vectorizer, workdir
+
+
+def _fit_classifier(task):
+    """
+    Pool worker: fit one classifier config on a shared matrix and return the
+    test accuracy plus the folded LinearScorer parameters.
+    """
+    from sklearn.metrics import accuracy_score
+
+    from src.models.linear_scorer import LinearScorer
+    from train import build_classifier
+
+    workdir, classifier_config = task
+    X_train, X_test = _load_csr(workdir, "X_train"), _load_csr(workdir, "X_test")
+    y_train = np.load(os.path.join(workdir, "y_train.npy"))
+    y_test = np.load(os.path.join(workdir, "y_test.npy"))
+
+    start = time.perf_counter()
+    # One core per task: the pool provides the parallelism
+    model = build_classifier(n_jobs=None, **classifier_config)
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    scorer = LinearScorer.from_model(model)
+    return {
+        "accuracy": float(accuracy_score(y_test, model.predict(X_test))),
+        "fit_seconds": fit_seconds,
+        "scorer": (scorer.coef, scorer.intercept, scorer.platt_a, scorer.platt_b, scorer.classes_),
+    }
+
+
+def measure_latency(scorer, vectorizer, texts, repeats=1):
+    """
+    p50 / p95 milliseconds to clean, vectorize and score one text.
+    """
+    if texts:
+        # First call pays for lazy analyzer/regex setup
+        scorer.predict_proba(vectorizer.transform([clean_text(texts[0])]))
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            scorer.predict_proba(vectorizer.transform([clean_text(text)]))
+            latencies.append((time.perf_counter() - start) * 1000)
+    p50, p95 = np.percentile(latencies, [50, 95])
+    return float(p50), float(p95)
+
+
+def bundle_size_mb(scorer, vectorizer, workdir):
+    from src.models.artifact_bundle import bundle_bytes, export_bundle
+
+    bundle_dir = os.path.join(workdir, "bundle")
+    export_bundle(scorer, vectorizer, bundle_dir)
+    size = bundle_bytes(bundle_dir)
+    shutil.rmtree(bundle_dir, ignore_errors=True)
+    return size / (1024 * 1024)
+
+
+def pareto_front(results):
+    """
+    Mark results no other result beats on accuracy, latency and size at once.
+    """
+    for r in results:
+        r["pareto"] = not any(
+            o is not r
+            and o["accuracy"] >= r["accuracy"]
+            and o["latency_p50_ms"] <= r["latency_p50_ms"]
+            and o["bundle_mb"] <= r["bundle_mb"]
+            and (o["accuracy"], -o["latency_p50_ms"], -o["bundle_mb"])
+            != (r["accuracy"], -r["latency_p50_ms"], -r["bundle_mb"])
+            for o in results
+        )
+    return results
+
+
+def run_sweep(grid, jobs=None, latency_samples=200, use_cache=True, log=print):
+    from src.models.linear_scorer import LinearScorer
+
+    texts, labels = load_data()
+    vectorizer_configs = distinct_vectorizer_configs(expand(grid["vectorizer"]))
+    classifier_configs = expand(grid["classifier"])
+    log(f"[OK] {len(vectorizer_configs)} vectorizer x {len(classifier_configs)} classifier configs")
+
+    root = tempfile.mkdtemp(prefix="sweep_")
+    results = []
+    try:
+        for v, vectorizer_config in enumerate(vectorizer_configs):
+            log(f"\n[vectorizer {v + 1}/{len(vectorizer_configs)}] {vectorizer_config}")
+            vectorizer, workdir = featurize(
+                vectorizer_config, texts, labels, os.path.join(root, f"v{v}"), use_cache
+            )
+
+            tasks = [(workdir, c) for c in classifier_configs]
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                fitted = list(pool.map(_fit_classifier, tasks))
+
+            # Latency and size are measured serially so pool load does not skew them
+            test_idx = np.load(os.path.join(workdir, "test_idx.npy"))
+            sample = [texts[i] for i in test_idx[:latency_samples]]
+            for classifier_config, result in zip(classifier_configs, fitted):
+                scorer = LinearScorer(*result.pop("scorer"))
+                p50, p95 = measure_latency(scorer, vectorizer, sample)
+                result.update(
+                    vectorizer=vectorizer_config,
+                    classifier=classifier_config,
+                    latency_p50_ms=p50,
+                    latency_p95_ms=p95,
+                    bundle_mb=bundle_size_mb(scorer, vectorizer, workdir),
+                )
+                results.append(result)
+                log(f"  {classifier_config}: accuracy {result['accuracy']:.4f}, "
+                    f"p50 {p50:.2f} ms, bundle {result['bundle_mb']:.1f} MB")
+            shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    pareto_front(results)
+    results.sort(key=lambda r: (-r["accuracy"], r["latency_p50_ms"], r["bundle_mb"]))
+    return results
+
+
+def print_ranking(results):
+    print("\n" + "=" * 100)
+    print("SWEEP RESULTS (accuracy desc, then latency, then size; * = Pareto-optimal)")
+    print("=" * 100)
+    print(f"{'#':>3}  {'accuracy':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'bundle MB':>9}  "
+          f"{'fit s':>6}  config")
+    for rank, r in enumerate(results, 1):
+        config = {**r["vectorizer"], **r["classifier"]}
+        print(f"{rank:>3}{'*' if r['pareto'] else ' '} {r['accuracy']:>8.4f}  "
+              f"{r['latency_p50_ms']:>7.2f}  {r['latency_p95_ms']:>7.2f}  "
+              f"{r['bundle_mb']:>9.1f}  {r['fit_seconds']:>6.1f}  {config}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep vectorizer and classifier settings.")
+    parser.add_argument("--grid", help="JSON grid file (default: built-in grid)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for classifier fits (default: all cores)")
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--output", default=os.path.join("models", "sweep_results.json"))
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not read or write the feature cache")
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    results = run_sweep(grid, jobs=args.jobs, latency_samples=args.latency_samples,
+                        use_cache=not args.no_cache)
+    print_ranking(results)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[OK] Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import predict
+from src.models.artifact_bundle import MANIFEST_NAME, export_bundle, load_bundle
+from src.models.artifact_record import record_matches, read_record, write_record
+from src.models.linear_scorer import LinearScorer
+from src.models.registry import ModelRegistry
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+
+TEXTS = ["the cat sat on the mat", "an essay written by a model", "plain human words"]
+
+
+def _artifacts(seed):
+    vectorizer = HashedTfidfVectorizer(n_features=64)
+    vectorizer.fit(TEXTS)
+    coef = np.random.default_rng(seed).standard_normal((1, 128))
+    return LinearScorer(coef, [0.0], [-1.0], [0.0], np.array([0, 1])), vectorizer
+
+
+def _train(seed):
+    # What train.py --streaming writes, record last
+    scorer, vectorizer = _artifacts(seed)
+    vectorizer.save(predict.HASHED_VECTORIZER_PATH)
+    scorer.save(predict.SCORER_PATH)
+    export_bundle(scorer, vectorizer, predict.BUNDLE_DIR)
+    write_record(predict.MODEL_DIR, [
+        predict.HASHED_VECTORIZER_PATH,
+        predict.SCORER_PATH,
+        os.path.join(predict.BUNDLE_DIR, MANIFEST_NAME),
+    ])
+    return scorer
+
+
+def test_bundle_versions_switch_with_the_manifest(tmp_path):
+    bundle_dir = str(tmp_path / "bundle")
+    first, vectorizer = _artifacts(0)
+    second, _ = _artifacts(1)
+    export_bundle(first, vectorizer, bundle_dir)
+    loaded, _ = load_bundle(bundle_dir)
+
+    export_bundle(second, vectorizer, bundle_dir)
+    with open(os.path.join(bundle_dir, MANIFEST_NAME)) as f:
+        data_dir = json.load(f)["data_dir"]
+    assert [e.name for e in os.scandir(bundle_dir) if e.is_dir()] == [data_dir]
+    np.testing.assert_array_equal(load_bundle(bundle_dir)[0].coef, second.coef)
+    # Arrays mapped before the switch stay readable
+    np.testing.assert_array_equal(loaded.coef, first.coef)
+
+
+def test_format_1_bundle_still_loads(tmp_path):
+    bundle_dir = str(tmp_path / "bundle")
+    scorer, vectorizer = _artifacts(0)
+    manifest = export_bundle(scorer, vectorizer, bundle_dir)
+    data_dir = os.path.join(bundle_dir, manifest.pop("data_dir"))
+    for entry in os.scandir(data_dir):
+        shutil.move(entry.path, bundle_dir)
+    os.rmdir(data_dir)
+    manifest["format_version"] = 1
+    with open(os.path.join(bundle_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f)
+
+    np.testing.assert_array_equal(load_bundle(bundle_dir)[0].coef, scorer.coef)
+
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(predict.MODEL_DIR)
+    monkeypatch.setattr(predict, "ARTIFACT_RETRY_SECONDS", 0.05)
+    return tmp_path
+
+
+def test_half_written_artifacts_are_not_loaded(models_dir):
+    _train(0)
+    # A new run has rewritten the scorer but not yet recorded its files
+    _artifacts(1)[0].save(predict.SCORER_PATH)
+    assert not record_matches(predict.MODEL_DIR, read_record(predict.MODEL_DIR))
+    with pytest.raises(RuntimeError, match="do not match"):
+        predict._read_artifacts()
+
+
+def test_load_waits_for_the_run_to_finish(models_dir):
+    _train(0)
+    scorer, vectorizer = _artifacts(1)
+    scorer.save(predict.SCORER_PATH)
+
+    def finish():
+        time.sleep(0.15)
+        export_bundle(scorer, vectorizer, predict.BUNDLE_DIR)
+        write_record(predict.MODEL_DIR, [
+            predict.SCORER_PATH, os.path.join(predict.BUNDLE_DIR, MANIFEST_NAME),
+        ], update=True)
+
+    writer = threading.Thread(target=finish)
+    writer.start()
+    loaded, _ = predict._read_artifacts()
+    writer.join()
+    np.testing.assert_array_equal(loaded.coef, scorer.coef)
+
+
+def test_registry_swaps_only_on_a_new_record(models_dir, monkeypatch):
+    registry = ModelRegistry(check_interval=0)
+    monkeypatch.setattr(predict, "default_registry", lambda: registry)
+    first = _train(0)
+    np.testing.assert_array_equal(predict._load_artifacts()[0].coef, first.coef)
+
+    # Mid-write: the previous version keeps being served
+    _artifacts(1)[0].save(predict.SCORER_PATH)
+    np.testing.assert_array_equal(predict._load_artifacts()[0].coef, first.coef)
+
+    second = _train(2)
+    np.testing.assert_array_equal(predict._load_artifacts()[0].coef, second.coef)
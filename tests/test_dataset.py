@@ -0,0 +1,26 @@
+import os
+
+from src.utils import dataset
+
+
+def test_new_cache_replaces_caches_of_older_contents(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(dataset, "CACHE_DIR", str(cache_dir))
+    csv_path = tmp_path / "data.csv"
+    other_path = tmp_path / "other.csv"
+    other_path.write_text("text,label\nanother file,0\n")
+    dataset.load_columnar(str(other_path))
+
+    csv_path.write_text("text,label\nfirst version,0\n")
+    dataset.load_columnar(str(csv_path))
+    old = dataset.cache_path(str(csv_path))
+
+    csv_path.write_text("text,label\nsecond version,1\nand one more row,0\n")
+    texts, labels, meta = dataset.load_columnar(str(csv_path))
+    assert texts.tolist() == ["second version", "and one more row"]
+
+    assert not os.path.exists(old)
+    caches = sorted(e for e in os.listdir(cache_dir) if os.path.isdir(cache_dir / e))
+    assert caches == sorted(
+        os.path.basename(dataset.cache_path(str(p))) for p in (csv_path, other_path)
+    )
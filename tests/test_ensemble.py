@@ -0,0 +1,52 @@
+import gc
+import weakref
+
+import numpy as np
+
+from src.models.ensemble import EnsembleModel
+from src.models.registry import ModelRegistry
+
+
+class _Member:
+    def __init__(self, path):
+        self.path = path
+
+    def predict(self, X, verbose=0):
+        return np.tile([0.25, 0.75], (len(X), 1))
+
+
+class _FusedGraph:
+    def __init__(self, models):
+        self.models = models
+
+    def predict(self, X, verbose=0):
+        return [m.predict(X) for m in self.models]
+
+
+def test_fused_ensembles_stay_within_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(EnsembleModel, "_build_fused", staticmethod(_FusedGraph))
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"member{i}.h5"
+        path.write_bytes(b"\0" * 300 * 1024)
+        paths.append(str(path))
+
+    registry = ModelRegistry(memory_budget_mb=1, log=lambda message: None)
+    first = EnsembleModel(paths[:2], loader=_Member, registry=registry, fused=True)
+    second = EnsembleModel(paths[2:], loader=_Member, registry=registry, fused=True)
+    X = np.zeros((3, 2))
+
+    assert first.predict(X).shape == (3, 2)
+    graph = weakref.ref(registry.get(first.fused_name))
+    members = [weakref.ref(m) for m in graph().models]
+    second.predict(X)
+
+    resident = registry.resident()
+    assert list(resident) == [second.fused_name]
+    assert sum(resident.values()) <= registry.max_bytes
+    # The evicted graph and its members are actually released
+    gc.collect()
+    assert graph() is None and all(m() is None for m in members)
+
+    # And rebuilt on the next call
+    assert first.predict(X).shape == (3, 2)
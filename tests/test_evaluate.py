@@ -0,0 +1,35 @@
+import os
+import pickle
+
+import numpy as np
+
+import predict
+from evaluate import ProductionEvaluator
+from src.models.linear_scorer import LinearScorer
+from src.models.registry import ModelRegistry
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+
+
+def test_production_evaluator_scores_what_predict_serves(tmp_path, monkeypatch):
+    # A stale vocabulary pickle next to newer streaming (hashed) artifacts
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(predict, "default_registry", lambda registry=ModelRegistry(): registry)
+    os.makedirs("models")
+    with open(predict.MODEL_PATH, "wb") as f:
+        pickle.dump({"stale": True}, f)
+    os.utime(predict.MODEL_PATH, (1, 1))
+
+    texts = ["the cat sat on the mat", "an essay written by a model", "plain human words"]
+    vectorizer = HashedTfidfVectorizer(n_features=64)
+    vectorizer.fit(texts)
+    vectorizer.save(predict.HASHED_VECTORIZER_PATH)
+    coef = np.random.default_rng(0).standard_normal((1, 128))
+    LinearScorer(coef, [0.0], [-1.0], [0.0], np.array([0, 1])).save(predict.SCORER_PATH)
+
+    evaluator = ProductionEvaluator()
+    served_model, served_vectorizer = predict._load_artifacts()
+    assert isinstance(evaluator.model, LinearScorer)
+    np.testing.assert_array_equal(
+        evaluator.predict(texts),
+        served_model.predict(served_vectorizer.transform(texts)),
+    )
@@ -0,0 +1,29 @@
+import os
+import time
+
+import pytest
+
+from src.utils import extraction
+
+
+def test_timeout_recycles_only_the_timed_out_worker():
+    pool = extraction._WorkerPool(2)
+    deadline = time.monotonic() + 30
+    # Start both workers, then keep one busy past a short deadline
+    first, second = [pool.submit(os.getpid, (), deadline) for _ in range(2)]
+    pids = {first.result(), second.result()}
+    slow = pool.submit(time.sleep, (30,), time.monotonic() + 1)
+    fast = [pool.submit(os.getpid, (), deadline) for _ in range(3)]
+
+    with pytest.raises(TimeoutError):
+        slow.result(timeout=10)
+    assert {f.result(timeout=10) for f in fast} <= pids
+    # The killed worker was replaced; the other one kept serving
+    after = {pool.submit(os.getpid, (), deadline).result(timeout=30) for _ in range(4)}
+    assert after and len(after | pids) <= 3
+
+
+def test_task_errors_are_reported():
+    pool = extraction._WorkerPool(1)
+    with pytest.raises(RuntimeError, match="not found"):
+        pool.submit(extraction._docx_text, ("/nonexistent.docx",), time.monotonic() + 30).result()
@@ -0,0 +1,19 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from src.models.incremental import calibrate
+from src.models.linear_scorer import LinearScorer
+
+
+def test_calibrate_keeps_the_fitted_classifier():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((400, 5))
+    y = (X[:, 0] + rng.standard_normal(400) > 0).astype(int)
+    model = LogisticRegression().fit(X[:200], y[:200])
+    coef = model.coef_.copy()
+
+    calibrated = calibrate(model, X[200:], y[200:])
+    assert len(calibrated.calibrated_classifiers_) == 1
+    np.testing.assert_array_equal(model.coef_, coef)
+    scorer = LinearScorer.from_model(calibrated)
+    np.testing.assert_allclose(scorer.predict_proba(X), calibrated.predict_proba(X))
@@ -0,0 +1,39 @@
+import glob
+import io
+import os
+
+import pytest
+
+from conftest import ROOT
+
+
+def _undefined_names(path):
+    from pyflakes.api import checkPath
+    from pyflakes.reporter import Reporter
+
+    out = io.StringIO()
+    checkPath(path, Reporter(out, out))
+    return [line for line in out.getvalue().splitlines() if "undefined name" in line]
+
+
+def test_no_undefined_names():
+    pytest.importorskip("pyflakes")
+    paths = [
+        p for p in glob.glob(os.path.join(ROOT, "**", "*.py"), recursive=True)
+        if f"{os.sep}notebooks{os.sep}" not in p
+    ]
+    problems = [msg for path in paths for msg in _undefined_names(path)]
+    assert problems == []
+
+
+@pytest.mark.parametrize("builder", ["lstm", "neural_net"])
+def test_model_builds_and_compiles(builder):
+    pytest.importorskip("tensorflow")
+    if builder == "lstm":
+        from src.models.lstm_model import build_lstm_model as build
+    else:
+        from src.models.neural_net import build_neural_net as build
+
+    model = build(vocab_size=100, embedding_dim=8, max_length=20, num_classes=2)
+    assert model.optimizer is not None
+    assert model.output_shape[-1] == 2
@@ -0,0 +1,53 @@
+import numpy as np
+
+import predict
+from src.utils.prediction_cache import LOOKUP_CHUNK, PredictionCache
+
+
+def test_disk_lookup_of_many_keys(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    keys = [f"key-{i}" for i in range(4 * LOOKUP_CHUNK + 7)]
+    PredictionCache(0, None, db_path).put_many({k: [0.25, 0.75] for k in keys})
+
+    cache = PredictionCache(0, None, db_path)
+    found = cache.get_many(keys + ["absent"])
+    assert set(found) == set(keys)
+    assert cache.stats["disk_hits"] == len(keys) and cache.stats["misses"] == 1
+
+
+class _Registry:
+    def __init__(self, model, vectorizer, version):
+        self.current = ((model, vectorizer), version)
+
+    def __contains__(self, name):
+        return True
+
+    def get_versioned(self, name):
+        return self.current
+
+
+class _Vectorizer:
+    def transform(self, texts):
+        return np.zeros((len(texts), 1))
+
+
+class _SwappingModel:
+    """
+    Model whose scoring overlaps another thread swapping in version v2.
+    """
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, X):
+        predict._fingerprint = "v2"
+        return np.tile([0.5, 0.5], (X.shape[0], 1))
+
+
+def test_cache_keys_use_the_scoring_model_version(monkeypatch):
+    cache = PredictionCache(100, None, None)
+    monkeypatch.setattr(predict, "_cache", cache)
+    monkeypatch.setattr(predict, "_fingerprint", "v1")
+    registry = _Registry(_SwappingModel(), _Vectorizer(), "v1")
+    monkeypatch.setattr(predict, "default_registry", lambda: registry)
+
+    predict._predict_probabilities(["some text"])
+    assert list(cache._entries) == [predict._cache_key("some text", "v1")]
@@ -0,0 +1,25 @@
+from src.models.registry import ModelRegistry
+
+
+def test_disk_is_checked_once_per_interval(tmp_path):
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"v1")
+    listed = []
+
+    def paths():
+        listed.append(1)
+        return [str(path)]
+
+    registry = ModelRegistry(check_interval=60)
+    registry.register("model", lambda: path.read_bytes(), paths)
+    assert registry.get("model") == b"v1"
+    calls = len(listed)
+
+    path.write_bytes(b"v2-longer")
+    for _ in range(100):
+        assert registry.get("model") == b"v1"
+    assert len(listed) == calls
+
+    # Once the interval is over, the change is picked up
+    registry.check_interval = 0
+    assert registry.get("model") == b"v2-longer"
@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+from predict import score_file
+
+
+@pytest.mark.parametrize("name, content", [("empty.csv", "text\n"), ("empty.jsonl", "")])
+def test_empty_input(tmp_path, name, content):
+    input_path = tmp_path / name
+    input_path.write_text(content)
+    output_path = str(tmp_path / "scores.jsonl")
+
+    stats = score_file(str(input_path), output_path, workers=0)
+    assert stats["records"] == 0
+    assert not os.path.exists(f"{output_path}.ckpt")
+    # Re-running over the finished output is a no-op as well
+    assert score_file(str(input_path), output_path, workers=0)["records"] == 0
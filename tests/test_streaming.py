@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from src.models.streaming import CALIBRATION, StreamingTrainer
+
+
+def test_platt_scaling_on_the_calibration_stream(tmp_path):
+    rng = np.random.default_rng(0)
+    human = ["the weather was nice so we walked to the old harbour and ate fish"]
+    ai = ["furthermore it is important to note that this comprehensive overview delves"]
+    labels = rng.integers(0, 2, 600)
+    texts = [(ai if y else human)[0] + f" note {rng.integers(50)}" for y in labels]
+    # Some label noise so the calibrated probabilities are not all 0 or 1
+    noisy = np.where(rng.random(600) < 0.2, 1 - labels, labels)
+    csv_path = tmp_path / "data.csv"
+    pd.DataFrame({"text": texts, "label": noisy}).to_csv(csv_path, index=False)
+
+    trainer = StreamingTrainer(str(csv_path), hash_buckets=2 ** 10, chunk_size=200,
+                               epochs=2, use_cache=False).fit(log=lambda message: None)
+    scorer = trainer.scorer
+    # Positive class probability rises with the classifier's score
+    assert scorer.platt_a[0] < 0
+
+    cal_texts, cal_labels = zip(*trainer._chunks(CALIBRATION))
+    X = trainer.vectorizer.transform([t for chunk in cal_texts for t in chunk])
+    probabilities = scorer.predict_proba(X)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1)
+    # A fitted logistic regression's mean probability equals the positive rate
+    assert abs(probabilities[:, 1].mean() - np.concatenate(cal_labels).mean()) < 1e-3
@@ -0,0 +1,18 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.preprocessing.feature_engineering import FeatureEngineer
+from src.preprocessing.style_features import basic_features_batch
+
+
+@pytest.mark.parametrize("texts", [
+    ["Plain text. Two sentences!", "", "digits 123 and ²³ and ٣", "aa  bb..."],
+    # Lone surrogates, as json.loads produces from "\ud800" escapes
+    [json.loads('"broken \\ud800 pair. and \\udfff!!"'), "\ud83d\ud83d", "ok?"],
+])
+def test_batch_matches_per_text_features(texts):
+    engineer = FeatureEngineer()
+    expected = np.array([engineer.basic_features(t) for t in texts], dtype=float)
+    np.testing.assert_allclose(basic_features_batch(texts), expected)
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from web_app import app  # noqa: E402
+
+
+@pytest.mark.parametrize("known", [5, "abc", {"a": 1}, [[1]], ["ok", 2]])
+def test_analyze_rejects_malformed_known_sentences(known):
+    response = app.test_client().post(
+        "/api/analyze",
+        json={"text": "This is a long enough text to analyze.", "known_sentences": known},
+    )
+    assert response.status_code == 400
+    assert "known_sentences" in response.get_json()["error"]
+
+
+TEXT = "The first sentence is here. The second one follows it. A third closes."
+
+
+class _Model:
+    """
+    Stands in for predict: serves `version`, optionally swapping to
+    `swap_to` during the next scoring call.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.swap_to = None
+        self.scored = []
+
+    def model_version(self):
+        return self.version
+
+    def get_detailed_predictions(self, texts, stats=None, cleaned=None):
+        if self.swap_to:
+            self.version, self.swap_to = self.swap_to, None
+        stats["fingerprint"] = self.version
+        self.scored.append(len(texts) - 1)
+        return [{
+            "prediction": "Human", "confidence": 90.0, "human_probability": 90.0,
+            "ai_probability": 10.0, "word_count": 5, "warning": None, "needs_review": False,
+        } for _ in texts]
+
+
+def _analyze(known=()):
+    response = app.test_client().post(
+        "/api/analyze", json={"text": TEXT, "known_sentences": list(known)}
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    import web_app
+
+    model = _Model("v1")
+    monkeypatch.setattr(web_app, "model_version", model.model_version)
+    monkeypatch.setattr(web_app, "get_detailed_predictions", model.get_detailed_predictions)
+    return model
+
+
+def test_sentences_are_reused_for_the_same_model(model):
+    first = _analyze()
+    second = _analyze(s["hash"] for s in first["sentences"])
+    assert second["incremental"]["scored"] == 0
+    assert all(s["reused"] for s in second["sentences"])
+
+
+def test_sentences_are_rescored_after_a_model_swap(model):
+    hashes = [s["hash"] for s in _analyze()["sentences"]]
+    model.version = "v2"
+    after = _analyze(hashes)
+    assert after["incremental"]["reused"] == 0
+    assert not any(s.get("reused") for s in after["sentences"])
+
+
+def test_swap_while_scoring_rescores_every_sentence(model):
+    first = _analyze()
+    model.swap_to = "v2"
+    after = _analyze(s["hash"] for s in first["sentences"])
+    assert after["model_version"] == "v2"
+    assert model.scored[-1] == len(first["sentences"])
+    assert not any(s.get("reused") for s in after["sentences"])
@@ -1,4 +1,6 @@
 import os
+import json
+import argparse
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -8,73 +10,220 @@ from sklearn.pipeline import FeatureUnion
 from sklearn.metrics import accuracy_score, classification_report
 import pickle
 
-from src.utils.helpers import load_data, clean_text
+from src.utils.helpers import DATASET_PATH, load_data, clean_text
+from src.utils.dataset import file_sha256
+from src.utils.feature_cache import FeatureCache, feature_cache_key
+from src.utils.instrumentation import RunRecorder, timed_stratified_kfold
+from src.models.artifact_bundle import MANIFEST_NAME, export_bundle
+from src.models.artifact_record import write_record
+from src.models.linear_scorer import export_linear_scorer
+from src.preprocessing.hashed_vectorizer import HashedTfidfVectorizer
+from src.preprocessing.parallel_featurize import parallel_transform
+from src.models.streaming import StreamingTrainer
+from src.models.incremental import (
+    IncrementalState, block_sizes, calibrate, reweight, warm_start_classifier,
+)
 
 
 MODEL_DIR = "models"
 os.makedirs(MODEL_DIR, exist_ok=True)
 
+FEATURE_MODES = ("vocab", "hashed")
+DEFAULT_HASH_BUCKETS = 2 ** 17
+DEFAULT_WORD_FEATURES = 15000
+DEFAULT_CHAR_FEATURES = 20000
+DEFAULT_C = 1.0
+CALIBRATION_FOLDS = 3
+REPORT_PATH = os.path.join(MODEL_DIR, "train_report.json")
+INCREMENTAL_STATE_PATH = os.path.join(MODEL_DIR, "incremental_state.npz")
+INCREMENTAL_REPORT_PATH = os.path.join(MODEL_DIR, "incremental_report.json")
+INCREMENTAL_CALIBRATION_SIZE = 0.2
 
 
-def train():
-    print("="*60)
-    print("FULL TRAINING MODE - ALL DATA")
-    print("="*60)
-    
-    print("\n[1/4] Loading dataset...")
-    texts, labels = load_data()
-    
-    print(f"[OK] Dataset loaded: {len(texts)} samples")
-    
-    print("\n[2/4] Cleaning texts...")
-    texts_clean = [clean_text(t) for t in texts]
-    print("[OK] Texts cleaned")
-    
-    print("\n[3/4] Converting to TF-IDF features...")
-    print("  This may take 1-2 minutes...")
+def build_vectorizer(feature_mode="vocab", hash_buckets=DEFAULT_HASH_BUCKETS,
+                     word_max_features=DEFAULT_WORD_FEATURES,
+                     char_max_features=DEFAULT_CHAR_FEATURES):
+    """
+    vocab  = FeatureUnion of vocabulary-backed word/char TfidfVectorizers
+             (word_max_features / char_max_features terms)
+    hashed = HashedTfidfVectorizer with a fixed number of buckets per block
+    """
+    if feature_mode == "hashed":
+        return HashedTfidfVectorizer(n_features=hash_buckets)
+    if feature_mode != "vocab":
+        raise ValueError(f"Unknown feature mode: {feature_mode}")
+
     word_vectorizer = TfidfVectorizer(
-        max_features=15000,
+        max_features=word_max_features,
         ngram_range=(1, 3),
         analyzer="word",
     )
     char_vectorizer = TfidfVectorizer(
-        max_features=20000,
+        max_features=char_max_features,
         ngram_range=(3, 5),
         analyzer="char_wb",
     )
-    vectorizer = FeatureUnion(
+    return FeatureUnion(
         [
             ("word_tfidf", word_vectorizer),
             ("char_tfidf", char_vectorizer),
         ]
     )
-    X = vectorizer.fit_transform(texts_clean)
+
+
+def build_classifier(C=DEFAULT_C, max_iter=2000, class_weight="balanced", n_jobs=-1):
+    """
+    Sigmoid-calibrated (3-fold) LogisticRegression, as trained for production.
+    """
+    base_model = LogisticRegression(
+        C=C, max_iter=max_iter, random_state=42, n_jobs=n_jobs, class_weight=class_weight
+    )
+    return CalibratedClassifierCV(base_model, method="sigmoid", cv=CALIBRATION_FOLDS)
+
+
+def save_vectorizer(vectorizer, feature_mode):
+    """
+    Save the fitted vectorizer where predict._load_artifacts looks for it.
+    Returns the path written.
+    """
+    if feature_mode == "hashed":
+        path = f"{MODEL_DIR}/vectorizer_hashed.npz"
+        vectorizer.save(path)
+    else:
+        path = f"{MODEL_DIR}/vectorizer_full.pkl"
+        with open(path, "wb") as f:
+            pickle.dump(vectorizer, f)
+    return path
+
+
+def load_vectorizer(feature_mode):
+    """
+    Load the fitted vectorizer written by save_vectorizer.
+    """
+    if feature_mode == "hashed":
+        return HashedTfidfVectorizer.load(f"{MODEL_DIR}/vectorizer_hashed.npz")
+    path = f"{MODEL_DIR}/vectorizer_full.pkl"
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Vectorizer not found at: {path}. Run a full train.py first.")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def build_features(texts, vectorizer, jobs=1, use_cache=True, info=None, recorder=None):
+    """
+    Steps 2-3 of training: clean texts, fit the vectorizer on all of them and
+    build X, or load all three from the feature cache. Stages are recorded
+    on recorder when given.
+    Returns (cleaned texts, fitted vectorizer, X).
+    """
+    recorder = recorder or RunRecorder("features")
+    cache = FeatureCache() if use_cache else None
+    with recorder.stage("feature_cache_lookup", enabled=cache is not None) as stage:
+        cache_key = feature_cache_key(file_sha256(DATASET_PATH), vectorizer) if cache else None
+        cached = cache.load(cache_key) if cache else None
+        stage["hit"] = cached is not None
+
+    if cached is not None:
+        print(f"\n[2/4] Cleaning texts... skipped (feature cache {cache_key[:12]})")
+        print("\n[3/4] Converting to TF-IDF features... skipped")
+        texts_clean, vectorizer, X = cached
+        print(f"[OK] Features loaded from cache: {X.shape}")
+        return texts_clean, vectorizer, X
+
+    print("\n[2/4] Cleaning texts...")
+    with recorder.stage("clean", rows=len(texts)):
+        texts_clean = [clean_text(t) for t in texts]
+    print("[OK] Texts cleaned")
+
+    print("\n[3/4] Converting to TF-IDF features...")
+    print("  This may take 1-2 minutes...")
+    if jobs == 1:
+        with recorder.stage("tfidf_fit_transform"):
+            X = vectorizer.fit_transform(texts_clean)
+    else:
+        # Vocabulary/IDF fit needs the whole corpus; the transform is per row
+        with recorder.stage("tfidf_fit"):
+            vectorizer.fit(texts_clean)
+        with recorder.stage("tfidf_transform", jobs=jobs):
+            X = parallel_transform(vectorizer, texts_clean, n_jobs=jobs)
     print(f"[OK] Features created: {X.shape}")
+    if cache is not None:
+        with recorder.stage("feature_cache_store") as stage:
+            size = cache.store(cache_key, texts_clean, vectorizer, X, info=info)
+            stage["mb"] = round(size / (1024 * 1024), 2)
+        print(f"[OK] Features cached ({size / (1024 * 1024):.1f} MB, key {cache_key[:12]})")
+    return texts_clean, vectorizer, X
+
+
+def print_stage_summary(recorder):
+    print("\nStage timings:")
+    for stage in recorder.report()["stages"]:
+        indent = "    " if stage["parent"] else "  "
+        print(f"{indent}- {stage['name']:<24} {stage['wall_s']:>8.2f}s wall "
+              f"{stage['cpu_s']:>8.2f}s cpu {stage['rss_peak_mb']:>9.1f} MB peak")
+
+
+def train(feature_mode="vocab", hash_buckets=DEFAULT_HASH_BUCKETS, jobs=1, use_cache=True,
+          word_max_features=DEFAULT_WORD_FEATURES, char_max_features=DEFAULT_CHAR_FEATURES,
+          C=DEFAULT_C):
+    print("="*60)
+    print("FULL TRAINING MODE - ALL DATA")
+    print("="*60)
+    print(f"Feature mode: {feature_mode}")
+    recorder = RunRecorder("train")
+    recorder.annotate(feature_mode=feature_mode, jobs=jobs, feature_cache=use_cache, C=C)
     
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, labels, test_size=0.2, random_state=42, stratify=labels
+    print("\n[1/4] Loading dataset...")
+    with recorder.stage("load"):
+        texts, labels = load_data()
+    
+    print(f"[OK] Dataset loaded: {len(texts)} samples")
+    
+    vectorizer_config = {
+        "feature_mode": feature_mode,
+        "hash_buckets": hash_buckets,
+        "word_max_features": word_max_features,
+        "char_max_features": char_max_features,
+    }
+    vectorizer = build_vectorizer(**vectorizer_config)
+    data_sha256 = file_sha256(DATASET_PATH)
+    features_key = feature_cache_key(data_sha256, vectorizer) if use_cache else None
+    texts_clean, vectorizer, X = build_features(
+        texts, vectorizer, jobs=jobs, use_cache=use_cache,
+        info={"feature_mode": feature_mode, "hash_buckets": hash_buckets},
+        recorder=recorder,
     )
+    recorder.annotate(rows=len(texts), n_features=X.shape[1], nnz=int(X.nnz),
+                      dataset_bytes=os.path.getsize(DATASET_PATH))
+    
+    # Split data
+    with recorder.stage("split"):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, labels, test_size=0.2, random_state=42, stratify=labels
+        )
     
     print(f"  - Training samples: {len(y_train)}")
     print(f"  - Test samples: {len(y_test)}")
     
     print("\n[4/4] Training Logistic Regression model...")
     print("  This may take 2-3 minutes...")
-    base_model = LogisticRegression(
-        max_iter=2000, random_state=42, n_jobs=-1, class_weight="balanced"
-    )
-    model = CalibratedClassifierCV(base_model, method="sigmoid", cv=3)
-    model.fit(X_train, y_train)
+    model = build_classifier(C=C)
+    # Same folds as cv=3, but each one is timed as it is consumed
+    model.cv = timed_stratified_kfold(recorder, CALIBRATION_FOLDS)
+    with recorder.stage("fit", rows=len(y_train)):
+        model.fit(X_train, y_train)
+    model.cv = CALIBRATION_FOLDS
     print("[OK] Model trained and calibrated!")
     
     # Evaluate
     print("\nEvaluating model...")
-    y_pred_train = model.predict(X_train)
-    y_pred_test = model.predict(X_test)
+    with recorder.stage("evaluate", rows=len(y_train) + len(y_test)):
+        y_pred_train = model.predict(X_train)
+        y_pred_test = model.predict(X_test)
     
     train_accuracy = accuracy_score(y_train, y_pred_train)
     test_accuracy = accuracy_score(y_test, y_pred_test)
+    recorder.annotate(train_accuracy=float(train_accuracy), test_accuracy=float(test_accuracy))
     
     print("\n" + "="*60)
     print("[OK] TRAINING COMPLETED SUCCESSFULLY!")
@@ -91,17 +240,345 @@ def train():
     
     # Save model
     print(f"\nSaving model to {MODEL_DIR}/...")
-    with open(f"{MODEL_DIR}/logistic_model_full.pkl", "wb") as f:
-        pickle.dump(model, f)
-    with open(f"{MODEL_DIR}/vectorizer_full.pkl", "wb") as f:
-        pickle.dump(vectorizer, f)
+    with recorder.stage("save"):
+        with open(f"{MODEL_DIR}/logistic_model_full.pkl", "wb") as f:
+            pickle.dump(model, f)
+        vectorizer_path = save_vectorizer(vectorizer, feature_mode)
+    
+        # Fold the calibrated folds into one compact scorer (checked on the test set)
+        export_linear_scorer(model, f"{MODEL_DIR}/linear_scorer.npz", X=X_test)
+        # Memory-mapped bundle that predict.py prefers at startup
+        export_bundle(model, vectorizer, f"{MODEL_DIR}/bundle")
+        # Starting point for train.py --incremental
+        IncrementalState.from_features(
+            X, DATASET_PATH, data_sha256, features_key, vectorizer_config
+        ).save(INCREMENTAL_STATE_PATH)
+        # Last: predict.py swaps to the new files once they are all recorded
+        write_record(MODEL_DIR, [
+            f"{MODEL_DIR}/logistic_model_full.pkl",
+            vectorizer_path,
+            f"{MODEL_DIR}/linear_scorer.npz",
+            f"{MODEL_DIR}/bundle/{MANIFEST_NAME}",
+        ])
+    recorder.save(REPORT_PATH)
     
     print(f"[OK] Model saved to {MODEL_DIR}/logistic_model_full.pkl")
-    print(f"[OK] Vectorizer saved to {MODEL_DIR}/vectorizer_full.pkl")
+    print(f"[OK] Vectorizer saved to {vectorizer_path}")
+    print(f"[OK] Linear scorer saved to {MODEL_DIR}/linear_scorer.npz")
+    print(f"[OK] Artifact bundle saved to {MODEL_DIR}/bundle/")
+    print(f"[OK] Run report saved to {REPORT_PATH}")
+    print_stage_summary(recorder)
     print("\n" + "="*60)
     print("PRODUCTION MODEL READY!")
     print("="*60)
 
 
+def train_streaming(hash_buckets=DEFAULT_HASH_BUCKETS, epochs=5, chunk_size=20000,
+                    compare=False, use_cache=True):
+    """
+    Out-of-core training (src/models/streaming.py): hashed features per chunk,
+    SGD partial_fit epochs and Platt calibration on a held-out stream.
+    Writes the hashed vectorizer, linear scorer and bundle predict.py loads.
+    """
+    import time
+
+    print("="*60)
+    print("STREAMING TRAINING MODE")
+    print("="*60)
+    print(f"Hash buckets: {hash_buckets} | epochs: {epochs} | chunk size: {chunk_size}")
+
+    trainer = StreamingTrainer(
+        DATASET_PATH,
+        hash_buckets=hash_buckets,
+        chunk_size=chunk_size,
+        epochs=epochs,
+        use_cache=use_cache,
+    )
+    start = time.perf_counter()
+    trainer.fit()
+    streaming_seconds = time.perf_counter() - start
+
+    y_test, y_pred = trainer.evaluate()
+    test_accuracy = accuracy_score(y_test, y_pred)
+    print("\nResults:")
+    print(f"  - Test samples: {len(y_test)}")
+    print(f"  - Test Accuracy: {test_accuracy:.4f} ({test_accuracy*100:.2f}%)")
+    print("\nDetailed Test Set Results:")
+    print(classification_report(y_test, y_pred, target_names=['Human', 'AI']))
+
+    if compare:
+        # Same training rows and features, held in memory, trained like train()
+        print("\nTraining the in-memory model on the same rows for comparison...")
+        texts, labels = trainer.training_rows()
+        start = time.perf_counter()
+        vectorizer = HashedTfidfVectorizer(n_features=hash_buckets)
+        model = CalibratedClassifierCV(
+            LogisticRegression(max_iter=2000, random_state=42, class_weight="balanced"),
+            method="sigmoid",
+            cv=3,
+        )
+        model.fit(vectorizer.fit_transform(texts), labels)
+        memory_seconds = time.perf_counter() - start
+        memory_accuracy = accuracy_score(*trainer.evaluate(model, vectorizer))
+
+        print(f"\n  {'model':<28}{'test accuracy':>15}{'fit seconds':>13}")
+        print(f"  {'streaming SGD + Platt':<28}{test_accuracy:>15.4f}{streaming_seconds:>13.1f}")
+        print(f"  {'in-memory calibrated LR':<28}{memory_accuracy:>15.4f}{memory_seconds:>13.1f}")
+        print(f"  Accuracy difference: {test_accuracy - memory_accuracy:+.4f} "
+              f"on {len(labels)} training rows")
+
+    print(f"\nSaving model to {MODEL_DIR}/...")
+    if os.path.exists(INCREMENTAL_STATE_PATH):
+        # Incremental retraining continues from in-memory runs only
+        os.remove(INCREMENTAL_STATE_PATH)
+    trainer.vectorizer.save(f"{MODEL_DIR}/vectorizer_hashed.npz")
+    trainer.scorer.save(f"{MODEL_DIR}/linear_scorer.npz")
+    export_bundle(trainer.scorer, trainer.vectorizer, f"{MODEL_DIR}/bundle")
+    write_record(MODEL_DIR, [
+        f"{MODEL_DIR}/vectorizer_hashed.npz",
+        f"{MODEL_DIR}/linear_scorer.npz",
+        f"{MODEL_DIR}/bundle/{MANIFEST_NAME}",
+    ])
+    print(f"[OK] Vectorizer saved to {MODEL_DIR}/vectorizer_hashed.npz")
+    print(f"[OK] Linear scorer saved to {MODEL_DIR}/linear_scorer.npz")
+    print(f"[OK] Artifact bundle saved to {MODEL_DIR}/bundle/")
+
+
+def train_incremental(compare=False, use_cache=True, C=DEFAULT_C):
+    """
+    Retrain after rows were appended to the dataset. The fitted vocabulary
+    is kept and its IDF updated with the new rows' document frequencies;
+    only the new rows are featurized (earlier rows are re-weighted from the
+    feature cache). The LR is warm-started from the previous model's
+    averaged fold coefficients and calibrated on a held-out slice.
+    compare=True also runs a full retrain on the same split.
+    """
+    import hashlib
+    import time
+
+    import scipy.sparse as sp
+    from src.models.linear_scorer import LinearScorer
+
+    print("="*60)
+    print("INCREMENTAL TRAINING MODE")
+    print("="*60)
+    recorder = RunRecorder("incremental")
+    start = time.perf_counter()
+
+    state = IncrementalState.load(INCREMENTAL_STATE_PATH)
+    feature_mode = state.config["feature_mode"]
+    with recorder.stage("check_append"):
+        appended = state.appended_bytes(DATASET_PATH)
+    if not appended:
+        print(f"[OK] Nothing appended to {DATASET_PATH} since the last run; model unchanged.")
+        return
+
+    print("\n[1/4] Loading dataset...")
+    with recorder.stage("load"):
+        texts, labels = load_data()
+    labels = np.asarray(labels)
+    n_old = state.rows
+    n_new = len(texts) - n_old
+    if n_new <= 0:
+        raise ValueError(f"Expected more than {n_old} rows after appending, found {len(texts)}.")
+    print(f"[OK] Dataset loaded: {len(texts)} samples ({n_new} new)")
+
+    vectorizer = load_vectorizer(feature_mode)
+    previous = LinearScorer.load(f"{MODEL_DIR}/linear_scorer.npz")
+
+    print("\n[2/4] Cleaning new texts...")
+    with recorder.stage("clean", rows=n_new):
+        new_clean = [clean_text(texts[i]) for i in range(n_old, len(texts))]
+    print("[OK] Texts cleaned")
+
+    print("\n[3/4] Updating IDF and TF-IDF features...")
+    cache = FeatureCache() if use_cache else None
+    with recorder.stage("feature_cache_lookup") as stage:
+        cached = cache.load(state.features_key) if cache and state.features_key else None
+        stage["hit"] = cached is not None
+    with recorder.stage("transform_new", rows=n_new):
+        X_new = vectorizer.transform(new_clean)
+    if cached is not None and cached[2].shape[0] == n_old:
+        old_clean, _, X_old = cached
+    else:
+        print("  Earlier features not cached: transforming them with the stored vocabulary")
+        with recorder.stage("transform_old", rows=n_old):
+            old_clean = [clean_text(texts[i]) for i in range(n_old)]
+            X_old = vectorizer.transform(old_clean)
+    with recorder.stage("idf_update"):
+        X_before = sp.vstack([X_old, X_new], format="csr")
+        old_idf, new_idf = state.update_idf(vectorizer, X_new)
+        X = reweight(X_before, new_idf / old_idf, block_sizes(vectorizer))
+    print(f"[OK] Features updated: {X.shape}")
+
+    # Same test rows as a full retrain; the calibration slice comes out of training
+    train_idx, test_idx = train_test_split(
+        np.arange(len(labels)), test_size=0.2, random_state=42, stratify=labels
+    )
+    fit_idx, calibration_idx = train_test_split(
+        train_idx, test_size=INCREMENTAL_CALIBRATION_SIZE, random_state=42,
+        stratify=labels[train_idx],
+    )
+
+    print("\n[4/4] Warm-starting Logistic Regression...")
+    with recorder.stage("fit", rows=len(fit_idx)) as stage:
+        classifier = warm_start_classifier(previous, X[fit_idx], labels[fit_idx], C=C)
+        stage["iterations"] = int(np.max(classifier.n_iter_))
+    with recorder.stage("calibrate", rows=len(calibration_idx)):
+        model = calibrate(classifier, X[calibration_idx], labels[calibration_idx])
+    print(f"[OK] Model trained in {stage['iterations']} iterations and calibrated!")
+
+    with recorder.stage("evaluate", rows=len(test_idx)):
+        y_test = labels[test_idx]
+        y_pred_test = model.predict(X[test_idx])
+        test_accuracy = accuracy_score(y_test, y_pred_test)
+        # The previous model on its own features, before any retraining
+        previous_accuracy = accuracy_score(y_test, previous.predict(X_before[test_idx]))
+
+    print(f"\nSaving model to {MODEL_DIR}/...")
+    with recorder.stage("save"):
+        with open(f"{MODEL_DIR}/logistic_model_full.pkl", "wb") as f:
+            pickle.dump(model, f)
+        vectorizer_path = save_vectorizer(vectorizer, feature_mode)
+        export_linear_scorer(model, f"{MODEL_DIR}/linear_scorer.npz", X=X[test_idx])
+        export_bundle(model, vectorizer, f"{MODEL_DIR}/bundle")
+        write_record(MODEL_DIR, [
+            f"{MODEL_DIR}/logistic_model_full.pkl",
+            vectorizer_path,
+            f"{MODEL_DIR}/linear_scorer.npz",
+            f"{MODEL_DIR}/bundle/{MANIFEST_NAME}",
+        ])
+
+        data_sha256 = file_sha256(DATASET_PATH)
+        features_key = None
+        if cache is not None:
+            # Not a full-fit entry, so it must not share train()'s key
+            features_key = hashlib.sha256(
+                f"{state.features_key}:{data_sha256}".encode()
+            ).hexdigest()[:32]
+            cache.store(features_key, list(old_clean) + new_clean, vectorizer, X,
+                        info={"incremental_from": state.features_key})
+        state.rows = len(texts)
+        state.data_bytes = os.path.getsize(DATASET_PATH)
+        state.data_sha256 = data_sha256
+        state.features_key = features_key
+        state.save(INCREMENTAL_STATE_PATH)
+    incremental_seconds = time.perf_counter() - start
+
+    if compare:
+        print("\nRunning a full retrain on the same split for comparison...")
+        with recorder.stage("full_retrain") as stage:
+            full_start = time.perf_counter()
+            full_vectorizer = build_vectorizer(**state.config)
+            X_full = full_vectorizer.fit_transform([clean_text(t) for t in texts])
+            full_model = build_classifier(C=C).fit(X_full[train_idx], labels[train_idx])
+            baseline_accuracy = accuracy_score(y_test, full_model.predict(X_full[test_idx]))
+            baseline_seconds = time.perf_counter() - full_start
+        baseline = "full retrain (same split)"
+    else:
+        # Last full run's own report: other row count and test split
+        try:
+            with open(REPORT_PATH) as f:
+                last = json.load(f)
+            baseline_seconds = last["wall_s"]
+            baseline_accuracy = last["info"]["test_accuracy"]
+            baseline = f"last full run ({last['info']['rows']} rows)"
+        except (OSError, ValueError, KeyError):
+            baseline_seconds = baseline_accuracy = None
+            baseline = None
+
+    recorder.annotate(
+        rows=len(texts), new_rows=n_new, appended_bytes=appended,
+        n_features=X.shape[1], C=C, feature_mode=feature_mode,
+        previous_test_accuracy=float(previous_accuracy),
+        test_accuracy=float(test_accuracy),
+        incremental_s=incremental_seconds,
+        baseline=baseline, baseline_s=baseline_seconds,
+        baseline_test_accuracy=baseline_accuracy,
+    )
+    recorder.save(INCREMENTAL_REPORT_PATH)
+
+    print("\n" + "="*60)
+    print("[OK] INCREMENTAL TRAINING COMPLETED!")
+    print("="*60)
+    print(f"\n  {'model':<34}{'test accuracy':>15}{'seconds':>10}")
+    print(f"  {'previous model (no retrain)':<34}{previous_accuracy:>15.4f}{'-':>10}")
+    print(f"  {'incremental warm start':<34}{test_accuracy:>15.4f}{incremental_seconds:>10.1f}")
+    if baseline is not None:
+        print(f"  {baseline:<34}{baseline_accuracy:>15.4f}{baseline_seconds:>10.1f}")
+        print(f"  Time saved: {baseline_seconds - incremental_seconds:.1f}s "
+              f"({1 - incremental_seconds / baseline_seconds:.0%})")
+        print(f"  Accuracy drift: {test_accuracy - baseline_accuracy:+.4f}")
+    print("\nDetailed Test Set Results:")
+    print(classification_report(y_test, y_pred_test, target_names=['Human', 'AI']))
+    print(f"[OK] Model, vectorizer, scorer and bundle updated in {MODEL_DIR}/")
+    print(f"[OK] Run report saved to {INCREMENTAL_REPORT_PATH}")
+    print_stage_summary(recorder)
+
+
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the production model.")
+    parser.add_argument(
+        "--features", choices=FEATURE_MODES, default="vocab",
+        help="vocab = TF-IDF vocabularies (default), hashed = hashed TF-IDF",
+    )
+    parser.add_argument(
+        "--hash-buckets", type=int, default=DEFAULT_HASH_BUCKETS,
+        help="hash buckets per block when --features hashed",
+    )
+    parser.add_argument(
+        "--word-features", type=int, default=DEFAULT_WORD_FEATURES,
+        help="word n-gram vocabulary size when --features vocab",
+    )
+    parser.add_argument(
+        "--char-features", type=int, default=DEFAULT_CHAR_FEATURES,
+        help="char n-gram vocabulary size when --features vocab",
+    )
+    parser.add_argument(
+        "--C", type=float, default=DEFAULT_C, help="LogisticRegression inverse regularization",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="worker processes for the TF-IDF transform (-1 = all cores)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="ignore and do not write the feature cache (data/.cache/features)",
+    )
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="out-of-core training with hashed features and SGD (datasets larger than RAM)",
+    )
+    parser.add_argument("--epochs", type=int, default=5, help="SGD epochs with --streaming")
+    parser.add_argument(
+        "--chunk-size", type=int, default=20000, help="rows per chunk with --streaming",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="retrain on rows appended since the last run (warm start, updated IDF)",
+    )
+    parser.add_argument(
+        "--compare", action="store_true",
+        help="with --streaming or --incremental, also run the full in-memory training",
+    )
+    args = parser.parse_args()
+    if args.incremental:
+        train_incremental(compare=args.compare, use_cache=not args.no_cache, C=args.C)
+    elif args.streaming:
+        train_streaming(
+            hash_buckets=args.hash_buckets,
+            epochs=args.epochs,
+            chunk_size=args.chunk_size,
+            compare=args.compare,
+            use_cache=not args.no_cache,
+        )
+    else:
+        train(
+            feature_mode=args.features,
+            hash_buckets=args.hash_buckets,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            word_max_features=args.word_features,
+            char_max_features=args.char_features,
+            C=args.C,
+        )
\ No newline at end of file
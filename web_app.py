@@ -1,19 +1,32 @@
 from flask import Flask, jsonify, request, session
-import io
-import re
+import hashlib
 import statistics
 import os
 import tempfile
-from docx import Document
-import pdfplumber
 # from google.oauth2.credentials import Credentials
 # from google_auth_oauthlib.flow import Flow
 # from googleapiclient.discovery import build
 # from googleapiclient.http import MediaIoBaseDownload
 
-from predict import get_detailed_prediction, predict_text
+from predict import cache_stats, get_detailed_predictions, model_version, warmup
+from src.preprocessing.text_analysis import TextAnalysis
+from src.utils.micro_batcher import MicroBatcher
+from src.utils.extraction import (
+    ExtractionError,
+    extract_document,
+    extraction_stats,
+    read_text_upload,
+)
 
 app = Flask(__name__, static_folder="frontend", static_url_path="")
+
+# Concurrent /api/predict requests are coalesced into one batched
+# vectorize + predict call (tune with PREDICT_MAX_BATCH / PREDICT_MAX_WAIT_MS)
+_predict_batcher = MicroBatcher(
+    get_detailed_predictions,
+    max_batch_size=int(os.environ.get("PREDICT_MAX_BATCH", "32")),
+    max_wait_ms=float(os.environ.get("PREDICT_MAX_WAIT_MS", "5")),
+)
 # app.secret_key = os.environ.get("SECRET_KEY", "your-secret-key-change-this")
 
 # Google Drive OAuth Configuration
@@ -35,7 +48,7 @@ def api_predict():
         return jsonify(error="Please provide at least 10 characters."), 400
 
     try:
-        result = get_detailed_prediction(text)
+        result = _predict_batcher.submit(text)
     except FileNotFoundError as exc:
         return jsonify(error=str(exc)), 500
     except Exception as exc:
@@ -54,6 +67,20 @@ def api_predict():
     return jsonify(safe_result)
 
 
+@app.get("/api/cache/stats")
+def api_cache_stats():
+    return jsonify(cache_stats())
+
+
+@app.get("/api/metrics")
+def api_metrics():
+    return jsonify(
+        batching=_predict_batcher.metrics(),
+        cache=cache_stats(),
+        extraction=extraction_stats(),
+    )
+
+
 @app.post("/api/extract")
 def api_extract():
     if "file" not in request.files:
@@ -62,23 +89,22 @@ def api_extract():
     file = request.files["file"]
     filename = (file.filename or "").lower()
 
-    if filename.endswith(".pdf"):
-        with pdfplumber.open(file.stream) as pdf:
-            pages = [page.extract_text() or "" for page in pdf.pages]
-        text = "\n".join(pages).strip()
-    elif filename.endswith(".docx"):
-        content = io.BytesIO(file.read())
-        doc = Document(content)
-        text = "\n".join([p.text for p in doc.paragraphs]).strip()
-    elif filename.endswith((".txt", ".md", ".csv", ".json")):
-        text = (file.read() or b"").decode("utf-8", errors="ignore").strip()
-    else:
-        return jsonify(error="Unsupported file type. Use .pdf, .docx, .txt, .md, .csv, or .json."), 400
+    info = {}
+    try:
+        if filename.endswith((".pdf", ".docx")):
+            # Parsed in the extraction process pool, off the request thread
+            text, info = extract_document(file.stream, filename)
+        elif filename.endswith((".txt", ".md", ".csv", ".json")):
+            text = read_text_upload(file.stream, filename)
+        else:
+            return jsonify(error="Unsupported file type. Use .pdf, .docx, .txt, .md, .csv, or .json."), 400
+    except ExtractionError as exc:
+        return jsonify(error=str(exc)), exc.status
 
     if not text:
         return jsonify(error="Unable to extract text from file."), 400
 
-    return jsonify(text=text)
+    return jsonify(text=text, **info)
 
 
 # Google Drive Authentication Routes
@@ -219,50 +245,50 @@ def api_extract():
 #         return jsonify(error=f"Failed to download file: {str(e)}"), 500
 
 
-def _split_sentences(text):
-    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
-
-
-def _compute_reasons(text):
+def _sentence_hash(sentence, version):
+    # Includes the model version, so results of a replaced model are never reused
+    return hashlib.sha1(f"{version}\0{sentence}".encode("utf-8")).hexdigest()[:16]
+
+
+FUNCTION_WORDS = {
+    "the",
+    "and",
+    "to",
+    "of",
+    "in",
+    "that",
+    "for",
+    "on",
+    "with",
+    "as",
+    "is",
+    "it",
+    "this",
+    "by",
+    "from",
+}
+
+
+def _compute_reasons(analysis):
+    """
+    Style reasons from a TextAnalysis (no re-tokenization of the text).
+    """
     reasons = []
-    sentences = _split_sentences(text)
-    words = re.findall(r"\b\w+\b", text.lower())
+    words = analysis.words
 
-    if sentences:
-        lengths = [len(re.findall(r"\b\w+\b", s)) for s in sentences]
-        if len(lengths) > 1:
-            variance = statistics.pvariance(lengths)
-            if variance < 8:
-                reasons.append("Low sentence length variation")
+    lengths = analysis.sentence_word_counts
+    if len(lengths) > 1:
+        variance = statistics.pvariance(lengths)
+        if variance < 8:
+            reasons.append("Low sentence length variation")
 
     if words:
-        bigrams = list(zip(words, words[1:]))
-        if bigrams:
-            counts = {}
-            for bg in bigrams:
-                counts[bg] = counts.get(bg, 0) + 1
-            top = max(counts.values())
-            if top / max(len(bigrams), 1) > 0.08:
+        n_bigrams = len(words) - 1
+        if n_bigrams:
+            if analysis.top_bigram_count / max(n_bigrams, 1) > 0.08:
                 reasons.append("Repetitive phrasing patterns detected")
 
-        function_words = {
-            "the",
-            "and",
-            "to",
-            "of",
-            "in",
-            "that",
-            "for",
-            "on",
-            "with",
-            "as",
-            "is",
-            "it",
-            "this",
-            "by",
-            "from",
-        }
-        ratio = sum(1 for w in words if w in function_words) / max(len(words), 1)
+        ratio = sum(1 for w in words if w in FUNCTION_WORDS) / max(len(words), 1)
         if ratio > 0.55:
             reasons.append("High function-word density")
 
@@ -280,26 +306,60 @@ def api_analyze():
     if len(text) < 10:
         return jsonify(error="Please provide at least 10 characters."), 400
 
+    known = payload.get("known_sentences") or []
+    if not isinstance(known, list) or not all(isinstance(h, str) for h in known):
+        return jsonify(error="known_sentences must be a list of sentence hashes."), 400
+
+    # One tokenization pass shared by scoring and the style reasons
+    analysis = TextAnalysis(text)
+    sentences = analysis.sentences
+
+    # Incremental mode: the client lists the hashes of sentences it already
+    # holds results for, and only new or changed sentences are scored
+    known = set(known)
     try:
-        overall = get_detailed_prediction(text)
+        version = model_version()
+        while True:
+            hashes = [_sentence_hash(s, version) for s in sentences]
+            to_score = [i for i, h in enumerate(hashes) if h not in known]
+
+            # Score the overall text and every new sentence in one batch
+            stats = {}
+            details = get_detailed_predictions(
+                [text] + [sentences[i] for i in to_score],
+                stats,
+                cleaned=[analysis.cleaned] + analysis.cleaned_sentences(to_score),
+            )
+            if stats["fingerprint"] == version:
+                break
+            # The model was swapped meanwhile: no hash matches the new
+            # version, so the next pass scores every sentence with it
+            version = stats["fingerprint"]
     except FileNotFoundError as exc:
         return jsonify(error=str(exc)), 500
     except Exception as exc:
         return jsonify(error=f"Analysis failed: {exc}"), 500
 
-    sentences = _split_sentences(text)
+    overall = details[0]
+    scored = dict(zip(to_score, details[1:]))
     sentence_results = []
-    for sentence in sentences:
-        label, confidence, probs, warning, word_count = predict_text(sentence)
+    for i, (sentence, sentence_hash) in enumerate(zip(sentences, hashes)):
+        detail = scored.get(i)
+        if detail is None:
+            sentence_results.append(
+                {"text": sentence, "hash": sentence_hash, "reused": True}
+            )
+            continue
         sentence_results.append(
             {
                 "text": sentence,
-                "label": label,
-                "confidence": float(confidence),
-                "human_probability": float(probs[0] * 100),
-                "ai_probability": float(probs[1] * 100),
-                "word_count": int(word_count),
-                "warning": warning,
+                "hash": sentence_hash,
+                "label": detail["prediction"],
+                "confidence": float(detail["confidence"]),
+                "human_probability": float(detail["human_probability"]),
+                "ai_probability": float(detail["ai_probability"]),
+                "word_count": int(detail["word_count"]),
+                "warning": detail["warning"],
             }
         )
 
@@ -316,10 +376,25 @@ def api_analyze():
     return jsonify({
         "overall": safe_overall,
         "sentences": sentence_results,
-        "reasons": _compute_reasons(text),
+        "reasons": _compute_reasons(analysis),
+        "revision": payload.get("revision"),
+        "model_version": version[:16],
+        "incremental": {
+            "reused": len(sentences) - len(to_score),
+            "scored": len(to_score),
+            # rows (overall text included) the prediction cache answered
+            "cache_hits": stats.get("cache_hits", 0),
+        },
     })
     
 
 
 if __name__ == "__main__":
+    # Load the model before accepting traffic (PREDICT_WARMUP=0 skips this).
+    # Under gunicorn, call predict.warmup() from a post_worker_init hook.
+    if os.environ.get("PREDICT_WARMUP", "1") != "0":
+        try:
+            print(f"[OK] Model warmed up in {warmup():.2f}s")
+        except FileNotFoundError as exc:
+            print(f"[WARN] Skipping warm-up: {exc}")
     app.run(host="127.0.0.1", port=8000, debug=True)
\ No newline at end of file